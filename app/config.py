@@ -15,4 +15,177 @@ logging.basicConfig(
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
 if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다. .env 파일에 OPENAI_API_KEY를 설정해주세요.")
\ No newline at end of file
+    raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다. .env 파일에 OPENAI_API_KEY를 설정해주세요.")
+
+# OpenAI API 엔드포인트 (로컬 가짜 서버 등으로 교체할 때 사용, 미설정 시 기본값)
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL') or None
+
+# 외부 HTTP 요청(S3 이미지 다운로드 등) 타임아웃 (초)
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '30'))
+
+# 공유 커넥션 풀 설정 (OpenAI / S3 클라이언트 각각 적용)
+# - HTTP/2 사용 여부 (h2 패키지가 없으면 HTTP/1.1 keep-alive로 동작)
+HTTP2_ENABLED = os.getenv('HTTP2_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+# - 최대 연결 수 / 유지할 유휴 연결 수
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '100'))
+HTTP_MAX_KEEPALIVE = int(os.getenv('HTTP_MAX_KEEPALIVE', '50'))
+# - 유휴 연결 유지 시간 (초, 턴 사이 대기보다 길게 두어 TLS 핸드셰이크 재사용)
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '120'))
+
+
+def _parse_model_limits(value: str) -> dict:
+    """'model=숫자,model=숫자' 형식의 모델별 제한 값 파싱"""
+    limits = {}
+    for item in value.split(','):
+        model, _, limit = item.partition('=')
+        if model.strip() and limit.strip():
+            limits[model.strip()] = float(limit)
+    return limits
+
+
+# OpenAI 요청 스케줄러 설정 (모든 OpenAI 호출이 거쳐감)
+# - 모델별 동시 요청 수 (미지정 모델은 OPENAI_DEFAULT_CONCURRENCY)
+OPENAI_CONCURRENCY = _parse_model_limits(os.getenv(
+    'OPENAI_CONCURRENCY', 'gpt-3.5-turbo=32,gpt-4-turbo=8,whisper-1=8,tts-1=16,dall-e-3=2'
+))
+OPENAI_DEFAULT_CONCURRENCY = int(os.getenv('OPENAI_DEFAULT_CONCURRENCY', '16'))
+# - 모델별 분당 요청 수 / 분당 토큰 수 (조직 한도에 맞춰 설정, 미지정 모델은 제한 없음)
+#   예: OPENAI_RPM="gpt-3.5-turbo=3500,dall-e-3=7" OPENAI_TPM="gpt-3.5-turbo=160000"
+OPENAI_RPM = _parse_model_limits(os.getenv('OPENAI_RPM', ''))
+OPENAI_TPM = _parse_model_limits(os.getenv('OPENAI_TPM', ''))
+# - 분당 토큰 수 계산 시 image_url 파트 이미지 하나의 예상 토큰 수 (768px 이하 high detail 기준, 텍스트 안의 data URL은 글자 수로 계산)
+OPENAI_IMAGE_TOKENS = int(os.getenv('OPENAI_IMAGE_TOKENS', '765'))
+
+# OpenAI 호출 정책 (요청 종류별: chat, chat_short, tts, transcription, image)
+# - 시도당 제한 시간 (초), 넘으면 재시도
+OPENAI_TIMEOUTS = _parse_model_limits(os.getenv(
+    'OPENAI_TIMEOUTS', 'chat=30,chat_short=15,tts=15,transcription=20,image=90'
+))
+# - 재시도를 포함한 전체 제한 시간 (초)
+OPENAI_DEADLINES = _parse_model_limits(os.getenv(
+    'OPENAI_DEADLINES', 'chat=60,chat_short=25,tts=25,transcription=40,image=150'
+))
+# - 이 시간(초) 안에 응답이 없으면 같은 요청을 하나 더 보내 먼저 온 응답 사용 (짧은 요청만)
+OPENAI_HEDGE_AFTER = _parse_model_limits(os.getenv('OPENAI_HEDGE_AFTER', 'chat_short=3,tts=2.5'))
+# - 429 / 5xx / 연결 오류 / 시간 초과 시 재시도 횟수
+OPENAI_RETRIES = int(os.getenv('OPENAI_RETRIES', '2'))
+# - 모델별로 연속 실패가 이 횟수에 도달하면 OPENAI_CIRCUIT_RESET_SECONDS 동안 바로 실패 처리
+OPENAI_CIRCUIT_FAILURES = int(os.getenv('OPENAI_CIRCUIT_FAILURES', '5'))
+OPENAI_CIRCUIT_RESET_SECONDS = float(os.getenv('OPENAI_CIRCUIT_RESET_SECONDS', '30'))
+
+# 세션 저장소 설정
+# - SESSION_STORE: memory (LRU + TTL, 프로세스 메모리) | sqlite (파일 기반, 재시작 후에도 유지, 한 노드의 여러 워커 공유)
+#                  | redis (REDIS_URL, 여러 노드 공유)
+SESSION_STORE = os.getenv('SESSION_STORE', 'memory')
+SESSION_DB_PATH = os.getenv('SESSION_DB_PATH', 'sessions.db')
+# 메모리 저장소에 보관할 최대 세션 수 (넘치면 가장 오래 사용하지 않은 세션부터 제거)
+SESSION_MAX_SIZE = int(os.getenv('SESSION_MAX_SIZE', '1000'))
+# 마지막 사용 후 세션 보관 시간 (초)
+SESSION_TTL_SECONDS = float(os.getenv('SESSION_TTL_SECONDS', '21600'))
+
+# Redis 주소 (SESSION_STORE=redis 또는 FEEDBACK_BUS=redis 사용 시, 여러 노드에서 세션 공유)
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+# 대화 기록 설정 (세션이 길어져도 요청당 토큰 수가 일정하도록)
+# - 원문 그대로 보관하는 최근 메시지 수 (사용자 / AI 메시지 각각 1개)
+CHAT_WINDOW_MESSAGES = int(os.getenv('CHAT_WINDOW_MESSAGES', '12'))
+# - 창 밖으로 밀려난 메시지가 이 수만큼 쌓이면 누적 요약에 합침 (GPT 호출 1회)
+CHAT_SUMMARY_BATCH = int(os.getenv('CHAT_SUMMARY_BATCH', '6'))
+
+# 그림 피드백 전달 경로 (/drawing/send → 음성 WebSocket)
+# - memory: 프로세스 내부 큐 (단일 워커)
+# - sqlite: SESSION_DB_PATH 파일 공유 (한 노드의 여러 워커)
+# - redis: REDIS_URL 공유 (여러 노드)
+FEEDBACK_BUS = os.getenv('FEEDBACK_BUS', 'memory')
+# canvas_id별로 쌓아 둘 수 있는 최대 피드백 수 (넘치면 가장 오래된 피드백부터 버림)
+FEEDBACK_QUEUE_SIZE = int(os.getenv('FEEDBACK_QUEUE_SIZE', '10'))
+# sqlite 피드백 확인 주기 (초)
+FEEDBACK_POLL_INTERVAL = float(os.getenv('FEEDBACK_POLL_INTERVAL', '0.05'))
+
+# TTS 음성 캐시 설정 (같은 모델/목소리/속도/문장은 다시 합성하지 않음)
+# - 메모리 계층 최대 크기 (바이트)
+TTS_CACHE_MEMORY_BYTES = int(os.getenv('TTS_CACHE_MEMORY_BYTES', str(64 * 1024 * 1024)))
+# - 디스크 계층 경로 (빈 값이면 디스크 계층 사용 안 함) 및 최대 크기 (바이트)
+TTS_CACHE_DIR = os.getenv('TTS_CACHE_DIR', '.tts_cache')
+TTS_CACHE_DISK_BYTES = int(os.getenv('TTS_CACHE_DISK_BYTES', str(1024 * 1024 * 1024)))
+# - 서버 시작 시 미리 합성해 둘 문장 ('|'로 구분, 기본 안내 문장은 항상 포함)
+TTS_PREWARM_TEXTS = [text for text in os.getenv('TTS_PREWARM_TEXTS', '').split('|') if text.strip()]
+
+# 세션 음성 저장소 설정 (세션에는 audio_id만 보관)
+# - 메모리에 보관할 최대 크기 (바이트), 넘으면 오래된 음성부터 제거 후 필요할 때 TTS 캐시로 다시 합성
+AUDIO_STORE_MEMORY_BYTES = int(os.getenv('AUDIO_STORE_MEMORY_BYTES', str(64 * 1024 * 1024)))
+
+# 그림을 이미지로 보고 분석 / 배경 프롬프트를 만드는 비전 모델 (image_url 입력 지원 모델)
+VISION_MODEL = os.getenv('VISION_MODEL', 'gpt-4-turbo')
+
+# 비전 모델로 보낼 그림 이미지 처리 설정
+# - 긴 변 최대 픽셀 수 (넘으면 비율 유지하며 축소) 및 재인코딩 형식 (JPEG | PNG) / JPEG 품질
+IMAGE_MAX_SIZE = int(os.getenv('IMAGE_MAX_SIZE', '768'))
+IMAGE_FORMAT = os.getenv('IMAGE_FORMAT', 'JPEG').upper()
+IMAGE_JPEG_QUALITY = int(os.getenv('IMAGE_JPEG_QUALITY', '85'))
+# - 처리된 이미지 캐시 최대 개수 및 재검증(ETag) 없이 재사용하는 시간 (초)
+IMAGE_CACHE_SIZE = int(os.getenv('IMAGE_CACHE_SIZE', '128'))
+IMAGE_CACHE_TTL_SECONDS = float(os.getenv('IMAGE_CACHE_TTL_SECONDS', '300'))
+
+# 실시간 그림 피드백 (/drawing/send) 설정
+# - 새 프레임이 이 시간(초) 동안 없으면 마지막 프레임을 분석 (연속 입력은 하나로 합침)
+CANVAS_DEBOUNCE_SECONDS = float(os.getenv('CANVAS_DEBOUNCE_SECONDS', '0.5'))
+# - 계속 그리는 중이어도 첫 대기 프레임 이후 이 시간(초)이 지나면 분석
+CANVAS_MAX_WAIT_SECONDS = float(os.getenv('CANVAS_MAX_WAIT_SECONDS', '2.0'))
+# - 마지막으로 분석한 프레임과의 평균 밝기 차이가 이 값보다 작으면 건너뜀 (0~1)
+CANVAS_DIFF_THRESHOLD = float(os.getenv('CANVAS_DIFF_THRESHOLD', '0.02'))
+# - 캔버스별 동시 비전 호출 수
+CANVAS_MAX_INFLIGHT = int(os.getenv('CANVAS_MAX_INFLIGHT', '1'))
+
+# /drawing/done/batch 작업 큐 설정 (수업 종료 시 여러 로봇의 그림 완성을 한 번에 처리)
+# - 워커 프로세스당 동시에 처리하는 그림 완성 작업 수
+DONE_JOB_CONCURRENCY = int(os.getenv('DONE_JOB_CONCURRENCY', '4'))
+# - 대기 중인 작업의 대화 요약을 한 번의 GPT 요청으로 묶는 최대 개수 (1이면 묶지 않음)
+DONE_BATCH_TEXT_SIZE = int(os.getenv('DONE_BATCH_TEXT_SIZE', '8'))
+# - 한 번에 요청할 수 있는 최대 그림 수
+DONE_BATCH_MAX_ITEMS = int(os.getenv('DONE_BATCH_MAX_ITEMS', '100'))
+
+# 비동기 작업 저장소 (/drawing/done/batch, 배경 이미지 작업)
+# - JOB_STORE: memory (프로세스 메모리, 같은 워커에서만 조회) | sqlite (파일 기반, 재시작 후에도 유지, 한 노드의 여러 워커 공유)
+JOB_STORE = os.getenv('JOB_STORE', 'memory')
+# - sqlite 사용 시 파일 경로 (기본값은 세션 저장소와 같은 파일)
+JOB_DB_PATH = os.getenv('JOB_DB_PATH', SESSION_DB_PATH)
+# - memory: 보관할 최대 작업 수 (넘으면 끝난 작업부터 제거)
+JOB_STORE_MAX_SIZE = int(os.getenv('JOB_STORE_MAX_SIZE', '10000'))
+# - sqlite: 끝난 작업 보관 기간 (초, 서버 시작 시 정리)
+JOB_TTL_SECONDS = float(os.getenv('JOB_TTL_SECONDS', '86400'))
+
+# 배경 이미지(GPT 프롬프트 + DALL-E) 비동기 생성
+# - true: /drawing/done은 배경 이미지를 기다리지 않고 응답 (background_job_id 포함)
+#   배경 이미지는 작업 큐에서 생성되어 음성 WebSocket(background_image 메시지) / GET /drawing/jobs/{job_id}로 전달
+# - false: 기존처럼 /drawing/done 응답에 배경 이미지 포함
+BACKGROUND_IMAGE_ASYNC = os.getenv('BACKGROUND_IMAGE_ASYNC', 'true').lower() in ('1', 'true', 'yes')
+# - 워커 프로세스당 동시에 처리하는 배경 이미지 작업 수 (DALL-E 동시 요청은 OPENAI_CONCURRENCY로 따로 제한)
+BACKGROUND_JOB_CONCURRENCY = int(os.getenv('BACKGROUND_JOB_CONCURRENCY', '4'))
+
+# 음성 전처리 (Whisper 전송 전 무음 제거, 모노 / STT_SAMPLE_RATE로 변환)
+# - WAV가 아닌 음성은 그대로 전송
+VOICE_PREPROCESS = os.getenv('VOICE_PREPROCESS', 'true').lower() in ('1', 'true', 'yes')
+# - 프레임(20ms) 에너지가 이 값(dBFS)보다 작으면 무음 (주변 잡음이 크면 잡음 수준에 맞춰 올라감)
+VAD_ENERGY_DB = float(os.getenv('VAD_ENERGY_DB', '-45'))
+# - 발화 프레임 합이 이 시간(ms)보다 짧으면 빈 발화로 보고 STT / 대화 생성을 건너뜀
+VAD_MIN_SPEECH_MS = float(os.getenv('VAD_MIN_SPEECH_MS', '200'))
+# - 잘라낼 때 발화 앞뒤로 남길 여유 (ms)
+VAD_PADDING_MS = float(os.getenv('VAD_PADDING_MS', '200'))
+# - Whisper로 보낼 샘플링 레이트 (Hz)
+STT_SAMPLE_RATE = int(os.getenv('STT_SAMPLE_RATE', '16000'))
+
+# /drawing/done 결과 미리 만들기 (선택, 기본 사용 안 함)
+# - 대화 / 그림 프레임이 이 시간(초) 동안 바뀌지 않으면 대화 요약과 배경 프롬프트 초안을 미리 생성
+# - done 시 대화가 그대로이고 최종 그림이 초안 프레임과 비슷하면 초안을 그대로 사용
+SPECULATIVE_DONE = os.getenv('SPECULATIVE_DONE', 'false').lower() in ('1', 'true', 'yes')
+SPECULATIVE_IDLE_SECONDS = float(os.getenv('SPECULATIVE_IDLE_SECONDS', '3.0'))
+# - 최종 그림과 초안 프레임의 평균 밝기 차이가 이 값 이하면 같은 그림으로 봄 (0~1)
+SPECULATIVE_FRAME_THRESHOLD = float(os.getenv('SPECULATIVE_FRAME_THRESHOLD', '0.05'))
+
+# 요청 추적 (trace span) 설정
+# - 내보내기 대상: memory (프로세스 내부 최근 span) / jsonl (TRACE_FILE에 한 줄씩 기록), 쉼표로 여러 개 지정
+TRACE_EXPORTERS = [name.strip() for name in os.getenv('TRACE_EXPORTERS', 'memory').split(',') if name.strip()]
+TRACE_FILE = os.getenv('TRACE_FILE', 'traces.jsonl')
+# - 이 시간(ms)보다 오래 걸린 최상위 span은 하위 단계별 소요 시간을 경고 로그로 남김
+TRACE_SLOW_MS = float(os.getenv('TRACE_SLOW_MS', '3000'))
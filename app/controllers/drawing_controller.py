@@ -1,9 +1,15 @@
-from fastapi import APIRouter, HTTPException
-from app.models.drawing import NewDrawingRequest, DoneDrawingRequest, MakeFriendRequest, MakeFriendResponse, MakeFriendData
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from app.models.drawing import ChatMessage, DrawingData, NewDrawingRequest, DoneDrawingRequest, MakeFriendRequest, MakeFriendResponse, MakeFriendData
+from app.models.job import JOB_TERMINAL_STATUSES, Job, DoneBatchRequest
 from app.services.drawing_service.dependencies import get_drawing_service
-from fastapi.responses import JSONResponse
+from app.services.job_store.dependencies import get_job_store
+from app.config import DONE_JOB_CONCURRENCY, DONE_BATCH_TEXT_SIZE, DONE_BATCH_MAX_ITEMS
+from app.utils.http_range import RangeNotSatisfiable, etag_matches, if_range_matches, parse_range
+from app.utils.job_queue import JobQueue
+from fastapi.responses import JSONResponse, Response
+from collections import Counter
+from typing import Dict, List, Optional
 import logging
-import base64
 from datetime import datetime
 
 # 로거 설정
@@ -16,13 +22,73 @@ router = APIRouter(
 )
 
 
+# 음성 전달 방식 (모든 방식에서 응답에 /drawing/audio/{audio_id} URL 포함)
+# - base64: JSON 응답에 base64 오디오도 포함 (기존 클라이언트 호환)
+# - url: JSON에는 URL만 포함, 오디오는 GET /drawing/audio/{audio_id} 로 다운로드
+# - binary: JSON에는 URL만 포함, 오디오는 음성 WebSocket(?protocol=binary)에서
+#           {"type": "initial_audio"} 요청 시 바이너리 프레임으로도 받을 수 있음
+AUDIO_QUERY = Query(default="base64", pattern="^(base64|url|binary)$", description="음성 전달 방식 (base64 | url | binary)")
+
+# 음성 파일은 내용 해시로 식별되므로 내용이 바뀌지 않음
+AUDIO_CACHE_CONTROL = "private, max-age=31536000, immutable"
+# 다시 합성한 음성은 요청한 ID와 내용이 다를 수 있으므로 매번 ETag로 재검증
+RESYNTHESIZED_AUDIO_CACHE_CONTROL = "private, no-cache"
+
+
+def _audio_url(drawing_data: DrawingData) -> Optional[str]:
+    """세션 안내 음성 다운로드 URL (다른 워커에서 음성이 없으면 canvas_id로 다시 합성)"""
+    if not drawing_data.audio_id:
+        return None
+    return f"/drawing/audio/{drawing_data.audio_id}?canvas_id={drawing_data.canvas_id}"
+
+
+# 🔊 음성 파일 다운로드 (ETag / Range / Cache-Control 지원)
+@router.api_route("/audio/{audio_id}", methods=["GET", "HEAD"])
+async def get_audio(audio_id: str, request: Request, canvas_id: Optional[str] = None):
+    drawing_service = get_drawing_service()
+    stored = await drawing_service.get_audio(audio_id, canvas_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    # ETag는 실제로 보내는 음성의 내용 해시 (다시 합성된 음성과 이어 받기가 섞이지 않도록)
+    etag = f'"{stored.audio_id}"'
+    cache_control = AUDIO_CACHE_CONTROL if stored.audio_id == audio_id else RESYNTHESIZED_AUDIO_CACHE_CONTROL
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Accept-Ranges": "bytes"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    audio_data = stored.data
+    size = len(audio_data)
+    range_header = request.headers.get("range")
+    if stored.audio_id != audio_id or not if_range_matches(request.headers.get("if-range"), etag):
+        # 이어 받으려는 음성과 내용이 다를 수 있으면 전체를 다시 전송
+        range_header = None
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    # 저장된 음성을 복사하지 않고 필요한 구간만 전송
+    body = memoryview(audio_data)
+    status_code = 200
+    if byte_range:
+        start, end = byte_range
+        body = body[start:end + 1]
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    if request.method == "HEAD":
+        headers["Content-Length"] = str(len(body))
+        body = b""
+    return Response(content=body, status_code=status_code, media_type="audio/mpeg", headers=headers)
+
+
 # 🧠 대화 기록 조회
 @router.get("/chat-history/{canvas_id}")
 async def get_chat_history(canvas_id: str):
     """특정 캔버스의 대화 기록을 조회"""
     try:
         drawing_service = get_drawing_service()
-        drawing_data = drawing_service.drawing_data.get(canvas_id)
+        drawing_data = await drawing_service.drawing_data.aget(canvas_id)
         
         if not drawing_data:
             raise HTTPException(status_code=404, detail="Drawing data not found")
@@ -34,7 +100,7 @@ async def get_chat_history(canvas_id: str):
                 "text": msg.text,
                 "timestamp": msg.timestamp.strftime("%Y-%m-%d %H:%M:%S")
             }
-            for msg in drawing_data.chat_history
+            for msg in map(ChatMessage.from_message, drawing_data.chat_history)
         ]
         
         return JSONResponse(content={
@@ -42,7 +108,9 @@ async def get_chat_history(canvas_id: str):
             "user_name": drawing_data.name,
             "user_age": drawing_data.age,
             "chat_history": chat_history,
-            "total_messages": len(chat_history)
+            # 오래된 대화는 요약문으로만 보관됨
+            "history_summary": drawing_data.history_summary,
+            "total_messages": drawing_data.summarized_messages + len(chat_history)
         })
         
     except Exception as e:
@@ -55,7 +123,7 @@ async def get_chat_history(canvas_id: str):
 
 # 🧠 새로운 그림 생성
 @router.post("/new")
-async def create_new_drawing(request: NewDrawingRequest):
+async def create_new_drawing(request: NewDrawingRequest, audio: str = AUDIO_QUERY):
     try:
         # 로깅
         logger.info(f"New drawing request received: {request}")
@@ -73,7 +141,7 @@ async def create_new_drawing(request: NewDrawingRequest):
             raise HTTPException(status_code=400, detail=error_msg)
         
         # 저장된 데이터 가져오기
-        drawing_data = drawing_service.drawing_data.get(request.canvas_id)
+        drawing_data = await drawing_service.drawing_data.aget(request.canvas_id)
         if not drawing_data:
             raise HTTPException(status_code=404, detail="Drawing data not found")
             
@@ -83,12 +151,15 @@ async def create_new_drawing(request: NewDrawingRequest):
             redirect_url += f"&age={request.age}"
             
         # 응답 반환
-        return JSONResponse(content={
+        content = {
             "status": "success",
             "redirect_url": redirect_url,
-            "initial_audio": base64.b64encode(drawing_data.audio_data).decode('utf-8'),
-            "initial_text": drawing_data.prompt
-        })
+            "initial_text": drawing_data.prompt,
+            "initial_audio_url": _audio_url(drawing_data)
+        }
+        if audio == "base64":
+            content["initial_audio"] = await drawing_service.get_session_audio_base64(drawing_data)
+        return JSONResponse(content=content)
         
     except Exception as e:
         logger.error(f"Unexpected error in create_new_drawing: {str(e)}", exc_info=True)
@@ -114,18 +185,11 @@ async def complete_drawing(request: DoneDrawingRequest):
             raise HTTPException(status_code=400, detail=error_msg)
         
         # 저장된 데이터 가져오기
-        drawing_data = drawing_service.drawing_data.get(request.canvas_id)
+        drawing_data = await drawing_service.drawing_data.aget(request.canvas_id)
         if not drawing_data:
             raise HTTPException(status_code=404, detail="Drawing data not found")
         
-        return JSONResponse(content={
-            "status": "success",
-            "analysis": drawing_data.analysis,
-            "summary": drawing_data.summary,
-            "conversation_history": [f"{msg.role}: {msg.text}" for msg in drawing_data.chat_history],
-            "background_image": drawing_data.image_id,
-            "drawing_name": drawing_data.drawing_name
-        })
+        return JSONResponse(content=_done_payload(drawing_data))
         
             
     except Exception as e:
@@ -136,9 +200,146 @@ async def complete_drawing(request: DoneDrawingRequest):
         )
 
 
+def _done_payload(drawing_data: DrawingData) -> dict:
+    """그림 완성 결과 (/drawing/done 응답과 묶음 작업 결과에 공통 사용)"""
+    return {
+        "status": "success",
+        "analysis": drawing_data.analysis,
+        "summary": drawing_data.summary,
+        # 최근 CHAT_WINDOW_MESSAGES개 메시지만 원문, 그 이전 대화는 history_summary 요약문으로만 보관됨
+        "conversation_history": [f"{msg.role}: {msg.text}" for msg in drawing_data.chat_history],
+        "history_summary": drawing_data.history_summary,
+        "summarized_messages": drawing_data.summarized_messages,
+        "background_image": drawing_data.background_image,
+        # 배경 이미지를 비동기로 만드는 중이면 작업 ID (완료 시 음성 WebSocket으로 알림, GET /drawing/jobs/{job_id}로 조회)
+        "background_job_id": drawing_data.background_job_id,
+        "drawing_name": drawing_data.drawing_name,
+        "audio_url": _audio_url(drawing_data)
+    }
+
+
+# 📦 묶음 그림 완성 작업 (/drawing/done/batch)
+async def _run_done_job(job: Job, summary: Optional[str]) -> dict:
+    """작업 하나의 그림 완성 처리 (summary: 묶음 요약 결과)"""
+    drawing_service = get_drawing_service()
+    result = await drawing_service.handle_done_drawing(
+        DoneDrawingRequest(canvas_id=job.canvas_id, image_url=job.params["image_url"]), summary=summary
+    )
+    if result.startswith("error"):
+        raise ValueError(result.replace("error: ", ""))
+    drawing_data = await drawing_service.drawing_data.aget(job.canvas_id)
+    if not drawing_data:
+        raise ValueError("Drawing data not found")
+    return _done_payload(drawing_data)
+
+
+async def _summarize_done_jobs(jobs: List[Job]) -> Dict[str, str]:
+    """함께 꺼낸 작업들의 대화 요약을 한 번의 요청으로 생성"""
+    summaries = await get_drawing_service().summarize_sessions([job.canvas_id for job in jobs])
+    return {job.job_id: summaries[job.canvas_id] for job in jobs if job.canvas_id in summaries}
+
+
+# 그림 완성 작업 큐 (워커 프로세스마다 하나, app/main.py lifespan에서 만들고 종료 시 close_done_jobs()로 정리)
+_done_jobs: Optional[JobQueue] = None
+
+
+def get_done_jobs() -> JobQueue:
+    global _done_jobs
+    if _done_jobs is None:
+        _done_jobs = JobQueue(
+            get_job_store(), _run_done_job,
+            concurrency=DONE_JOB_CONCURRENCY, batch_size=DONE_BATCH_TEXT_SIZE, prepare=_summarize_done_jobs
+        )
+    return _done_jobs
+
+
+async def close_done_jobs():
+    """그림 완성 작업 큐 정리 (실행 중이던 작업은 다음 시작 시 recover로 다시 실행)"""
+    global _done_jobs
+    if _done_jobs is not None:
+        await _done_jobs.close()
+        _done_jobs = None
+
+
+def _job_view(job: Job) -> dict:
+    return job.model_dump(exclude={"params"})
+
+
+def _batch_view(batch_id: str, jobs: List[Job]) -> dict:
+    return {
+        "batch_id": batch_id,
+        "total": len(jobs),
+        "counts": dict(Counter(job.status for job in jobs)),
+        "finished": all(job.finished for job in jobs),
+        "jobs": [_job_view(job) for job in jobs],
+    }
+
+
+# 📦 여러 그림 완성 (수업 종료 시) - 작업 ID를 바로 반환하고 작업 큐에서 처리
+@router.post("/done/batch", status_code=202)
+async def complete_drawings_batch(request: DoneBatchRequest):
+    if len(request.items) > DONE_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {DONE_BATCH_MAX_ITEMS}개까지 요청할 수 있습니다")
+    batch_id, jobs = await get_done_jobs().submit("done", [item.model_dump() for item in request.items])
+    return JSONResponse(status_code=202, content={
+        "status": "accepted",
+        "batch_id": batch_id,
+        "status_url": f"/drawing/done/batch/{batch_id}",
+        "ws_url": f"/drawing/done/batch/{batch_id}/ws",
+        "jobs": [_job_view(job) for job in jobs]
+    })
+
+
+# 📦 묶음 요청 진행 상황 조회 (폴링)
+@router.get("/done/batch/{batch_id}")
+async def get_done_batch(batch_id: str):
+    jobs = await get_done_jobs().store.alist_batch(batch_id)
+    if not jobs:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return JSONResponse(content=_batch_view(batch_id, jobs))
+
+
+# 📦 작업 조회 (폴링, 완료 시 result에 /drawing/done 응답과 같은 결과)
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await get_done_jobs().store.aget(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JSONResponse(content=_job_view(job))
+
+
+# 📦 묶음 요청 완료 알림 (작업 상태가 바뀔 때마다 전송, 모두 끝나면 batch_done 후 종료)
+@router.websocket("/done/batch/{batch_id}/ws")
+async def done_batch_websocket(websocket: WebSocket, batch_id: str):
+    await websocket.accept()
+    done_jobs = get_done_jobs()
+    # 현재 상태를 읽기 전에 구독해 그 사이의 변경도 놓치지 않음
+    updates = done_jobs.subscribe(batch_id)
+    try:
+        # 전송한 시점의 상태로 완료 여부 판단 (저장소의 Job은 처리 중에 바뀜)
+        views = {job.job_id: _job_view(job) for job in await done_jobs.store.alist_batch(batch_id)}
+        if not views:
+            await websocket.send_json({"type": "error", "message": "Batch not found"})
+            await websocket.close(code=1008)
+            return
+        for view in list(views.values()):
+            await websocket.send_json({"type": "job", **view})
+        while not all(view["status"] in JOB_TERMINAL_STATUSES for view in views.values()):
+            view = _job_view(await updates.get())
+            views[view["job_id"]] = view
+            await websocket.send_json({"type": "job", **view})
+        counts = dict(Counter(view["status"] for view in views.values()))
+        await websocket.send_json({"type": "batch_done", "batch_id": batch_id, "counts": counts})
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info(f"Batch WebSocket closed by client: {batch_id}")
+    finally:
+        done_jobs.unsubscribe(batch_id, updates)
+
+
 # 🧠 새로운 친구 추가
 @router.post("/make_friend", response_model=MakeFriendResponse)
-async def make_friend(request: MakeFriendRequest):
+async def make_friend(request: MakeFriendRequest, audio: str = AUDIO_QUERY):
     try:
         logger.info(f"Make friend request received: {request}")
         drawing_service = get_drawing_service()
@@ -155,7 +356,7 @@ async def make_friend(request: MakeFriendRequest):
                 data=None
             )
         
-        drawing_data = drawing_service.drawing_data.get(request.canvas_id)
+        drawing_data = await drawing_service.drawing_data.aget(request.canvas_id)
         if not drawing_data:
             raise HTTPException(status_code=404, detail="Drawing data not found")
         
@@ -164,10 +365,13 @@ async def make_friend(request: MakeFriendRequest):
             message="Continue drawing session started.",
             data=MakeFriendData(
                 sessionId=request.canvas_id,
-                audio=base64.b64encode(drawing_data.audio_data).decode('utf-8'),
+                audio=await drawing_service.get_session_audio_base64(drawing_data) if audio == "base64" else None,
+                audio_url=_audio_url(drawing_data),
                 prompt=drawing_data.prompt,
                 background_image=drawing_data.image_url,
-                chat_history=[f"{msg.role}: {msg.text}" for msg in drawing_data.chat_history]
+                chat_history=[f"{msg.role}: {msg.text}" for msg in drawing_data.chat_history],
+                history_summary=drawing_data.history_summary,
+                summarized_messages=drawing_data.summarized_messages
             )
         )
         
@@ -0,0 +1,83 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.services.drawing_service.dependencies import get_drawing_service
+from app.services.socket_service_impl import manager
+from app.utils.call_policy import get_call_policy_runner
+from app.utils.image_cache import get_image_cache
+from app.utils.audio_store import get_audio_store
+from app.utils.metrics import Counter, Gauge, registry
+from app.utils.openai_scheduler import get_openai_scheduler
+from app.utils.tts_cache import get_tts_cache
+import logging
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 라우터 설정
+router = APIRouter(tags=["metrics"])
+
+
+def _active_sessions(store) -> dict:
+    """세션 수 (원격 공유 저장소는 수집마다 조회하지 않도록 생략)"""
+    if not getattr(store, "count_on_scrape", True):
+        return {}
+    return {(): len(store)}
+
+
+# 📊 수집 시점에 각 구성 요소의 현재 상태를 읽는 지표
+registry.register(Gauge(
+    "mic_active_sessions", "Drawing sessions in the session store",
+    callback=lambda: _active_sessions(get_drawing_service().drawing_data),
+))
+registry.register(Gauge(
+    "mic_websocket_connections", "Open WebSocket connections", ("type",),
+    callback=lambda: {
+        ("voice",): len(manager.voice_connections),
+        ("drawing",): manager.drawing_connections,
+    },
+))
+registry.register(Gauge(
+    "mic_openai_queue_depth", "OpenAI requests waiting for a scheduler slot", ("model",),
+    callback=lambda: {(model,): lane["queue_depth"] for model, lane in get_openai_scheduler().stats().items()},
+))
+registry.register(Gauge(
+    "mic_openai_inflight", "OpenAI requests in flight", ("model",),
+    callback=lambda: {(model,): lane["inflight"] for model, lane in get_openai_scheduler().stats().items()},
+))
+registry.register(Gauge(
+    "mic_openai_circuit_open", "1 if the circuit breaker for the model is not closed", ("model",),
+    callback=lambda: {
+        (model,): int(state != "closed") for model, state in get_call_policy_runner().snapshot()["circuits"].items()
+    },
+))
+registry.register(Counter(
+    "mic_openai_policy_events_total", "Retries, timeouts, hedges and failures by call policy", ("operation", "event"),
+    callback=lambda: {
+        (operation, event): value
+        for operation, stats in get_call_policy_runner().snapshot()["calls"].items()
+        for event, value in stats.items()
+    },
+))
+registry.register(Counter(
+    "mic_cache_lookups_total", "Cache lookups by result", ("cache", "result"),
+    callback=lambda: {
+        **{("tts", result): get_tts_cache().stats()[result] for result in ("memory_hits", "disk_hits", "coalesced", "misses")},
+        **{("image", result): get_image_cache().stats()[result] for result in ("hits", "revalidated", "misses")},
+        **{("audio", result): get_audio_store().stats()[result] for result in ("hits", "misses")},
+    },
+))
+registry.register(Counter(
+    "mic_speculative_done_total", "Done drafts drafted / reused / discarded as stale", ("artifact", "outcome"),
+    callback=lambda: dict(get_drawing_service().speculation_stats),
+))
+registry.register(Counter(
+    "mic_canvas_frames_total", "Live-canvas frames by outcome (closed connections)", ("outcome",),
+    callback=lambda: {(outcome,): value for outcome, value in manager.frame_stats.items()},
+))
+
+
+# 📊 Prometheus 지표
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 텍스트 형식 지표 (워커 프로세스별)"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
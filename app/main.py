@@ -1,12 +1,38 @@
+import asyncio
 import uvicorn
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
-from app.controllers.drawing_controller import router as drawing_router
+from app.controllers.drawing_controller import router as drawing_router, get_done_jobs, close_done_jobs
 from app.controllers.socket_controller import router as socket_router
+from app.controllers.metrics_controller import router as metrics_router
+from app.services.drawing_service.dependencies import get_drawing_service
+from app.utils.clients import open_clients, close_clients
+from app.utils.tracing import close_tracer, span
 
-app = FastAPI()
+
+# 서버 시작 / 종료 시 처리
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 모든 서비스가 공유하는 OpenAI / HTTP 클라이언트 (커넥션 풀은 서버 수명 동안 유지)
+    open_clients()
+    # 자주 쓰는 안내 문장 TTS를 백그라운드에서 미리 합성 (시작을 지연시키지 않음)
+    prewarm_task = asyncio.create_task(get_drawing_service().prewarm_tts_cache())
+    # 재시작 전에 대기 중이던 작업을 다시 실행 (JOB_STORE=sqlite 일 때, 여러 워커 중 한 곳에서만 실행됨)
+    await get_drawing_service().background_jobs.recover("background")
+    await get_done_jobs().recover("done")
+    yield
+    prewarm_task.cancel()
+    await get_drawing_service().background_jobs.close()
+    await close_done_jobs()
+    await close_clients()
+    # 추적 파일에 남은 span 기록 (쓰기 스레드 종료 대기)
+    await asyncio.to_thread(close_tracer)
+
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS 설정
 app.add_middleware(
@@ -17,12 +43,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# HTTP 요청마다 최상위 추적 span 생성 (서비스에서 canvas_id / robot_id 추가)
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    with span("http", method=request.method, path=request.url.path) as request_span:
+        response = await call_next(request)
+        request_span.set(status_code=response.status_code)
+        return response
+
 # 정적 파일 제공
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 # 라우터 등록
 app.include_router(drawing_router)
 app.include_router(socket_router)
+app.include_router(metrics_router)
 
 @app.get("/")
 async def root():
@@ -1,6 +1,7 @@
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, NamedTuple
+from pydantic import BaseModel, Field, PrivateAttr
 from datetime import datetime
+import time
 
 class NewDrawingRequest(BaseModel):
     robot_id: str = Field(..., description="로봇 고유 번호")
@@ -8,11 +9,22 @@ class NewDrawingRequest(BaseModel):
     age: Optional[int] = Field(None, description="아이 나이")
     canvas_id: str = Field(..., description="현재 그림 ID (UUID)")
 
+class Message(NamedTuple):
+    """세션에 보관하는 대화 메시지 (튜플 기반, JSON에는 [role, text, timestamp] 배열로 저장)"""
+    role: str
+    text: str
+    timestamp: float  # UNIX 시각 (초)
+
 class ChatMessage(BaseModel):
+    """API 응답용 대화 메시지"""
     role: str
     text: str
     timestamp: datetime = Field(default_factory=datetime.now)
 
+    @classmethod
+    def from_message(cls, message: Message) -> "ChatMessage":
+        return cls(role=message.role, text=message.text, timestamp=datetime.fromtimestamp(message.timestamp))
+
 class DrawingData(BaseModel):
     """그림 데이터를 담는 모델"""
     robot_id: str
@@ -21,19 +33,46 @@ class DrawingData(BaseModel):
     canvas_id: str
     image_id: Optional[str] = None  # 🔑 image_id 필드 추가
     prompt: str = ""
-    audio_data: Optional[bytes] = None
-    chat_history: List[ChatMessage] = []
+    audio_id: Optional[str] = None  # 🔊 현재 안내 음성 (AudioBlobStore 키)
+    audio_text: str = ""  # 안내 음성의 문장 (저장소에서 제거됐으면 다시 합성)
+    chat_history: List[Message] = []  # 💬 최근 대화 (오래된 메시지는 history_summary로 합쳐짐)
+    history_summary: str = ""  # 📝 chat_history 이전 대화의 누적 요약
+    summarized_messages: int = 0  # 요약에 합쳐진 메시지 수
     analysis: str = ""
     summary: str = ""
     drawing_name: str = ""
     image_url: Optional[str] = None
     analyses: List['DrawingAnalysis'] = []
     contents: Optional[str] = None  # 🔄 **새로 추가된 필드**
-    background_image: Optional[str] = None
+    background_image: Optional[str] = None  # 🎨 DALL-E 배경 이미지 URL (비동기 생성 시 작업 완료 후 채워짐)
+    background_job_id: Optional[str] = None  # 배경 이미지 작업 ID (BACKGROUND_IMAGE_ASYNC)
+    stage_timings: Dict[str, dict] = {}  # ⏱️ /drawing/done 단계별 소요 시간 (ms)
+    _conversation_text: Optional[str] = PrivateAttr(default=None)  # 프롬프트용 대화 문자열 캐시
 
     def add_message(self, role: str, text: str):
         """대화 내용을 저장"""
-        self.chat_history.append(ChatMessage(role=role, text=text))
+        self.chat_history.append(Message(role, text, time.time()))
+        self._conversation_text = None
+
+    def conversation_text(self) -> str:
+        """프롬프트에 넣을 대화 내용 (누적 요약 + 최근 대화, 변경될 때만 다시 만듦)"""
+        if self._conversation_text is None:
+            lines = [f"{msg.role}: {msg.text}" for msg in self.chat_history]
+            if self.history_summary:
+                lines.insert(0, f"이전 대화 요약: {self.history_summary}")
+            self._conversation_text = "\n".join(lines)
+        return self._conversation_text
+
+    def fold_history(self, folded: List[Message], summary: str) -> bool:
+        """앞쪽 메시지들을 누적 요약으로 대체 (그 사이 기록이 바뀌었으면 적용하지 않음)"""
+        count = len(folded)
+        if self.chat_history[:count] != folded:
+            return False
+        self.chat_history = self.chat_history[count:]
+        self.history_summary = summary
+        self.summarized_messages += count
+        self._conversation_text = None
+        return True
 
     def update_image(self, image_url: str):
         """이미지 URL 업데이트"""
@@ -64,10 +103,13 @@ class MakeFriendRequest(BaseModel):
 
 class MakeFriendData(BaseModel):
     sessionId: str  # 세션 ID (canvas_id)
-    audio: str  # Base64 인코딩된 오디오 데이터
+    audio: Optional[str] = None  # Base64 인코딩된 오디오 데이터 (audio=url / binary 요청 시 생략)
+    audio_url: Optional[str] = None  # 오디오 다운로드 URL (/drawing/audio/{audio_id})
     prompt: str  # 새로운 대화 프롬프트
     background_image: Optional[str] = None  # 배경 이미지 URL, 선택적으로 변경
-    chat_history: List[str]  # 대화 이력
+    chat_history: List[str]  # 대화 이력 (최근 CHAT_WINDOW_MESSAGES개)
+    history_summary: str = ""  # 그 이전 대화의 누적 요약
+    summarized_messages: int = 0  # 요약문으로 합쳐진 메시지 수
 
 
 class MakeFriendResponse(BaseModel):
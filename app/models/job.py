@@ -0,0 +1,35 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from app.models.drawing import DoneDrawingRequest
+import time
+import uuid
+
+# 작업 상태
+# - queued: 대기 중, running: 처리 중, succeeded / failed: 완료 (더 이상 바뀌지 않음)
+JOB_TERMINAL_STATUSES = ("succeeded", "failed")
+
+
+class Job(BaseModel):
+    """비동기 작업 (/drawing/done/batch 등)"""
+    job_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    kind: str = Field(..., description="작업 종류 (done)")
+    canvas_id: str
+    batch_id: Optional[str] = None
+    status: str = "queued"
+    # 작업 입력 (예: done의 image_url)
+    params: Dict[str, Any] = Field(default_factory=dict)
+    # 완료 시 결과 (/drawing/done 응답과 같은 형식) / 실패 시 오류 메시지
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = Field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in JOB_TERMINAL_STATUSES
+
+
+class DoneBatchRequest(BaseModel):
+    """여러 캔버스의 그림 완성을 한 번에 요청 (수업 종료 시)"""
+    items: List[DoneDrawingRequest] = Field(..., min_length=1, description="완성할 그림 목록 (canvas_id, image_url)")
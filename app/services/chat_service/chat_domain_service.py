@@ -1,14 +1,11 @@
-# OpenAI의 비동기 클라이언트를 임포트합니다.
-# AsyncOpenAI 클래스는 OpenAI API와의 비동기 통신을 위한 클라이언트입니다.
-from openai import AsyncOpenAI
-from app.config import settings
-
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+# 프로세스 공용 비동기 OpenAI 클라이언트를 사용합니다.
+# 모든 요청은 OpenAI 스케줄러(모델별 동시 요청 수 / 속도 제한 / 우선순위)를 거칩니다.
+from app.utils.clients import get_openai_client
 
 # 오픈AI API 호출 (텍스트 생성 모델)
 async def call_openai_api(messages: list) -> str:
     try:
-        response = await client.chat.completions.create(
+        response = await get_openai_client().chat.completions.create(
             model="gpt-3.5-turbo",
             messages=messages,
             # temperature=0.7,
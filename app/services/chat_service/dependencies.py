@@ -1,6 +1,10 @@
-from fastapi import Depends
 from .chat_service import ChatService
 from .chat_service_impl import ChatServiceImpl
 
+_chat_service: ChatService = None
+
 def get_chat_service() -> ChatService:
-    return ChatServiceImpl()
\ No newline at end of file
+    global _chat_service
+    if _chat_service is None:
+        _chat_service = ChatServiceImpl()
+    return _chat_service
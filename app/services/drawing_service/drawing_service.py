@@ -1,14 +1,29 @@
 # 추상 클래스와 추상 메서드를 위한 ABC 모듈 임포트
 from abc import ABC, abstractmethod
 # 그림 요청 데이터 모델 클래스 임포트
-from app.models.drawing import NewDrawingRequest
+from app.models.drawing import NewDrawingRequest, DrawingData
 # 네임드튜플 타입을 위한 임포트
-from typing import NamedTuple
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional
 
 # 음성 처리 결과를 담는 네임드튜플 클래스 정의
 class AudioProcessingResult(NamedTuple):
-    text: str        # 음성을 텍스트로 변환한 결과
+    text: str        # AI가 생성한 응답 텍스트
     audio_data: bytes # AI가 생성한 응답 음성 데이터
+    user_text: str = "" # 사용자 음성을 텍스트로 변환한 결과 (STT)
+
+
+# 스트리밍 음성 처리 이벤트를 담는 네임드튜플 클래스 정의
+class AudioStreamEvent(NamedTuple):
+    type: str               # "transcript" (STT 결과) | "chunk" (문장 단위 음성) | "end" (응답 완료)
+    text: str               # 이벤트 텍스트 (사용자 발화 / 문장 / 전체 응답)
+    audio_data: bytes = b"" # 문장 단위 TTS 음성 데이터 ("chunk"에서만 사용)
+    index: int = 0          # 문장 순서 ("chunk") 또는 전체 문장 수 ("end")
+
+
+# 저장소에서 꺼낸 음성을 담는 네임드튜플 클래스 정의
+class StoredAudio(NamedTuple):
+    audio_id: str # 실제 음성 데이터의 내용 해시 (다시 합성됐으면 요청한 ID와 다를 수 있음)
+    data: bytes   # 음성 데이터
 
 
 
@@ -27,4 +42,60 @@ class DrawingService(ABC):
     @abstractmethod
     async def process_audio(self, audio_data: bytes, robot_id: str, canvas_id: str) -> AudioProcessingResult:
         """음성 데이터를 처리하고 응답을 생성"""
-        pass 
\ No newline at end of file
+        pass
+
+
+
+    # 음성 입력을 처리하고 응답을 문장 단위로 스트리밍하는 추상 메서드
+    @abstractmethod
+    def stream_audio(self, audio_data: bytes, robot_id: str, canvas_id: str) -> AsyncIterator[AudioStreamEvent]:
+        """음성 데이터를 처리하고 문장이 완성될 때마다 음성 청크를 순서대로 반환"""
+        pass
+
+
+
+    # 텍스트를 음성으로 변환하는 추상 메서드
+    @abstractmethod
+    async def create_speech(self, text: str) -> bytes:
+        """텍스트를 TTS 음성 데이터로 변환"""
+        pass
+
+
+
+    # 세션 안내 음성을 조회하는 추상 메서드
+    @abstractmethod
+    async def get_session_audio(self, drawing_data: DrawingData) -> Optional[bytes]:
+        """세션의 안내 음성 데이터를 반환 (없으면 None)"""
+        pass
+
+
+
+    # 세션 안내 음성을 base64 문자열로 조회하는 추상 메서드
+    @abstractmethod
+    async def get_session_audio_base64(self, drawing_data: DrawingData) -> Optional[str]:
+        """세션의 안내 음성을 base64 문자열로 반환 (없으면 None)"""
+        pass
+
+
+
+    # 음성 파일을 ID로 조회하는 추상 메서드
+    @abstractmethod
+    async def get_audio(self, audio_id: str, canvas_id: Optional[str] = None) -> Optional[StoredAudio]:
+        """저장된 음성과 그 내용 해시를 반환 (canvas_id 세션의 음성이면 없을 때 다시 합성, 없으면 None)"""
+        pass
+
+
+
+    # 실시간 그림 프레임을 기록하는 추상 메서드
+    @abstractmethod
+    def note_canvas_frame(self, canvas_id: str, frame: str):
+        """/drawing/send로 받은 최신 그림 프레임 기록 (done 결과 미리 만들기에 사용)"""
+        pass
+
+
+
+    # 여러 세션의 대화를 한 번에 요약하는 추상 메서드
+    @abstractmethod
+    async def summarize_sessions(self, canvas_ids: List[str]) -> Dict[str, str]:
+        """여러 세션의 대화 요약을 한 번의 요청으로 생성 (/drawing/done/batch, 실패한 세션은 결과에 없음)"""
+        pass
@@ -1,16 +1,41 @@
-from typing import Dict, Optional, List
-from app.services.drawing_service.drawing_service import DrawingService, AudioProcessingResult
-from app.models.drawing import NewDrawingRequest, DrawingData, DoneDrawingRequest, ChatMessage, MakeFriendRequest, MakeFriendResponse
-from app.config import OPENAI_API_KEY
-import tempfile
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Dict, Optional, List, Union
+from app.services.drawing_service.drawing_service import DrawingService, AudioProcessingResult, AudioStreamEvent, StoredAudio
+from app.models.drawing import NewDrawingRequest, DrawingData, DoneDrawingRequest, Message, MakeFriendRequest, MakeFriendResponse
+from app.config import (
+    OPENAI_API_KEY, TTS_PREWARM_TEXTS, CHAT_WINDOW_MESSAGES, CHAT_SUMMARY_BATCH,
+    SPECULATIVE_DONE, SPECULATIVE_IDLE_SECONDS, SPECULATIVE_FRAME_THRESHOLD,
+    VOICE_PREPROCESS, VAD_ENERGY_DB, VAD_MIN_SPEECH_MS, VAD_PADDING_MS, STT_SAMPLE_RATE,
+    BACKGROUND_IMAGE_ASYNC, BACKGROUND_JOB_CONCURRENCY, VISION_MODEL,
+)
+from app.models.job import Job
+from app.services.session_store.session_store import SessionStore
+from app.services.session_store.dependencies import get_session_store
+from app.services.job_store.job_store import JobStore
+from app.services.job_store.dependencies import get_job_store
+from app.utils.clients import get_openai_client, get_http_client
+from app.utils.stage_timer import StageTimer
+from app.utils.tts_cache import TTSCache, get_tts_cache
+from app.utils.image_cache import ImageCache, PreparedImage, get_image_cache, vision_message
+from app.utils.audio_store import AudioBlobStore, get_audio_store
+from app.utils.openai_scheduler import Priority, ScheduledOpenAI, openai_priority
+from app.utils.call_policy import call_policy
+from app.utils.metrics import observe_stage, VOICE_CLIPS, STT_AUDIO_SECONDS
+from app.utils.tracing import annotate
+from app.utils.sentence_chunker import SentenceChunker
+from app.utils.canvas_scheduler import decode_frame, frame_signature, frame_difference
+from app.utils.voice_activity import prepare_speech
+from app.utils.job_queue import JobQueue
+import base64
+import contextlib
+import json
 import sys
 import os
 import logging
-import openai
-import requests
-import base64
+import asyncio
+import time
+import httpx
 from io import BytesIO
-from PIL import Image
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))  # 추가된 코드
 
@@ -18,34 +43,128 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app'
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+# /drawing/done 파이프라인 단계별 선행 단계
+# - 요약 / 이미지 분석 / 배경 프롬프트는 서로 독립적으로 동시에 실행
+# - 제목은 요약과 분석만, DALL-E는 배경 프롬프트만 기다림
+DONE_PIPELINE_DEPENDENCIES: Dict[str, List[str]] = {
+    "summary": [],
+    "s3_fetch": [],
+    "analysis": ["s3_fetch"],
+    "background_prompt": ["s3_fetch"],
+    "drawing_name": ["summary", "analysis"],
+    "background_image": ["background_prompt"],
+    "tts": ["drawing_name", "analysis"],
+}
+
+# 음성 처리 실패 시 아이에게 들려줄 기본 메시지
+VOICE_ERROR_TEXT = "죄송해요, 잘 이해하지 못했어요. 다시 한 번 말씀해 주시겠어요?"
+
+# 말소리가 없는 음성이 왔을 때 들려줄 메시지 (STT / 대화 생성 없이 캐시된 TTS로 응답)
+NO_SPEECH_TEXT = "잘 안 들렸어요. 한 번 더 말해 줄래요?"
+
+# 추측 생성 초안을 보관할 최대 캔버스 수 (done 없이 끝난 세션 정리)
+MAX_DONE_DRAFTS = 1000
+
+
+def _history_key(drawing_data: DrawingData) -> tuple:
+    """대화 기록 상태 (메시지가 추가되거나 요약에 합쳐지면 바뀜)"""
+    last = drawing_data.chat_history[-1].timestamp if drawing_data.chat_history else 0.0
+    return drawing_data.summarized_messages, len(drawing_data.chat_history), last
+
+
+def _prepared_signature(image: PreparedImage):
+    """축소 / 인코딩된 이미지의 밝기 서명 (초안 프레임과 최종 그림을 같은 표현으로 비교, 투명 영역은 흰색)"""
+    return frame_signature(base64.b64decode(image.base64))
+
+
+# /drawing/done 결과 초안 (세션 진행 중 미리 생성, 캔버스별 프로세스 메모리에 보관)
+class DoneDraft:
+
+    def __init__(self):
+        # 대화 요약 초안과 만들 때의 대화 상태
+        self.summary: Optional[str] = None
+        self.summary_key: Optional[tuple] = None
+        # 아직 처리하지 않은 최신 그림 프레임 / 처리된 프레임과 밝기 서명
+        self.pending_frame: Optional[str] = None
+        self.frame: Optional[PreparedImage] = None
+        self.frame_signature = None
+        self.frame_version = 0
+        # 배경 프롬프트 초안과 만들 때의 (대화 상태, 프레임 버전)
+        self.background_prompt: Optional[str] = None
+        self.prompt_key: Optional[tuple] = None
+
 # 드로잉 서비스 구현
 class DrawingServiceImpl(DrawingService):
 
 
     # 초기화
-    def __init__(self):
+    def __init__(self, session_store: Optional[SessionStore] = None, tts_cache: Optional[TTSCache] = None,
+                 image_cache: Optional[ImageCache] = None, audio_store: Optional[AudioBlobStore] = None,
+                 speculative: Optional[bool] = None, background_async: Optional[bool] = None,
+                 job_store: Optional[JobStore] = None):
         try:
-            # OpenAI API 클라이언트 초기화
-            self.client = openai.OpenAI(api_key=OPENAI_API_KEY)
             if not OPENAI_API_KEY:
                 raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다")
-            
+            # 프로세스 공용 비동기 OpenAI / HTTP 클라이언트는 client / http_client 속성으로 호출 시점에 가져옴
+            # (lifespan이 닫고 다시 연 클라이언트를 계속 붙잡고 있지 않도록 self에 저장하지 않음)
+
             # 캔버스 ID를 키로 사용하는 그림 데이터 저장소 초기화
-            # 각 그림 세션의 데이터를 저장하는 딕셔너리
+            # 각 그림 세션의 데이터를 저장하는 세션 저장소 (SESSION_STORE 설정으로 선택)
             # - Key: 캔버스 ID (str) - 각 그림 세션을 고유하게 식별하는 값
             # - Value: DrawingData 객체 - 해당 세션의 모든 정보를 담고 있음
             #   - 사용자 정보 (이름, 나이 등)
             #   - 대화 기록
             #   - 음성 데이터
             #   - 그림 관련 데이터 (이미지 URL, 분석 결과 등)
-            # 메모리 기반 저장소로, 서버 재시작 시 초기화됨
-            self.drawing_data: Dict[str, DrawingData] = {}
+            # - memory: LRU + TTL로 크기가 제한되며 서버 재시작 시 초기화됨
+            # - sqlite: 파일에 저장되어 재시작 후에도 유지됨
+            # 세션을 변경한 뒤에는 save()로 저장해야 함
+            # (await 사이에 다른 요청이 저장할 수 있는 흐름은 update()로 최신 세션에 변경만 적용)
+            self.drawing_data: SessionStore = session_store or get_session_store()
+            
+            # 대화 요약 중인 캔버스 (canvas_id별로 한 번에 하나만)
+            self._folding: Dict[str, asyncio.Future] = {}
+            
+            # 같은 문장의 TTS 결과를 재사용하는 캐시 (메모리 + 디스크)
+            self.tts_cache: TTSCache = tts_cache or get_tts_cache()
+
+            # 그림 이미지를 한 번만 다운로드하고 축소 / 재인코딩해 재사용하는 캐시
+            self.image_cache: ImageCache = image_cache or get_image_cache()
+
+            # 세션 안내 음성 저장소 (세션에는 audio_id만 보관)
+            self.audio_store: AudioBlobStore = audio_store or get_audio_store()
+
+            # /drawing/done 결과 미리 만들기 (SPECULATIVE_DONE)
+            self.speculative = SPECULATIVE_DONE if speculative is None else speculative
+            self._drafts: "OrderedDict[str, DoneDraft]" = OrderedDict()
+            self._speculation_tasks: Dict[str, asyncio.Future] = {}
+            # 초안 생성 / 재사용 횟수 (artifact, outcome)
+            self.speculation_stats: Dict[tuple, int] = {}
+
+            # 배경 이미지 비동기 생성 (BACKGROUND_IMAGE_ASYNC)
+            # - /drawing/done 응답 후 작업 큐에서 생성, 작업의 batch_id는 canvas_id (음성 WebSocket이 구독)
+            self.background_async = BACKGROUND_IMAGE_ASYNC if background_async is None else background_async
+            self.background_jobs = JobQueue(
+                job_store or get_job_store(), self._run_background_job, concurrency=BACKGROUND_JOB_CONCURRENCY
+            )
         
         except Exception as e:
             logger.error(f"DrawingServiceImpl 초기화 오류: {str(e)}", exc_info=True)
             raise
 
 
+    @property
+    def client(self) -> ScheduledOpenAI:
+        """현재 lifespan의 공유 OpenAI 클라이언트"""
+        return get_openai_client()
+
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """현재 lifespan의 공유 HTTP 클라이언트"""
+        return get_http_client()
+
+
     # 🛠️ 공통 헬퍼 메서드
     def _handle_error(self, error: Exception, context: str) -> str:
         """공통 오류 처리 메서드"""
@@ -64,9 +183,9 @@ class DrawingServiceImpl(DrawingService):
 
 
     # 🛠️ 공통 헬퍼 메서드
-    def _generate_ai_response(self, user_text: str) -> str:
+    async def _generate_ai_response(self, user_text: str) -> str:
         """AI 모델을 통해 응답 생성"""
-        chat_response = openai.chat.completions.create(
+        chat_response = await self.client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "당신은 아이들과 대화하는 친근한 AI 선생님입니다."},
@@ -77,31 +196,144 @@ class DrawingServiceImpl(DrawingService):
 
 
     # 🛠️ 공통 헬퍼 메서드
-    def _create_tts_response(self, text: str) -> bytes:
-        """TTS 응답을 생성"""
-        speech_response = openai.audio.speech.create(
-            model="tts-1",
-            voice="nova",
-            input=text,
-            speed=1.0
+    async def _create_tts_response(self, text: str) -> bytes:
+        """TTS 응답을 생성 (같은 문장은 캐시에서 반환)"""
+        async def synthesize() -> bytes:
+            speech_response = await self.client.audio.speech.create(
+                model="tts-1",
+                voice="nova",
+                input=text,
+                speed=1.0
+            )
+            return speech_response.content
+
+        return await self.tts_cache.get_or_create("tts-1", "nova", 1.0, text, synthesize)
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    async def _session_audio(self, drawing_data: DrawingData) -> Optional[StoredAudio]:
+        """세션 안내 음성과 실제 내용 해시 (다시 합성해도 세션의 audio_id는 바꾸지 않음)"""
+        audio = self.audio_store.get(drawing_data.audio_id)
+        if audio is not None:
+            return StoredAudio(drawing_data.audio_id, audio)
+        if not drawing_data.audio_text:
+            return None
+        audio = await self._create_tts_response(drawing_data.audio_text)
+        return StoredAudio(self.audio_store.put(audio), audio)
+
+
+    # 🗣️ API 메서드
+    async def create_speech(self, text: str) -> bytes:
+        """텍스트를 음성으로 변환"""
+        return await self._create_tts_response(text)
+
+
+    # 🔊 API 메서드
+    async def get_session_audio(self, drawing_data: DrawingData) -> Optional[bytes]:
+        """세션의 안내 음성 (저장소에서 제거됐으면 audio_text로 다시 합성)"""
+        stored = await self._session_audio(drawing_data)
+        return stored.data if stored else None
+
+
+    async def get_session_audio_base64(self, drawing_data: DrawingData) -> Optional[str]:
+        """세션의 안내 음성 base64 문자열 (같은 음성은 한 번만 인코딩)"""
+        encoded = self.audio_store.get_base64(drawing_data.audio_id)
+        if encoded is None:
+            stored = await self._session_audio(drawing_data)
+            encoded = self.audio_store.get_base64(stored.audio_id) if stored else None
+        return encoded
+
+
+    async def get_audio(self, audio_id: str, canvas_id: Optional[str] = None) -> Optional[StoredAudio]:
+        """저장된 음성 조회 (다른 워커에서 만든 세션 음성이면 세션의 audio_text로 다시 합성)"""
+        audio = self.audio_store.get(audio_id)
+        if audio is not None:
+            return StoredAudio(audio_id, audio)
+        if canvas_id:
+            drawing_data = await self.drawing_data.aget(canvas_id)
+            if drawing_data and drawing_data.audio_id == audio_id:
+                return await self._session_audio(drawing_data)
+        return None
+
+
+    # 🗣️ 자주 쓰는 문장 TTS 미리 합성
+    async def prewarm_tts_cache(self):
+        """기본 안내 문장과 TTS_PREWARM_TEXTS를 미리 합성해 캐시에 저장"""
+        for text in [VOICE_ERROR_TEXT, NO_SPEECH_TEXT] + TTS_PREWARM_TEXTS:
+            try:
+                # 실제 대화 요청보다 뒤로 밀리도록 낮은 우선순위로 합성
+                with openai_priority(Priority.BACKGROUND):
+                    await self._create_tts_response(text)
+            except Exception as e:
+                logger.warning(f"TTS prewarm failed for '{text}': {str(e)}")
+        logger.info(f"TTS cache prewarmed: {self.tts_cache.stats()}")
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    async def _prepare_speech(self, audio_data: bytes) -> Optional[bytes]:
+        """Whisper 전송 전 무음 제거 / 16kHz 모노 변환 (말소리가 없으면 None)"""
+        if not VOICE_PREPROCESS:
+            return audio_data
+        started = time.perf_counter()
+        clip = await asyncio.to_thread(
+            prepare_speech, audio_data, STT_SAMPLE_RATE, VAD_ENERGY_DB, VAD_MIN_SPEECH_MS, VAD_PADDING_MS
+        )
+        observe_stage("vad", time.perf_counter() - started)
+        VOICE_CLIPS.inc(outcome=clip.outcome)
+        if clip.outcome != "passthrough":
+            STT_AUDIO_SECONDS.inc(clip.input_seconds, kind="input")
+            STT_AUDIO_SECONDS.inc(clip.output_seconds, kind="uploaded")
+            logger.debug(
+                f"Voice clip {clip.outcome}: {clip.input_seconds:.2f}s → {clip.output_seconds:.2f}s "
+                f"({len(audio_data)} → {len(clip.audio or b'')} bytes)"
+            )
+        return clip.audio
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    async def _transcribe_audio(self, audio_data: bytes) -> str:
+        """음성을 텍스트로 변환 (Speech-to-Text)"""
+        # 임시 파일 없이 메모리 버퍼를 그대로 전달 (파일 이름으로 포맷 판별)
+        audio_file = BytesIO(audio_data)
+        audio_file.name = "audio.wav"
+        transcript = await self.client.audio.transcriptions.create(
+            model="whisper-1",
+            file=audio_file
         )
-        return speech_response.content
+        return transcript.text
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    def _voice_chat_messages(self, user_text: str) -> List[dict]:
+        """음성 대화 응답 생성을 위한 GPT 메시지 구성"""
+        return [
+            {"role": "system", "content": """당신은 아이들과 대화하는 친근한 AI 선생님입니다.
+            아이의 이야기에 대해 짧고 긍정적인 정서적 피드백만 제공하세요.
+            그림에 대한 구체적인 제안이나 수정사항은 언급하지 말고,
+            아이의 감정과 생각을 지지하고 격려하는 답변만 해주세요.
+            답변은 1-2문장으로 매우 짧게 해주세요."""},
+            {"role": "user", "content": user_text}
+        ]
 
 
     # 🧠 GPT를 사용한 대화 요약
-    def _summarize_conversation(self, chat_history: List[ChatMessage]) -> str:
-        """대화 기록을 요약합니다 (GPT 사용)."""
+    async def _summarize_conversation(self, chat_history: List[Message], previous_summary: str = "") -> str:
+        """대화 기록을 요약합니다 (GPT 사용). previous_summary가 있으면 이어서 갱신된 요약을 만듭니다."""
         try:
-            if not chat_history:
+            if not chat_history and not previous_summary:
                 return "대화 기록이 존재하지 않습니다."
 
-            messages = [{"role": msg.role, "content": msg.text} for msg in chat_history]
+            # 이미 요약된 앞부분은 요약문으로만 전달 (세션이 길어져도 입력 토큰 수 일정)
+            conversation = "\n".join(f"{msg.role}: {msg.text}" for msg in chat_history)
+            if previous_summary:
+                conversation = f"이전 대화 요약: {previous_summary}\n{conversation}"
 
-            response = openai.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
-                    {"role": "system", "content": "다음 대화 내용을 요약해 주세요."}
-                ] + messages
+                    {"role": "system", "content": "다음 대화 내용을 요약해 주세요."},
+                    {"role": "user", "content": conversation}
+                ]
             )
             summary = response.choices[0].message.content.strip()
             logger.debug(f"Conversation summary: {summary}")
@@ -111,27 +343,235 @@ class DrawingServiceImpl(DrawingService):
             return self._handle_error(e, "_summarize_conversation")
 
 
-    # 🧠 GPT를 사용한 이미지 분석
-    def _analyze_final_image(self, image_url: str, chat_history: List[ChatMessage]) -> str:
-        """이미지 분석을 수행합니다 (GPT 사용)."""
+    # 🧠 여러 세션의 대화를 한 번에 요약 (/drawing/done/batch)
+    async def summarize_sessions(self, canvas_ids: List[str]) -> Dict[str, str]:
+        """대화 기록이 있는 세션들을 번호를 붙여 한 번의 GPT 요청으로 요약 (JSON 응답)
+
+        응답을 해석할 수 없거나 빠진 세션은 결과에 없으며, 그 세션은 done 처리 중 따로 요약합니다.
+        """
+        sessions = [
+            drawing_data for drawing_data in await asyncio.gather(*map(self.drawing_data.aget, canvas_ids))
+            if drawing_data and (drawing_data.chat_history or drawing_data.history_summary)
+        ]
+        if len(sessions) < 2:
+            return {}
+        conversations = "\n\n".join(
+            f"[{index}]\n{drawing_data.conversation_text()}" for index, drawing_data in enumerate(sessions, 1)
+        )
         try:
-            logger.info(f"Downloading image from S3: {image_url}")
+            response = await self.client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                response_format={"type": "json_object"},
+                messages=[
+                    {"role": "system", "content": (
+                        "다음은 번호가 붙은 여러 개의 대화입니다. 각 대화 내용을 따로 요약해 주세요. "
+                        '대화 번호를 키로, 요약을 값으로 하는 JSON 객체로만 답해 주세요. 예: {"1": "요약", "2": "요약"}'
+                    )},
+                    {"role": "user", "content": conversations}
+                ]
+            )
+            summaries = json.loads(response.choices[0].message.content)
+        except Exception as e:
+            logger.warning(f"Batched summary failed for {len(sessions)} sessions: {str(e)}")
+            return {}
+        result = {}
+        for index, drawing_data in enumerate(sessions, 1):
+            summary = summaries.get(str(index)) if isinstance(summaries, dict) else None
+            if isinstance(summary, str) and summary.strip():
+                result[drawing_data.canvas_id] = summary.strip()
+        logger.info(f"Batched summary: {len(result)}/{len(sessions)} sessions in one request")
+        return result
+
+
+    # 🧠 오래된 대화를 누적 요약으로 합치기
+    def _schedule_history_fold(self, drawing_data: DrawingData):
+        """창 밖으로 밀려난 메시지가 CHAT_SUMMARY_BATCH개 이상이면 백그라운드에서 요약에 합침"""
+        if drawing_data is None:
+            return
+        canvas_id = drawing_data.canvas_id
+        if canvas_id in self._folding:
+            return
+        if len(drawing_data.chat_history) - CHAT_WINDOW_MESSAGES < CHAT_SUMMARY_BATCH:
+            return
+        task = asyncio.ensure_future(self._fold_history(canvas_id))
+        self._folding[canvas_id] = task
+        task.add_done_callback(lambda _: self._folding.pop(canvas_id, None))
+
+
+    async def _fold_history(self, canvas_id: str):
+        try:
+            drawing_data = await self.drawing_data.aget(canvas_id)
+            if not drawing_data:
+                return
+            folded = drawing_data.chat_history[:len(drawing_data.chat_history) - CHAT_WINDOW_MESSAGES]
+            # 응답 지연과 무관한 작업이므로 음성 대화 턴보다 뒤로 처리
+            with openai_priority(Priority.BACKGROUND):
+                summary = await self._summarize_conversation(folded, drawing_data.history_summary)
+            if summary.startswith("error"):
+                return
+
+            # 요약하는 동안 다른 턴이 저장했을 수 있으므로 최신 세션에 적용
+            applied = False
+
+            def fold(latest: DrawingData) -> bool:
+                nonlocal applied
+                applied = latest.fold_history(folded, summary)
+                return applied
+
+            latest = await self.drawing_data.update(canvas_id, fold)
+            if applied:
+                logger.info(
+                    f"Folded {len(folded)} messages into history summary for canvas_id {canvas_id} "
+                    f"({latest.summarized_messages} summarized, {len(latest.chat_history)} kept)"
+                )
+        except Exception as e:
+            self._handle_error(e, "_fold_history")
+
+
+    # 🔮 API 메서드
+    def note_canvas_frame(self, canvas_id: str, frame: str):
+        """실시간 그림 프레임 기록 (추측 생성 사용 시 배경 프롬프트 초안에 사용)"""
+        if not self.speculative:
+            return
+        draft = self._draft(canvas_id)
+        draft.pending_frame = frame
+        draft.frame_version += 1
+        self._schedule_speculation(canvas_id)
+
+
+    # 🔮 /drawing/done 결과 미리 만들기
+    def _draft(self, canvas_id: str) -> DoneDraft:
+        draft = self._drafts.get(canvas_id)
+        if draft is None:
+            draft = self._drafts[canvas_id] = DoneDraft()
+            while len(self._drafts) > MAX_DONE_DRAFTS:
+                stale_id, _ = self._drafts.popitem(last=False)
+                self._cancel_speculation(stale_id)
+        return draft
+
+
+    def _schedule_speculation(self, canvas_id: str):
+        """입력이 SPECULATIVE_IDLE_SECONDS 동안 없으면 초안 갱신 (새 입력이 오면 다시 대기)"""
+        if not self.speculative:
+            return
+        self._draft(canvas_id)
+        self._cancel_speculation(canvas_id)
+        task = asyncio.ensure_future(self._speculate(canvas_id))
+        self._speculation_tasks[canvas_id] = task
+        task.add_done_callback(
+            lambda t: self._speculation_tasks.pop(canvas_id, None) if self._speculation_tasks.get(canvas_id) is t else None
+        )
 
-            # 1. S3에서 이미지 다운로드
-            response = requests.get(image_url)
-            if response.status_code != 200:
-                raise ValueError(f"Failed to download image from S3. Status code: {response.status_code}")
-            
-            image_data = BytesIO(response.content)
-            image_base64 = base64.b64encode(image_data.getvalue()).decode('utf-8')
-            
-            logger.info("Successfully downloaded and encoded the image from S3.")
 
-            # chat_history를 문자열로 변환
-            conversation = "\n".join([f"{msg.role}: {msg.text}" for msg in chat_history])
+    def _cancel_speculation(self, canvas_id: str):
+        task = self._speculation_tasks.pop(canvas_id, None)
+        if task is not None:
+            task.cancel()
+
+
+    def _count_speculation(self, artifact: str, outcome: str):
+        key = (artifact, outcome)
+        self.speculation_stats[key] = self.speculation_stats.get(key, 0) + 1
+
+
+    async def _speculate(self, canvas_id: str):
+        await asyncio.sleep(SPECULATIVE_IDLE_SECONDS)
+        drawing_data = await self.drawing_data.aget(canvas_id)
+        draft = self._drafts.get(canvas_id)
+        if not drawing_data or draft is None:
+            return
+        key = _history_key(drawing_data)
+        try:
+            # 음성 대화 턴보다 뒤로 처리
+            with openai_priority(Priority.BACKGROUND):
+                if draft.summary_key != key:
+                    summary = await self._summarize_conversation(list(drawing_data.chat_history), drawing_data.history_summary)
+                    if not summary.startswith("error"):
+                        draft.summary, draft.summary_key = summary, key
+                        self._count_speculation("summary", "drafted")
+
+                if draft.pending_frame is not None:
+                    frame, draft.pending_frame = draft.pending_frame, None
+                    frame_bytes = decode_frame(frame)
+                    if frame_bytes is not None:
+                        draft.frame = await asyncio.to_thread(self.image_cache.prepare, frame_bytes)
+                        draft.frame_signature = await asyncio.to_thread(_prepared_signature, draft.frame)
+
+                prompt_key = (key, draft.frame_version)
+                if draft.frame is not None and draft.frame_signature is not None and draft.prompt_key != prompt_key:
+                    draft.background_prompt = await self._generate_background_prompt(
+                        draft.frame, drawing_data.conversation_text()
+                    )
+                    draft.prompt_key = prompt_key
+                    self._count_speculation("background_prompt", "drafted")
+            logger.debug(f"Refreshed done draft for canvas_id {canvas_id}")
+        except Exception as e:
+            self._handle_error(e, "_speculate")
+
+
+    async def _reconcile_summary(self, chat_history: List[Message], history_summary: str,
+                                 draft: Optional[DoneDraft], key: tuple, summary: Optional[str] = None) -> str:
+        """미리 만든 요약(묶음 요약)이 있거나 대화가 초안 이후 바뀌지 않았으면 그대로 사용"""
+        if summary:
+            return summary
+        if draft and draft.summary and draft.summary_key == key:
+            self._count_speculation("summary", "reused")
+            return draft.summary
+        if draft:
+            self._count_speculation("summary", "stale")
+        return await self._summarize_conversation(chat_history, history_summary)
+
+
+    async def _reconcile_background_prompt(self, image: PreparedImage, conversation: str,
+                                           draft: Optional[DoneDraft], key: Optional[tuple]) -> str:
+        """대화가 그대로이고 최종 그림이 초안 프레임과 비슷하면 배경 프롬프트 초안 사용"""
+        prompt = await self._draft_background_prompt(image, draft, key)
+        return prompt or await self._generate_background_prompt(image, conversation)
+
+
+    async def _draft_background_prompt(self, image: Union[PreparedImage, Awaitable[PreparedImage]],
+                                       draft: Optional[DoneDraft], key: Optional[tuple]) -> Optional[str]:
+        """재사용할 수 있는 배경 프롬프트 초안 (없거나 대화 / 그림이 바뀌었으면 None)"""
+        if not draft:
+            return None
+        if draft.background_prompt and draft.prompt_key and draft.prompt_key[0] == key:
+            try:
+                if not isinstance(image, PreparedImage):
+                    image = await image
+                signature = await asyncio.to_thread(_prepared_signature, image)
+            except Exception as e:
+                logger.warning(f"Background prompt draft check failed: {str(e)}")
+                signature = None
+            if signature is not None and frame_difference(signature, draft.frame_signature) <= SPECULATIVE_FRAME_THRESHOLD:
+                self._count_speculation("background_prompt", "reused")
+                return draft.background_prompt
+        self._count_speculation("background_prompt", "stale")
+        return None
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    def _set_session_audio(self, drawing_data: DrawingData, text: str, audio: bytes):
+        """안내 음성을 저장소에 넣고 세션에는 audio_id와 문장만 기록"""
+        drawing_data.audio_id = self.audio_store.put(audio)
+        drawing_data.audio_text = text
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    async def _fetch_image(self, image_url: str) -> PreparedImage:
+        """S3 이미지를 다운로드하여 비전 모델용으로 축소 / 인코딩 (캐시 공유)"""
+        return await self.image_cache.get(image_url, self.http_client)
+
+
+    # 🧠 GPT를 사용한 이미지 분석
+    async def _analyze_final_image(self, image_url: str, conversation: str,
+                                   image: Optional[Awaitable[PreparedImage]] = None) -> str:
+        """이미지 분석을 수행합니다 (GPT 사용)."""
+        try:
+            # 1. S3에서 이미지 다운로드 (파이프라인에서 이미 받은 이미지가 있으면 공유)
+            image = await (image or self._fetch_image(image_url))
             
-            response = openai.chat.completions.create(
-                model="gpt-3.5-turbo",
+            response = await self.client.chat.completions.create(
+                model=VISION_MODEL,
                 messages=[
                     {
                         "role": "system",
@@ -141,8 +581,7 @@ class DrawingServiceImpl(DrawingService):
                         아이의 그림에 대해서 1~2 문장 내외의 따뜻한 피드백을 제공합니다.
                         """
                     },
-                    {"role": "user", "content": f"대화 내용:\n{conversation}"},
-                    {"role": "user", "content": f"data:image/png;base64,{image_base64}"}
+                    vision_message(f"대화 내용:\n{conversation}", image.data_url)
                 ]
                 # max_tokens=300
             )
@@ -150,7 +589,7 @@ class DrawingServiceImpl(DrawingService):
             logger.debug(f"Image analysis result: {analysis}")
             return analysis
         
-        except requests.exceptions.RequestException as re:
+        except httpx.HTTPError as re:
             logger.error(f"Network error while downloading image: {str(re)}", exc_info=True)
             return self._handle_error(re, "_analyze_final_image")
         
@@ -165,7 +604,7 @@ class DrawingServiceImpl(DrawingService):
 
 
     # 🧠 GPT를 사용한 그림 제목 생성
-    def _generate_drawing_name(self, analysis: str, summary: str) -> str:
+    async def _generate_drawing_name(self, analysis: str, summary: str) -> str:
         """그림 제목을 생성합니다 (GPT 사용)."""
         try:
             prompt = (
@@ -174,7 +613,7 @@ class DrawingServiceImpl(DrawingService):
                 f"위 내용을 바탕으로 창의적이고 매력적인 그림 제목을 한 문장으로 생성해주세요."
             )
             
-            response = openai.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "그림 제목을 창의적으로 생성해주세요."},
@@ -189,84 +628,89 @@ class DrawingServiceImpl(DrawingService):
             return self._handle_error(e, "_generate_drawing_name")
 
 
+    # 🧠 GPT를 사용한 배경 프롬프트 생성
+    async def _generate_background_prompt(self, image: PreparedImage, conversation: str) -> str:
+        """아이 눈높이에서 그림을 해석하고 DALL-E 프롬프트를 생성합니다 (GPT 사용)."""
+        logger.info("Generating background prompt using GPT...")
+        gpt_response = await self.client.chat.completions.create(
+            model=VISION_MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": """
+                    당신은 3~7세 아이들의 둘도 없는 친구입니다.
+                    어린 아이의 시각에서 그림을 따뜻하게 이해하고 해석합니다.
+                    아이의 그림에 어울리는 배경 생성을 위한 dalle 3 프롬프트를 생성합니다.
+                    """
+                },
+                vision_message(f"대화 내용:\n{conversation}", image.data_url)
+            ],
+            max_tokens=200
+        )
+        
+        # 응답 데이터 유효성 검증
+        if not gpt_response.choices or not gpt_response.choices[0].message.content:
+            raise ValueError("GPT 응답이 유효하지 않습니다.")
+        
+        background_description = gpt_response.choices[0].message.content.strip()
+        logger.info(f"Background description from GPT: {background_description}")
+        return background_description
+
+
+    # 🎨 DALL-E-3를 사용한 배경 이미지 생성
+    async def _generate_dalle_background(self, background_description: str) -> str:
+        """배경 프롬프트로 DALL-E-3 이미지를 생성하고 URL을 반환합니다."""
+        logger.info("Generating background image using DALL-E-3...")
+        dalle_response = await self.client.images.generate(
+            model="dall-e-3",
+            prompt=(
+                f"아이의 창의적 그림을 위한 배경: {background_description}. "
+                "어린이 친화적이고 부드러운 색상과 동화 같은 분위기로 구성해주세요. "
+                "어린이가 그린 그림과 잘 어울리는 배경을 생성해주세요. "
+                "어린이가 그린 그림이 돋보일 수 있게 단순하고 희미한 그림으로 생성해주세요."
+                "동화책 느낌의 파스텔톤 배경을 생성해주세요."
+                "지나치게 복잡하거나 산만한 무늬와 패턴은 피하고 단순하고 명료한 배경을 생성해주세요."
+            ),
+            size="1024x1024"
+        )
+        
+        # 응답 데이터 유효성 검증
+        if not dalle_response.data or not dalle_response.data[0].url:
+            raise ValueError("DALL-E 응답이 유효하지 않습니다.")
+        
+        background_image_url = dalle_response.data[0].url
+        logger.debug(f"생성된 배경 이미지 URL: {background_image_url}")
+        return background_image_url
+
+
     # 🧠 GPT + DALL-E-3를 사용한 배경 이미지 생성
-    def _generate_background_image(self, image_url: str, chat_history: List[ChatMessage]) -> str:
-        """아이의 그림을 해석하고 어울리는 배경 이미지를 생성합니다 (GPT + DALL-E-3 사용)."""
+    async def _generate_background_image(self, image_url: str, conversation: str,
+                                         image: Optional[Awaitable[PreparedImage]] = None,
+                                         timer: Optional[StageTimer] = None,
+                                         draft: Optional[DoneDraft] = None, history_key: Optional[tuple] = None,
+                                         prompt: Optional[str] = None) -> str:
+        """아이의 그림을 해석하고 어울리는 배경 이미지를 생성합니다 (GPT + DALL-E-3 사용).
+
+        prompt가 주어지면 (재사용한 초안) 이미지 다운로드와 프롬프트 생성을 건너뜁니다.
+        """
+        timer = timer or StageTimer()
         try:
-            logger.info(f"Downloading image from S3: {image_url}")
+            # 배경 생성은 음성 대화 턴보다 뒤로 밀리도록 낮은 우선순위로 요청
+            with openai_priority(Priority.BACKGROUND):
+                background_description = prompt
+                if not background_description:
+                    # 🖼️ 1. 이미지 다운로드 및 축소 / 인코딩 (공유 이미지가 있으면 재사용)
+                    image = await (image or self._fetch_image(image_url))
 
+                    # 🧠 2. GPT로 DALL-E 프롬프트 생성
+                    background_description = await timer.run(
+                        "background_prompt", self._reconcile_background_prompt(image, conversation, draft, history_key)
+                    )
 
-            # 🖼️ 1. 이미지 다운로드 및 Base64 인코딩
-            response = requests.get(image_url)
-            if response.status_code != 200:
-                raise ValueError(f"Failed to download image from S3. Status code: {response.status_code}")
-            
-            image_data = BytesIO(response.content)
-            image_base64 = base64.b64encode(image_data.getvalue()).decode('utf-8')
-            
-            print(f"image_base64: {image_base64}")
-            
-            logger.info("Successfully downloaded and encoded the image from S3.")
-            
-            # 💬 2. 대화 이력 포맷팅
-            conversation = "\n".join([f"{msg.role}: {msg.text}" for msg in chat_history])
-            
-            # 🧠 3. GPT로 아이 눈높이에서 그림 해석 및 DALL-E 프롬프트 생성
-            logger.info("Generating background prompt using GPT...")
-            gpt_response = openai.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """
-                        당신은 3~7세 아이들의 둘도 없는 친구입니다.
-                        어린 아이의 시각에서 그림을 따뜻하게 이해하고 해석합니다.
-                        아이의 그림에 어울리는 배경 생성을 위한 dalle 3 프롬프트를 생성합니다.
-                        """
-                    },
-                    {
-                        "role": "user", 
-                        "content": f"대화 내용:\n{conversation}"
-                    },
-                    {
-                        "role": "user",
-                        "content": f"data:image/png;base64,{image_base64}"
-                    }
-                ],
-                max_tokens=200
-            )
-            
-            # 응답 데이터 유효성 검증
-            if not gpt_response.choices or not gpt_response.choices[0].message.content:
-                raise ValueError("GPT 응답이 유효하지 않습니다.")
-            
-            background_description = gpt_response.choices[0].message.content.strip()
-            logger.info(f"Background description from GPT: {background_description}")
-
-            # 🎨 4. DALL-E-3로 배경 이미지 생성
-            logger.info("Generating background image using DALL-E-3...")
-            dalle_response = openai.images.generate(
-                model="dall-e-3",
-                prompt=(
-                    f"아이의 창의적 그림을 위한 배경: {background_description}. "
-                    "어린이 친화적이고 부드러운 색상과 동화 같은 분위기로 구성해주세요. "
-                    "어린이가 그린 그림과 잘 어울리는 배경을 생성해주세요. "
-                    "어린이가 그린 그림이 돋보일 수 있게 단순하고 희미한 그림으로 생성해주세요."
-                    "동화책 느낌의 파스텔톤 배경을 생성해주세요."
-                    "지나치게 복잡하거나 산만한 무늬와 패턴은 피하고 단순하고 명료한 배경을 생성해주세요."
-                ),
-                size="1024x1024"
-            )
-            
-            # 응답 데이터 유효성 검증
-            if not dalle_response.data or not dalle_response.data[0].url:
-                raise ValueError("DALL-E 응답이 유효하지 않습니다.")
-            
-            background_image_url = dalle_response.data[0].url
-            logger.debug(f"생성된 배경 이미지 URL: {background_image_url}")
-            return background_image_url
-        
-        except requests.exceptions.RequestException as re:
+                # 🎨 3. DALL-E-3로 배경 이미지 생성
+                return await timer.run("background_image", self._generate_dalle_background(background_description))
+
+        except httpx.HTTPError as re:
             logger.error(f"Network error while downloading image: {str(re)}", exc_info=True)
             return self._handle_error(re, "_generate_background_image")
         
@@ -280,10 +724,62 @@ class DrawingServiceImpl(DrawingService):
 
 
 
+    # 🎨 배경 이미지 작업 (BACKGROUND_IMAGE_ASYNC)
+    async def _submit_background_job(self, canvas_id: str, image_url: str, conversation: str,
+                                     prompt: Optional[str]) -> str:
+        """배경 이미지 작업 등록 후 작업 ID 반환 (작업 입력만으로 재시작 후에도 다시 실행할 수 있음)"""
+        _, (job,) = await self.background_jobs.submit("background", [{
+            "canvas_id": canvas_id,
+            "image_url": image_url,
+            "conversation": conversation,
+            "background_prompt": prompt,
+        }], batch_id=canvas_id)
+        return job.job_id
+
+
+    async def _run_background_job(self, job: Job, _prepared=None) -> dict:
+        """배경 이미지 생성 후 세션의 image_id / background_image 갱신"""
+        params = job.params
+        background_image = await self._generate_background_image(
+            params["image_url"], params["conversation"], prompt=params.get("background_prompt")
+        )
+        if background_image.startswith("error"):
+            raise ValueError(background_image.replace("error: ", ""))
+
+        # 생성하는 동안 음성 대화 턴이 저장했을 수 있으므로 배경 필드만 최신 세션에 적용
+        # (그 사이 새 그림으로 더 나중 작업이 등록되었으면 적용하지 않음)
+        # 세션에 적힌 다른 작업은 update 밖에서 조회한 뒤 다시 적용 (작업 저장소 I/O로 세션 갱신 중 루프를 막지 않음)
+        known: Dict[str, Optional[Job]] = {}
+        missing: List[str] = []
+
+        def apply(drawing_data: DrawingData) -> bool:
+            current = drawing_data.background_job_id
+            if current and current != job.job_id:
+                if current not in known:
+                    missing.append(current)
+                    return False
+                newer = known[current]
+                if newer is not None and newer.created_at > job.created_at:
+                    return False
+            drawing_data.image_id = drawing_data.background_image = background_image
+            drawing_data.background_job_id = job.job_id
+            return True
+
+        await self.drawing_data.update(job.canvas_id, apply)
+        while missing:
+            current = missing.pop()
+            known[current] = await self.background_jobs.store.aget(current)
+            await self.drawing_data.update(job.canvas_id, apply)
+        logger.info(f"Background image ready for canvas_id {job.canvas_id} (job {job.job_id})")
+        return {"background_image": background_image}
+
+
+
     # 🖌️ API 메서드
     async def handle_new_drawing(self, request: NewDrawingRequest) -> str:
         try:
             logger.info(f"Processing new drawing request for canvas_id: {request.canvas_id}")
+            annotate(canvas_id=request.canvas_id, robot_id=request.robot_id)
             if not request.robot_id or not request.name or not request.canvas_id:
                 raise ValueError("Missing required fields in NewDrawingRequest.")
             
@@ -293,12 +789,12 @@ class DrawingServiceImpl(DrawingService):
                 age=request.age,
                 canvas_id=request.canvas_id
             )
-            self.drawing_data[request.canvas_id] = drawing_data
             
             initial_text = self._generate_initial_text(request.name, request.age)
             drawing_data.prompt = initial_text
             drawing_data.add_message("assistant", initial_text)
-            drawing_data.audio_data = self._create_tts_response(initial_text)
+            self._set_session_audio(drawing_data, initial_text, await self._create_tts_response(initial_text))
+            await self.drawing_data.asave(drawing_data)
             
             logger.info(f"Successfully processed new drawing request for canvas_id: {request.canvas_id}")
             return "success"
@@ -312,32 +808,95 @@ class DrawingServiceImpl(DrawingService):
 
 
     # 🧠 GPT를 사용한 그림 완성
-    async def handle_done_drawing(self, request: DoneDrawingRequest) -> str:
+    async def handle_done_drawing(self, request: DoneDrawingRequest, summary: Optional[str] = None) -> str:
+        """그림 완성 처리 (summary: summarize_sessions로 미리 만든 대화 요약, 없으면 여기서 생성)"""
         try:
             logger.info(f"Processing done drawing request for canvas_id: {request.canvas_id}")
+            annotate(canvas_id=request.canvas_id)
             
-            drawing_data = self.drawing_data.get(request.canvas_id)
-            print(f"request: {request.canvas_id}")
-            print(f"drawing_data: {drawing_data}")
+            drawing_data = await self.drawing_data.aget(request.canvas_id)
             
             if not drawing_data:
                 return self._handle_error(ValueError("No drawing data found"), "handle_done_drawing")
             
-            drawing_data.image_id = request.image_url
-            drawing_data.summary = self._summarize_conversation(drawing_data.chat_history)
-            drawing_data.analysis = self._analyze_final_image(request.image_url, drawing_data.chat_history)
-            drawing_data.drawing_name = self._generate_drawing_name(drawing_data.analysis, drawing_data.summary)
-            drawing_data.image_id = self._generate_background_image(request.image_url, drawing_data.chat_history)
-            print(f"drawing_data: {drawing_data.image_id}")
-            
+            # 💬 누적 요약 + 최근 대화 (세션 길이와 관계없이 일정한 크기)
+            chat_history = list(drawing_data.chat_history)
+            conversation = drawing_data.conversation_text()
+            timer = StageTimer()
+
+            # 🔮 세션 중 미리 만든 초안 (대화 / 그림이 바뀌었으면 다시 생성)
+            history_key = _history_key(drawing_data)
+            self._cancel_speculation(request.canvas_id)
+            draft = self._drafts.pop(request.canvas_id, None)
+
+            # 이미지는 한 번만 다운로드하여 분석 / 배경 생성 단계가 공유
+            image_task = asyncio.ensure_future(timer.run("s3_fetch", self._fetch_image(request.image_url)))
+
+            # 서로 독립적인 단계는 동시에 시작
+            summary_task = asyncio.ensure_future(
+                timer.run("summary", self._reconcile_summary(chat_history, drawing_data.history_summary, draft, history_key, summary))
+            )
+            analysis_task = asyncio.ensure_future(
+                timer.run("analysis", self._analyze_final_image(request.image_url, conversation, image_task))
+            )
+            if self.background_async:
+                # 배경 이미지는 응답 후 작업 큐에서 생성 (재사용할 수 있는 프롬프트 초안만 확인)
+                background_task = asyncio.ensure_future(self._draft_background_prompt(image_task, draft, history_key))
+            else:
+                background_task = asyncio.ensure_future(
+                    self._generate_background_image(request.image_url, conversation, image_task, timer, draft, history_key)
+                )
+
+            # 제목은 요약과 분석 결과만 기다림
+            summary, analysis = await asyncio.gather(summary_task, analysis_task)
+            drawing_name = await timer.run("drawing_name", self._generate_drawing_name(analysis, summary))
+
             final_message = (
                 f"우와! 정말 멋진 그림이 완성되었어요! "
-                f"이 그림의 이름은 '{drawing_data.drawing_name}' 이고, "
-                f"이 그림은 {drawing_data.analysis} 느낌이 나는 작품이에요."
+                f"이 그림의 이름은 '{drawing_name}' 이고, "
+                f"이 그림은 {analysis} 느낌이 나는 작품이에요."
             )
-            drawing_data.add_message("ai", final_message)
-            drawing_data.audio_data = self._create_tts_response(final_message)
-            
+
+            # 최종 TTS와 배경 이미지 생성(DALL-E)은 서로 기다리지 않음
+            final_audio, background = await asyncio.gather(
+                timer.run("tts", self._create_tts_response(final_message)),
+                background_task
+            )
+            background_job_id = None
+            if self.background_async:
+                # 세션 저장 전에 등록 (작업이 먼저 끝나도 세션에는 결과와 작업 ID가 함께 남음)
+                background_job_id = await self._submit_background_job(request.canvas_id, request.image_url, conversation, background)
+            audio_id = self.audio_store.put(final_audio)
+
+            # ⏱️ 단계별 소요 시간 및 임계 경로 기록
+            stage_timings = timer.report(DONE_PIPELINE_DEPENDENCIES)
+            observe_stage("done", time.perf_counter() - timer.started)
+            critical_path = [stage for stage, timing in stage_timings.items() if timing["critical"]]
+            logger.info(
+                f"Done pipeline timings for canvas_id {request.canvas_id}: "
+                f"{ {stage: timing['duration_ms'] for stage, timing in stage_timings.items()} } "
+                f"critical path: {' -> '.join(critical_path)}"
+            )
+
+            # 처리하는 동안 음성 대화 턴이 저장했을 수 있으므로 결과만 최신 세션에 적용
+            def apply(latest: DrawingData):
+                latest.summary, latest.analysis, latest.drawing_name = summary, analysis, drawing_name
+                latest.add_message("ai", final_message)
+                latest.audio_id, latest.audio_text = audio_id, final_message
+                if background_job_id:
+                    # 작업이 이미 끝나 결과를 기록했으면 그대로 유지
+                    if latest.background_job_id != background_job_id:
+                        latest.image_id, latest.background_image = request.image_url, None
+                        latest.background_job_id = background_job_id
+                else:
+                    latest.image_id = latest.background_image = background
+                latest.stage_timings = stage_timings
+
+            drawing_data = await self.drawing_data.update(request.canvas_id, apply)
+            if drawing_data is None:
+                return self._handle_error(ValueError("No drawing data found"), "handle_done_drawing")
+            annotate(background_job_id=background_job_id)
+
             logger.info(f"Successfully processed done drawing request for canvas_id: {request.canvas_id}")
             return "success"
 
@@ -347,89 +906,72 @@ class DrawingServiceImpl(DrawingService):
 
     # 🧠 사용자의 음성 입력을 처리하고 응답하는 메서드
     async def process_audio(self, audio_data: bytes, robot_id: str, canvas_id: str) -> AudioProcessingResult:
+        drawing_data = None
+        user_text = ""
         try:
             # 오디오 처리 시작 로깅
             logger.info(f"Processing audio for canvas_id: {canvas_id}")
+            annotate(canvas_id=canvas_id, robot_id=robot_id)
             # 캔버스 ID로 그림 데이터 조회
-            drawing_data = self.drawing_data.get(canvas_id)
+            drawing_data = await self.drawing_data.aget(canvas_id)
             # 데이터가 없으면 에러 발생
             if not drawing_data:
                 raise ValueError(f"Drawing data not found for canvas_id: {canvas_id}")
-            
-            # 음성 데이터를 임시 WAV 파일로 저장
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_file.write(audio_data)
-                temp_file_path = temp_file.name
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_file.write(audio_data)
-                temp_file_path = temp_file.name
-                # 임시 파일 생성 로깅
-                logger.debug(f"Created temporary file: {temp_file_path}")
 
-            try:
-                # 음성을 텍스트로 변환 (Speech-to-Text)
-                with open(temp_file_path, 'rb') as audio_file:
-                    transcript = openai.audio.transcriptions.create(
-                        model="whisper-1",
-                        file=audio_file
-                    )
-                # 변환된 텍스트 저장
-                user_text = transcript.text
-                # 사용자 메시지를 대화 기록에 추가
-                drawing_data.add_message("user", user_text)
-                # 변환된 텍스트 로깅
-                logger.debug(f"Transcribed text: {user_text}")
+            # 무음 제거 후 음성을 텍스트로 변환 (Speech-to-Text), 말소리가 없으면 STT / 대화 생성 생략
+            speech = await self._prepare_speech(audio_data)
+            user_text = (await self._transcribe_audio(speech)).strip() if speech is not None else ""
+            if not user_text:
+                logger.info(f"No speech detected for canvas_id: {canvas_id}")
+                return AudioProcessingResult(
+                    text=NO_SPEECH_TEXT,
+                    audio_data=await self._create_tts_response(NO_SPEECH_TEXT)
+                )
+            # 변환된 텍스트 로깅
+            logger.debug(f"Transcribed text: {user_text}")
 
-                # GPT 모델을 사용하여 응답 생성
-                chat_response = openai.chat.completions.create(
+            # GPT 모델을 사용하여 응답 생성 (짧은 답변: 제한 시간을 짧게, 늦으면 헤징)
+            with call_policy("chat_short"):
+                chat_response = await self.client.chat.completions.create(
                     model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": """당신은 아이들과 대화하는 친근한 AI 선생님입니다.
-                        아이의 이야기에 대해 짧고 긍정적인 정서적 피드백만 제공하세요.
-                        그림에 대한 구체적인 제안이나 수정사항은 언급하지 말고,
-                        아이의 감정과 생각을 지지하고 격려하는 답변만 해주세요.
-                        답변은 1-2문장으로 매우 짧게 해주세요."""},
-                        {"role": "user", "content": user_text}
-                    ]
-                )
-                # GPT 응답 텍스트 추출
-                response_text = chat_response.choices[0].message.content
-                # AI 응답을 대화 기록에 추가
-                drawing_data.add_message("ai", response_text)
-                # 생성된 응답 로깅
-                logger.debug(f"Generated response: {response_text}")
-
-                # 응답 텍스트를 음성으로 변환
-                audio_content = self._create_tts_response(response_text)
-                # 성공적인 처리 완료 로깅
-                logger.info(f"Successfully processed audio for canvas_id: {canvas_id}")
-
-                # 처리 결과 반환
-                return AudioProcessingResult(
-                    text=response_text,
-                    audio_data=audio_content
+                    messages=self._voice_chat_messages(user_text)
                 )
+            # GPT 응답 텍스트 추출
+            response_text = chat_response.choices[0].message.content
+            # 생성된 응답 로깅
+            logger.debug(f"Generated response: {response_text}")
 
-            finally:
-                # 임시 파일 삭제
-                os.unlink(temp_file_path)
-                # 파일 삭제 로깅
-                logger.debug(f"Deleted temporary file: {temp_file_path}")
+            # 응답 텍스트를 음성으로 변환
+            audio_content = await self._create_tts_response(response_text)
+            # 사용자 메시지와 AI 응답을 함께 최신 세션의 대화 기록에 추가
+            drawing_data = await self._record_turn(canvas_id, user_text, response_text)
+            self._schedule_history_fold(drawing_data)
+            self._schedule_speculation(canvas_id)
+            # 성공적인 처리 완료 로깅
+            logger.info(f"Successfully processed audio for canvas_id: {canvas_id}")
+
+            # 처리 결과 반환
+            return AudioProcessingResult(
+                text=response_text,
+                audio_data=audio_content,
+                user_text=user_text
+            )
 
         except Exception as e:
             # 에러 발생 시 로깅
             logger.error(f"Error processing audio: {str(e)}", exc_info=True)
             # 기본 에러 응답 메시지
-            error_text = "죄송해요, 잘 이해하지 못했어요. 다시 한 번 말씀해 주시겠어요?"
+            error_text = VOICE_ERROR_TEXT
             if drawing_data:
                 # 에러 메시지를 대화 기록에 추가
-                drawing_data.add_message("ai", error_text)
+                await self._record_turn(canvas_id, user_text, error_text)
             try:
                 # 에러 메시지를 음성으로 변환
-                audio_content = self._create_tts_response(error_text)
+                audio_content = await self._create_tts_response(error_text)
                 return AudioProcessingResult(
                     text=error_text,
-                    audio_data=audio_content
+                    audio_data=audio_content,
+                    user_text=user_text
                 )
             except Exception as tts_error:
                 # TTS 변환 실패 시 로깅 및 에러 발생
@@ -438,22 +980,134 @@ class DrawingServiceImpl(DrawingService):
 
 
 
+    # 🧠 사용자의 음성 입력을 처리하고 응답을 문장 단위로 스트리밍하는 메서드
+    async def stream_audio(self, audio_data: bytes, robot_id: str, canvas_id: str) -> AsyncIterator[AudioStreamEvent]:
+        drawing_data = None
+        user_text = ""
+        sentences = []
+        sent_chunks = 0
+        try:
+            logger.info(f"Streaming audio response for canvas_id: {canvas_id}")
+            drawing_data = await self.drawing_data.aget(canvas_id)
+            if not drawing_data:
+                raise ValueError(f"Drawing data not found for canvas_id: {canvas_id}")
+
+            # 1. 무음 제거 후 음성을 텍스트로 변환 (whisper-1은 발화 단위 변환만 지원)
+            speech = await self._prepare_speech(audio_data)
+            user_text = (await self._transcribe_audio(speech)).strip() if speech is not None else ""
+            if not user_text:
+                logger.info(f"No speech detected for canvas_id: {canvas_id}")
+                audio_content = await self._create_tts_response(NO_SPEECH_TEXT)
+                yield AudioStreamEvent(type="chunk", text=NO_SPEECH_TEXT, audio_data=audio_content, index=0)
+                yield AudioStreamEvent(type="end", text=NO_SPEECH_TEXT, index=1)
+                return
+            yield AudioStreamEvent(type="transcript", text=user_text)
+
+            # 2. GPT 토큰 스트리밍 → 문장이 완성될 때마다 바로 TTS 시작, 순서대로 전송
+            # (소켓 턴이 취소되어 이 스트림이 닫히면 남은 문장의 TTS도 함께 취소)
+            async with contextlib.aclosing(self._stream_sentences_with_tts(user_text)) as chunks:
+                async for sentence, audio_content in chunks:
+                    sentences.append(sentence)
+                    yield AudioStreamEvent(type="chunk", text=sentence, audio_data=audio_content, index=sent_chunks)
+                    sent_chunks += 1
+
+            response_text = " ".join(sentences)
+            drawing_data = await self._record_turn(canvas_id, user_text, response_text)
+            self._schedule_history_fold(drawing_data)
+            self._schedule_speculation(canvas_id)
+            logger.info(f"Successfully streamed {sent_chunks} chunks for canvas_id: {canvas_id}")
+            yield AudioStreamEvent(type="end", text=response_text, index=sent_chunks)
+
+        except (asyncio.CancelledError, GeneratorExit):
+            # 바지인 / 취소: 이미 보낸 문장까지만 응답으로 기록 (보낸 문장이 없으면 기록하지 않음)
+            if sentences:
+                logger.info(f"Recording {len(sentences)} streamed sentences of a cancelled turn for canvas_id: {canvas_id}")
+                drawing_data = await asyncio.shield(self._record_turn(canvas_id, user_text, " ".join(sentences)))
+                self._schedule_history_fold(drawing_data)
+            raise
+
+        except Exception as e:
+            logger.error(f"Error streaming audio: {str(e)}", exc_info=True)
+            if drawing_data:
+                await self._record_turn(canvas_id, user_text, VOICE_ERROR_TEXT)
+            audio_content = await self._create_tts_response(VOICE_ERROR_TEXT)
+            yield AudioStreamEvent(type="chunk", text=VOICE_ERROR_TEXT, audio_data=audio_content, index=sent_chunks)
+            yield AudioStreamEvent(type="end", text=VOICE_ERROR_TEXT, index=sent_chunks + 1)
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    async def _record_turn(self, canvas_id: str, user_text: str, reply: str) -> Optional[DrawingData]:
+        """음성 대화 한 턴(사용자 메시지 + 응답)을 최신 세션에 한 번에 추가"""
+        def add_turn(drawing_data: DrawingData):
+            if user_text:
+                drawing_data.add_message("user", user_text)
+            drawing_data.add_message("ai", reply)
+
+        return await self.drawing_data.update(canvas_id, add_turn)
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    async def _stream_sentences_with_tts(self, user_text: str) -> AsyncIterator[tuple]:
+        """GPT 응답을 스트리밍으로 받아 문장별 (문장, TTS 음성)을 순서대로 반환"""
+        queue: asyncio.Queue = asyncio.Queue()
+
+        # 생산자: 토큰을 받아 문장이 완성되면 TTS 작업을 바로 시작
+        async def produce():
+            try:
+                stream = await self.client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=self._voice_chat_messages(user_text),
+                    stream=True
+                )
+                chunker = SentenceChunker()
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    for sentence in chunker.feed(chunk.choices[0].delta.content or ""):
+                        await queue.put((sentence, asyncio.ensure_future(self._create_tts_response(sentence))))
+                tail = chunker.flush()
+                if tail:
+                    await queue.put((tail, asyncio.ensure_future(self._create_tts_response(tail))))
+            finally:
+                await queue.put(None)
+
+        producer = asyncio.ensure_future(produce())
+        pending = []
+        try:
+            # 소비자: TTS 완료 순서와 관계없이 문장 순서대로 반환
+            while (item := await queue.get()) is not None:
+                sentence, tts_task = item
+                pending.append(tts_task)
+                yield sentence, await tts_task
+            await producer
+        finally:
+            producer.cancel()
+            for tts_task in pending:
+                tts_task.cancel()
+            while not queue.empty():
+                item = queue.get_nowait()
+                if item is not None:
+                    item[1].cancel()
+
+
+
     # 🧠 새로운 친구 추가
     async def handle_make_friend(self, request: MakeFriendRequest) -> str:
         try:
             logger.info(f"Processing make_friend request for canvas_id: {request.canvas_id}")
+            annotate(canvas_id=request.canvas_id)
             
             # 1️⃣ 기존 그림 데이터 가져오기
-            drawing_data = self.drawing_data.get(request.canvas_id)
+            drawing_data = await self.drawing_data.aget(request.canvas_id)
             if not drawing_data:
                 raise ValueError("No drawing data found for the given canvas_id.")
             
-            # 2️⃣ 대화 이력 포맷팅
-            conversation = "\n".join([f"{msg.role}: {msg.text}" for msg in drawing_data.chat_history])
+            # 2️⃣ 대화 이력 포맷팅 (누적 요약 + 최근 대화)
+            conversation = drawing_data.conversation_text()
             
             # 3️⃣ GPT로 새로운 대화 프롬프트 생성
             logger.info("Generating continuation prompt using GPT...")
-            gpt_response = self.client.chat.completions.create(
+            gpt_response = await self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": """
@@ -472,9 +1126,15 @@ class DrawingServiceImpl(DrawingService):
             continuation_prompt = gpt_response.choices[0].message.content.strip()
             logger.info(f"Continuation prompt: {continuation_prompt}")
             
-            # 4️⃣ TTS로 대화 응답 생성
-            drawing_data.audio_data = self._create_tts_response(continuation_prompt)
-            drawing_data.prompt = continuation_prompt
+            # 4️⃣ TTS로 대화 응답 생성 후 최신 세션에 적용
+            audio = await self._create_tts_response(continuation_prompt)
+
+            def apply(latest: DrawingData):
+                self._set_session_audio(latest, continuation_prompt, audio)
+                latest.prompt = continuation_prompt
+
+            if await self.drawing_data.update(request.canvas_id, apply) is None:
+                raise ValueError("No drawing data found for the given canvas_id.")
             
             logger.info("Successfully processed make_friend request.")
             return "success"
@@ -0,0 +1,23 @@
+from app.config import FEEDBACK_BUS, FEEDBACK_QUEUE_SIZE, FEEDBACK_POLL_INTERVAL, SESSION_DB_PATH, REDIS_URL, \
+    SESSION_MAX_SIZE, SESSION_TTL_SECONDS
+from app.services.feedback_bus.feedback_bus import FeedbackBus
+from app.services.feedback_bus.memory_feedback_bus import MemoryFeedbackBus
+from app.services.feedback_bus.sqlite_feedback_bus import SqliteFeedbackBus
+
+_feedback_bus: FeedbackBus = None
+
+def create_feedback_bus() -> FeedbackBus:
+    if FEEDBACK_BUS == "memory":
+        return MemoryFeedbackBus(max_size=FEEDBACK_QUEUE_SIZE, max_canvases=SESSION_MAX_SIZE, ttl_seconds=SESSION_TTL_SECONDS)
+    if FEEDBACK_BUS == "sqlite":
+        return SqliteFeedbackBus(SESSION_DB_PATH, max_size=FEEDBACK_QUEUE_SIZE, poll_interval=FEEDBACK_POLL_INTERVAL)
+    if FEEDBACK_BUS == "redis":
+        from app.services.feedback_bus.redis_feedback_bus import RedisFeedbackBus
+        return RedisFeedbackBus(REDIS_URL, max_size=FEEDBACK_QUEUE_SIZE)
+    raise ValueError(f"지원하지 않는 FEEDBACK_BUS 입니다: {FEEDBACK_BUS}")
+
+def get_feedback_bus() -> FeedbackBus:
+    global _feedback_bus
+    if _feedback_bus is None:
+        _feedback_bus = create_feedback_bus()
+    return _feedback_bus
@@ -0,0 +1,51 @@
+# 추상 클래스와 추상 메서드를 위한 ABC 모듈 임포트
+from abc import ABC, abstractmethod
+from typing import NamedTuple, Optional
+import asyncio
+
+
+# 그림 피드백 (생성 시각 포함)
+class Feedback(NamedTuple):
+    text: str          # 피드백 텍스트
+    created_at: float  # 생성 시각 (time.time(), 워커 간 비교 가능)
+
+
+# 그림 피드백 전달 경로의 추상 인터페이스 클래스 정의
+# - /drawing/send 처리 워커가 publish, 음성 WebSocket 워커가 wait로 수신
+# - canvas_id별 FIFO, 최대 개수를 넘으면 가장 오래된 피드백부터 버림
+# - 이벤트 루프에서는 apublish / aget_nowait 사용 (영속 저장소의 I/O는 스레드에서 실행)
+class FeedbackBus(ABC):
+
+    # 피드백 발행
+    @abstractmethod
+    def publish(self, canvas_id: str, feedback: Feedback) -> None:
+        """canvas_id의 피드백 큐에 추가"""
+        pass
+
+
+    # 피드백 즉시 조회 (대기하지 않음)
+    @abstractmethod
+    def get_nowait(self, canvas_id: str) -> Optional[Feedback]:
+        """가장 오래된 피드백을 꺼냄, 없으면 None"""
+        pass
+
+
+    # 🛠️ 이벤트 루프용 비동기 메서드
+    async def apublish(self, canvas_id: str, feedback: Feedback) -> None:
+        await asyncio.to_thread(self.publish, canvas_id, feedback)
+
+
+    async def aget_nowait(self, canvas_id: str) -> Optional[Feedback]:
+        return await asyncio.to_thread(self.get_nowait, canvas_id)
+
+
+    # 피드백이 생길 때까지 대기
+    @abstractmethod
+    async def wait(self, canvas_id: str) -> Feedback:
+        """가장 오래된 피드백을 꺼냄, 없으면 생길 때까지 대기"""
+        pass
+
+
+    # 로컬 자원 정리 (음성 WebSocket 종료 시)
+    def release(self, canvas_id: str) -> None:
+        pass
@@ -0,0 +1,94 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from app.services.feedback_bus.feedback_bus import Feedback, FeedbackBus
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# 프로세스 내부 큐 기반 피드백 전달 (단일 워커)
+# - 음성 소켓 없이 발행만 되는 캔버스(/drawing HTTP 경로)도 있으므로 세션 저장소처럼 LRU + TTL로 정리
+#   (음성 소켓이 기다리는 큐는 제거하지 않음)
+class MemoryFeedbackBus(FeedbackBus):
+
+    def __init__(self, max_size: int = 10, max_canvases: int = 1000, ttl_seconds: float = 21600):
+        self.max_size = max_size
+        self.max_canvases = max_canvases
+        self.ttl_seconds = ttl_seconds
+        # canvas_id -> (피드백 큐, 마지막 사용 시각)
+        self.queues: "OrderedDict[str, Tuple[asyncio.Queue, float]]" = OrderedDict()
+        # canvas_id별 대기 중인 음성 소켓 수
+        self._waiting: Dict[str, int] = {}
+        self.evictions = 0
+
+
+    # canvas_id별 피드백 큐 조회 (없으면 생성)
+    def _queue(self, canvas_id: str) -> asyncio.Queue:
+        entry = self.queues.get(canvas_id)
+        queue = entry[0] if entry else asyncio.Queue(maxsize=self.max_size)
+        self.queues[canvas_id] = (queue, time.monotonic())
+        self.queues.move_to_end(canvas_id)
+        if entry is None:
+            self._evict(canvas_id)
+        return queue
+
+
+    def publish(self, canvas_id: str, feedback: Feedback) -> None:
+        queue = self._queue(canvas_id)
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(feedback)
+
+
+    def get_nowait(self, canvas_id: str) -> Optional[Feedback]:
+        entry = self.queues.get(canvas_id)
+        if entry is None or entry[0].empty():
+            return None
+        return entry[0].get_nowait()
+
+
+    # 메모리 큐는 I/O가 없으므로 루프에서 바로 실행
+    async def apublish(self, canvas_id: str, feedback: Feedback) -> None:
+        self.publish(canvas_id, feedback)
+
+
+    async def aget_nowait(self, canvas_id: str) -> Optional[Feedback]:
+        return self.get_nowait(canvas_id)
+
+
+    async def wait(self, canvas_id: str) -> Feedback:
+        self._waiting[canvas_id] = self._waiting.get(canvas_id, 0) + 1
+        try:
+            return await self._queue(canvas_id).get()
+        finally:
+            self._waiting[canvas_id] -= 1
+            if not self._waiting[canvas_id]:
+                del self._waiting[canvas_id]
+
+
+    def release(self, canvas_id: str) -> None:
+        # 전달할 피드백이 없으면 큐 정리
+        entry = self.queues.get(canvas_id)
+        if entry is not None and entry[0].empty() and canvas_id not in self._waiting:
+            del self.queues[canvas_id]
+
+
+    def __len__(self) -> int:
+        return len(self.queues)
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    def _evict(self, keep: str):
+        """TTL이 지났거나 최대 캔버스 수를 넘은 큐를 오래된 것부터 제거 (방금 만든 큐 / 대기 중인 큐는 유지)"""
+        now = time.monotonic()
+        for canvas_id, (_, last_used) in list(self.queues.items()):
+            expired = now - last_used > self.ttl_seconds
+            if not expired and len(self.queues) <= self.max_canvases:
+                break
+            if canvas_id == keep or canvas_id in self._waiting:
+                continue
+            del self.queues[canvas_id]
+            self.evictions += 1
+            logger.debug(f"Feedback queue evicted: {canvas_id}")
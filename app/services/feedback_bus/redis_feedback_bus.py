@@ -0,0 +1,58 @@
+from typing import Optional
+from app.services.feedback_bus.feedback_bus import Feedback, FeedbackBus
+import json
+
+
+# Redis 리스트 기반 피드백 전달 (여러 노드가 같은 Redis를 공유)
+# - 대기 측은 BLPOP으로 폴링 없이 수신
+# - 이벤트 루프에서는 redis.asyncio 클라이언트 사용 (동기 클라이언트는 루프 밖에서 호출할 때만)
+class RedisFeedbackBus(FeedbackBus):
+
+    def __init__(self, url: str = "redis://localhost:6379/0", max_size: int = 10, ttl_seconds: int = 3600,
+                 client=None, async_client=None):
+        # redis 패키지는 이 백엔드를 사용할 때만 필요
+        import redis
+        import redis.asyncio
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._client = client or redis.Redis.from_url(url)
+        self._async_client = async_client or redis.asyncio.Redis.from_url(url)
+
+
+    def _key(self, canvas_id: str) -> str:
+        return f"feedback:{canvas_id}"
+
+
+    def _queue_feedback(self, pipeline, canvas_id: str, feedback: Feedback):
+        key = self._key(canvas_id)
+        pipeline.rpush(key, json.dumps(feedback._asdict(), ensure_ascii=False))
+        pipeline.ltrim(key, -self.max_size, -1)
+        pipeline.expire(key, self.ttl_seconds)
+
+
+    def publish(self, canvas_id: str, feedback: Feedback) -> None:
+        pipeline = self._client.pipeline()
+        self._queue_feedback(pipeline, canvas_id, feedback)
+        pipeline.execute()
+
+
+    def get_nowait(self, canvas_id: str) -> Optional[Feedback]:
+        value = self._client.lpop(self._key(canvas_id))
+        return Feedback(**json.loads(value)) if value else None
+
+
+    async def apublish(self, canvas_id: str, feedback: Feedback) -> None:
+        pipeline = self._async_client.pipeline()
+        self._queue_feedback(pipeline, canvas_id, feedback)
+        await pipeline.execute()
+
+
+    async def aget_nowait(self, canvas_id: str) -> Optional[Feedback]:
+        value = await self._async_client.lpop(self._key(canvas_id))
+        return Feedback(**json.loads(value)) if value else None
+
+
+    async def wait(self, canvas_id: str) -> Feedback:
+        _, value = await self._async_client.blpop([self._key(canvas_id)])
+        return Feedback(**json.loads(value))
@@ -0,0 +1,106 @@
+from typing import Dict, List, Optional
+from app.services.feedback_bus.feedback_bus import Feedback, FeedbackBus
+import asyncio
+import sqlite3
+import threading
+
+
+# SQLite 파일 기반 피드백 전달 (한 노드의 여러 워커 프로세스가 같은 파일을 공유)
+# - 대기 중인 canvas_id 전체를 폴러 하나가 poll_interval 간격으로 한 번에 확인 (조회는 스레드에서 실행)
+# - 같은 워커에서 발행한 피드백은 폴링을 기다리지 않고 바로 깨움
+class SqliteFeedbackBus(FeedbackBus):
+
+    def __init__(self, path: str = "sessions.db", max_size: int = 10, poll_interval: float = 0.05):
+        self.max_size = max_size
+        self.poll_interval = poll_interval
+        # canvas_id -> 피드백 도착 알림 (이 워커에서 대기 중인 음성 소켓)
+        self._waiters: Dict[str, asyncio.Event] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS feedback ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " canvas_id TEXT NOT NULL,"
+            " text TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_canvas_id ON feedback (canvas_id, id)")
+
+
+    def publish(self, canvas_id: str, feedback: Feedback) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO feedback (canvas_id, text, created_at) VALUES (?, ?, ?)",
+                (canvas_id, feedback.text, feedback.created_at)
+            )
+            # 최대 개수를 넘는 오래된 피드백 제거
+            self._conn.execute(
+                "DELETE FROM feedback WHERE canvas_id = ? AND id NOT IN "
+                "(SELECT id FROM feedback WHERE canvas_id = ? ORDER BY id DESC LIMIT ?)",
+                (canvas_id, canvas_id, self.max_size)
+            )
+
+
+    def get_nowait(self, canvas_id: str) -> Optional[Feedback]:
+        with self._lock:
+            row = self._conn.execute(
+                "DELETE FROM feedback WHERE id = "
+                "(SELECT id FROM feedback WHERE canvas_id = ? ORDER BY id LIMIT 1) "
+                "RETURNING text, created_at",
+                (canvas_id,)
+            ).fetchone()
+        return Feedback(text=row[0], created_at=row[1]) if row else None
+
+
+    async def apublish(self, canvas_id: str, feedback: Feedback) -> None:
+        await asyncio.to_thread(self.publish, canvas_id, feedback)
+        event = self._waiters.get(canvas_id)
+        if event is not None:
+            event.set()
+
+
+    async def wait(self, canvas_id: str) -> Feedback:
+        event = self._waiters[canvas_id] = asyncio.Event()
+        try:
+            while True:
+                event.clear()
+                feedback = await self.aget_nowait(canvas_id)
+                if feedback is not None:
+                    return feedback
+                if self._poller is None or self._poller.done():
+                    self._poller = asyncio.ensure_future(self._poll())
+                await event.wait()
+        finally:
+            if self._waiters.get(canvas_id) is event:
+                del self._waiters[canvas_id]
+
+
+    # 대기 중인 canvas_id 중 피드백이 있는 것만 깨움 (대기하는 소켓이 없으면 종료)
+    async def _poll(self):
+        while self._waiters:
+            await asyncio.sleep(self.poll_interval)
+            canvas_ids = list(self._waiters)
+            if not canvas_ids:
+                break
+            for canvas_id in await asyncio.to_thread(self._pending, canvas_ids):
+                event = self._waiters.get(canvas_id)
+                if event is not None:
+                    event.set()
+
+
+    def _pending(self, canvas_ids: List[str]) -> List[str]:
+        placeholders = ", ".join("?" for _ in canvas_ids)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT canvas_id FROM feedback WHERE canvas_id IN ({placeholders})", canvas_ids
+            ).fetchall()
+        return [row[0] for row in rows]
+
+
+    def close(self):
+        if self._poller is not None:
+            self._poller.cancel()
+        with self._lock:
+            self._conn.close()
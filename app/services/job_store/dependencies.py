@@ -0,0 +1,19 @@
+from app.config import JOB_STORE, JOB_DB_PATH, JOB_STORE_MAX_SIZE, JOB_TTL_SECONDS
+from app.services.job_store.job_store import JobStore
+from app.services.job_store.memory_job_store import MemoryJobStore
+from app.services.job_store.sqlite_job_store import SqliteJobStore
+
+_job_store: JobStore = None
+
+def create_job_store() -> JobStore:
+    if JOB_STORE == "memory":
+        return MemoryJobStore(max_size=JOB_STORE_MAX_SIZE)
+    if JOB_STORE == "sqlite":
+        return SqliteJobStore(JOB_DB_PATH, ttl_seconds=JOB_TTL_SECONDS)
+    raise ValueError(f"지원하지 않는 JOB_STORE 입니다: {JOB_STORE}")
+
+def get_job_store() -> JobStore:
+    global _job_store
+    if _job_store is None:
+        _job_store = create_job_store()
+    return _job_store
@@ -0,0 +1,94 @@
+# 추상 클래스와 추상 메서드를 위한 ABC 모듈 임포트
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from app.models.job import Job
+import asyncio
+
+
+# 비동기 작업 저장소의 추상 인터페이스 클래스 정의
+# - Key: 작업 ID, Value: Job
+# - 작업 상태를 바꾼 뒤에는 save()로 저장해야 반영됨
+class JobStore(ABC):
+
+    # 작업 조회 (없으면 None)
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """작업 ID로 작업을 조회"""
+        pass
+
+
+    # 작업 저장 (Job.job_id를 키로 사용)
+    @abstractmethod
+    def save(self, job: Job) -> None:
+        """작업을 저장하거나 갱신"""
+        pass
+
+
+    # 묶음 요청의 작업 목록 (생성 순서)
+    @abstractmethod
+    def list_batch(self, batch_id: str) -> List[Job]:
+        """batch_id로 묶인 작업 목록을 조회 (add_to_batch로 함께 묶인 작업 포함)"""
+        pass
+
+
+    # 다른 묶음 요청에서 만든 작업을 batch_id에도 포함 (같은 캔버스 요청이 중복으로 들어온 경우)
+    @abstractmethod
+    def add_to_batch(self, batch_id: str, job_id: str) -> None:
+        """작업의 batch_id는 그대로 두고 묶음 소속만 추가"""
+        pass
+
+
+    # 캔버스의 진행 중인 작업 (같은 요청이 두 번 들어오면 기존 작업을 돌려줌)
+    @abstractmethod
+    def find_active(self, kind: str, canvas_id: str, image_url: Optional[str] = None) -> Optional[Job]:
+        """끝나지 않은(queued / running) 작업을 조회 (image_url을 주면 같은 그림의 작업만)"""
+        pass
+
+
+    # 작업 실행 권한 획득 (queued → running, 여러 워커가 같은 저장소를 공유해도 한 곳에서만 실행)
+    @abstractmethod
+    def claim(self, job_id: str) -> bool:
+        """대기 중인 작업이면 running으로 바꾸고 True, 이미 다른 곳에서 가져갔으면 False"""
+        pass
+
+
+    # 대기 중인 작업 목록 (서버 재시작 시 다시 큐에 넣기)
+    @abstractmethod
+    def list_queued(self, kind: str) -> List[Job]:
+        """kind의 queued 작업 목록 (생성 순서)"""
+        pass
+
+
+    # 🛠️ 이벤트 루프용 비동기 메서드 (파일 / 네트워크 저장소는 스레드에서 실행)
+    async def aget(self, job_id: str) -> Optional[Job]:
+        return await asyncio.to_thread(self.get, job_id)
+
+
+    async def asave(self, job: Job) -> None:
+        await asyncio.to_thread(self.save, job)
+
+
+    async def alist_batch(self, batch_id: str) -> List[Job]:
+        return await asyncio.to_thread(self.list_batch, batch_id)
+
+
+    async def aadd_to_batch(self, batch_id: str, job_id: str) -> None:
+        await asyncio.to_thread(self.add_to_batch, batch_id, job_id)
+
+
+    async def afind_active(self, kind: str, canvas_id: str, image_url: Optional[str] = None) -> Optional[Job]:
+        return await asyncio.to_thread(self.find_active, kind, canvas_id, image_url)
+
+
+    async def aclaim(self, job_id: str) -> bool:
+        return await asyncio.to_thread(self.claim, job_id)
+
+
+    async def alist_queued(self, kind: str) -> List[Job]:
+        return await asyncio.to_thread(self.list_queued, kind)
+
+
+    # 저장된 작업 수
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
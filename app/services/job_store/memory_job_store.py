@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from app.models.job import Job
+from app.services.job_store.job_store import JobStore
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# 메모리 기반 작업 저장소
+# - 최대 작업 수를 넘으면 끝난 작업 중 가장 오래된 것부터 제거
+# - 서버 재시작 시 초기화됨 (같은 워커에서만 조회 가능)
+class MemoryJobStore(JobStore):
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        # 중복 요청으로 다른 묶음에도 포함된 작업 (batch_id → job_id 목록)
+        self._members: Dict[str, List[str]] = {}
+
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+
+    def save(self, job: Job) -> None:
+        self._jobs[job.job_id] = job
+        if len(self._jobs) > self.max_size:
+            finished = [job_id for job_id, stored in self._jobs.items() if stored.finished]
+            for job_id in finished[: len(self._jobs) - self.max_size]:
+                del self._jobs[job_id]
+                logger.debug(f"Job evicted: {job_id}")
+            for batch_id, job_ids in list(self._members.items()):
+                job_ids[:] = [job_id for job_id in job_ids if job_id in self._jobs]
+                if not job_ids:
+                    del self._members[batch_id]
+
+
+    def list_batch(self, batch_id: str) -> List[Job]:
+        members = set(self._members.get(batch_id, ()))
+        return [job for job in self._jobs.values() if job.batch_id == batch_id or job.job_id in members]
+
+
+    def add_to_batch(self, batch_id: str, job_id: str) -> None:
+        job_ids = self._members.setdefault(batch_id, [])
+        if job_id not in job_ids:
+            job_ids.append(job_id)
+
+
+    def find_active(self, kind: str, canvas_id: str, image_url: Optional[str] = None) -> Optional[Job]:
+        for job in reversed(self._jobs.values()):
+            if job.kind == kind and job.canvas_id == canvas_id and not job.finished \
+                    and (image_url is None or job.params.get("image_url") == image_url):
+                return job
+        return None
+
+
+    def claim(self, job_id: str) -> bool:
+        job = self._jobs.get(job_id)
+        if job is None or job.status != "queued":
+            return False
+        job.status = "running"
+        return True
+
+
+    def list_queued(self, kind: str) -> List[Job]:
+        return [job for job in self._jobs.values() if job.kind == kind and job.status == "queued"]
+
+
+    # 메모리 저장소는 I/O가 없으므로 루프에서 바로 실행 (await 없이 적용되어 원자적)
+    async def aget(self, job_id: str) -> Optional[Job]:
+        return self.get(job_id)
+
+
+    async def asave(self, job: Job) -> None:
+        self.save(job)
+
+
+    async def alist_batch(self, batch_id: str) -> List[Job]:
+        return self.list_batch(batch_id)
+
+
+    async def aadd_to_batch(self, batch_id: str, job_id: str) -> None:
+        self.add_to_batch(batch_id, job_id)
+
+
+    async def afind_active(self, kind: str, canvas_id: str, image_url: Optional[str] = None) -> Optional[Job]:
+        return self.find_active(kind, canvas_id, image_url)
+
+
+    async def aclaim(self, job_id: str) -> bool:
+        return self.claim(job_id)
+
+
+    async def alist_queued(self, kind: str) -> List[Job]:
+        return self.list_queued(kind)
+
+
+    def __len__(self) -> int:
+        return len(self._jobs)
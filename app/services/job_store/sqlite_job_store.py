@@ -0,0 +1,138 @@
+from typing import List, Optional
+from app.models.job import JOB_TERMINAL_STATUSES, Job
+from app.services.job_store.job_store import JobStore
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# SQLite 기반 작업 저장소
+# - 서버 재시작 후에도 작업 상태 / 결과 유지 (대기 중이던 작업은 JobQueue.recover로 다시 실행)
+# - 한 노드의 여러 워커가 같은 파일을 공유하면 어느 워커에서든 작업 조회 가능
+# - 끝난 지 TTL이 지난 작업은 시작 시 제거
+class SqliteJobStore(JobStore):
+
+    def __init__(self, path: str = "sessions.db", ttl_seconds: float = 86400):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " canvas_id TEXT NOT NULL,"
+            " batch_id TEXT,"
+            " status TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        # 중복 요청으로 다른 묶음에도 포함된 작업
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_batches ("
+            " batch_id TEXT NOT NULL,"
+            " job_id TEXT NOT NULL,"
+            " PRIMARY KEY (batch_id, job_id))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_batch_id ON jobs (batch_id, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_canvas ON jobs (kind, canvas_id, status)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, updated_at)")
+        purged = self.purge_finished()
+        if purged:
+            logger.info(f"Purged {purged} finished jobs older than {self.ttl_seconds:.0f}s")
+
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute("SELECT data, status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._load(row) if row else None
+
+
+    def save(self, job: Job) -> None:
+        data = job.model_dump_json()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, kind, canvas_id, batch_id, status, data, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.job_id, job.kind, job.canvas_id, job.batch_id, job.status, data, job.created_at, time.time())
+            )
+
+
+    def list_batch(self, batch_id: str) -> List[Job]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data, status FROM jobs WHERE batch_id = ? "
+                "OR job_id IN (SELECT job_id FROM job_batches WHERE batch_id = ?) ORDER BY created_at",
+                (batch_id, batch_id)
+            ).fetchall()
+        return [self._load(row) for row in rows]
+
+
+    def add_to_batch(self, batch_id: str, job_id: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO job_batches (batch_id, job_id) VALUES (?, ?)", (batch_id, job_id))
+
+
+    def find_active(self, kind: str, canvas_id: str, image_url: Optional[str] = None) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, status FROM jobs WHERE kind = ? AND canvas_id = ? AND status IN ('queued', 'running') "
+                "AND (? IS NULL OR json_extract(data, '$.params.image_url') = ?) "
+                "ORDER BY created_at DESC LIMIT 1", (kind, canvas_id, image_url, image_url)
+            ).fetchone()
+        return self._load(row) if row else None
+
+
+    def claim(self, job_id: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'running', updated_at = ? WHERE job_id = ? AND status = 'queued'",
+                (time.time(), job_id)
+            )
+        return cursor.rowcount == 1
+
+
+    def list_queued(self, kind: str) -> List[Job]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data, status FROM jobs WHERE kind = ? AND status = 'queued' ORDER BY created_at", (kind,)
+            ).fetchall()
+        return [self._load(row) for row in rows]
+
+
+    # 끝난 지 TTL이 지난 작업 일괄 삭제
+    def purge_finished(self) -> int:
+        placeholders = ", ".join("?" for _ in JOB_TERMINAL_STATUSES)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({placeholders}) AND updated_at < ?",
+                (*JOB_TERMINAL_STATUSES, time.time() - self.ttl_seconds)
+            )
+            self._conn.execute("DELETE FROM job_batches WHERE job_id NOT IN (SELECT job_id FROM jobs)")
+        return cursor.rowcount
+
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    @staticmethod
+    def _load(row) -> Job:
+        """저장된 JSON으로 Job 복원 (claim으로 바뀐 상태는 status 컬럼 기준)"""
+        data, status = row
+        job = Job.model_validate_json(data)
+        job.status = status
+        return job
@@ -0,0 +1,22 @@
+from app.config import SESSION_STORE, SESSION_DB_PATH, SESSION_MAX_SIZE, SESSION_TTL_SECONDS, REDIS_URL
+from app.services.session_store.session_store import SessionStore
+from app.services.session_store.memory_session_store import MemorySessionStore
+from app.services.session_store.sqlite_session_store import SqliteSessionStore
+
+_session_store: SessionStore = None
+
+def create_session_store() -> SessionStore:
+    if SESSION_STORE == "sqlite":
+        return SqliteSessionStore(SESSION_DB_PATH, ttl_seconds=SESSION_TTL_SECONDS)
+    if SESSION_STORE == "redis":
+        from app.services.session_store.redis_session_store import RedisSessionStore
+        return RedisSessionStore(REDIS_URL, ttl_seconds=SESSION_TTL_SECONDS)
+    if SESSION_STORE == "memory":
+        return MemorySessionStore(max_size=SESSION_MAX_SIZE, ttl_seconds=SESSION_TTL_SECONDS)
+    raise ValueError(f"지원하지 않는 SESSION_STORE 입니다: {SESSION_STORE}")
+
+def get_session_store() -> SessionStore:
+    global _session_store
+    if _session_store is None:
+        _session_store = create_session_store()
+    return _session_store
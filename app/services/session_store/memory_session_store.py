@@ -0,0 +1,68 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.models.drawing import DrawingData
+from app.services.session_store.session_store import SessionStore
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# 메모리 기반 세션 저장소 (LRU + TTL)
+# - 최대 세션 수를 넘으면 가장 오래 사용하지 않은 세션부터 제거
+# - 마지막 사용 후 TTL이 지난 세션은 조회 시 제거
+# - 서버 재시작 시 초기화됨
+class MemorySessionStore(SessionStore):
+
+    def __init__(self, max_size: int = 1000, ttl_seconds: float = 21600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # canvas_id -> (DrawingData, 마지막 사용 시각)
+        self._sessions: "OrderedDict[str, Tuple[DrawingData, float]]" = OrderedDict()
+        self.evictions = 0
+
+
+    def get(self, canvas_id: str) -> Optional[DrawingData]:
+        entry = self._sessions.get(canvas_id)
+        if entry is None:
+            return None
+        drawing_data, last_used = entry
+        now = time.monotonic()
+        if now - last_used > self.ttl_seconds:
+            del self._sessions[canvas_id]
+            self.evictions += 1
+            logger.info(f"Session expired: {canvas_id}")
+            return None
+        self._sessions[canvas_id] = (drawing_data, now)
+        self._sessions.move_to_end(canvas_id)
+        return drawing_data
+
+
+    def save(self, drawing_data: DrawingData) -> None:
+        self._sessions[drawing_data.canvas_id] = (drawing_data, time.monotonic())
+        self._sessions.move_to_end(drawing_data.canvas_id)
+        while len(self._sessions) > self.max_size:
+            canvas_id, _ = self._sessions.popitem(last=False)
+            self.evictions += 1
+            logger.info(f"Session evicted (LRU): {canvas_id}")
+
+
+    # 메모리 저장소는 I/O가 없으므로 루프에서 바로 실행 (await 없이 적용되어 원자적)
+    async def aget(self, canvas_id: str) -> Optional[DrawingData]:
+        return self.get(canvas_id)
+
+
+    async def asave(self, drawing_data: DrawingData) -> None:
+        self.save(drawing_data)
+
+
+    async def update(self, canvas_id: str, fn) -> Optional[DrawingData]:
+        return self.modify(canvas_id, fn)
+
+
+    def delete(self, canvas_id: str) -> None:
+        self._sessions.pop(canvas_id, None)
+
+
+    def __len__(self) -> int:
+        return len(self._sessions)
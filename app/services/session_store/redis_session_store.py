@@ -0,0 +1,91 @@
+from typing import Callable, Optional
+from app.models.drawing import DrawingData
+from app.services.session_store.session_store import SessionStore
+import time
+
+
+# Redis 기반 세션 저장소 (여러 노드가 같은 Redis를 공유)
+# - 세션 JSON만 저장 (음성 데이터는 AudioBlobStore, 세션에는 audio_id만 포함)
+# - 저장할 때마다 TTL 갱신
+# - 세션 수는 만료 시각을 점수로 둔 색인(sorted set)으로 계산 (SCAN 없이 ZCARD)
+# - modify()는 WATCH / MULTI로 읽은 뒤 다른 노드가 바꾸지 않았을 때만 저장 (충돌하면 다시 시도)
+class RedisSessionStore(SessionStore):
+
+    # modify() 충돌 시 최대 재시도 횟수
+    MAX_MODIFY_ATTEMPTS = 10
+    # 세션 색인 키
+    INDEX_KEY = "sessions:index"
+    # 여러 노드가 공유하는 세션 수이므로 워커별 /metrics 수집마다 조회하지 않음
+    count_on_scrape = False
+
+    def __init__(self, url: str = "redis://localhost:6379/0", ttl_seconds: float = 21600, client=None):
+        # redis 패키지는 이 백엔드를 사용할 때만 필요
+        import redis
+
+        self._watch_error = redis.WatchError
+        self.ttl_seconds = int(ttl_seconds)
+        self._client = client or redis.Redis.from_url(url)
+
+
+    def _key(self, canvas_id: str) -> str:
+        return f"session:{canvas_id}"
+
+
+    def get(self, canvas_id: str) -> Optional[DrawingData]:
+        data = self._client.hget(self._key(canvas_id), "data")
+        if data is None:
+            return None
+        return DrawingData.model_validate_json(data)
+
+
+    def save(self, drawing_data: DrawingData) -> None:
+        key = self._key(drawing_data.canvas_id)
+        pipeline = self._client.pipeline()
+        pipeline.delete(key)
+        pipeline.hset(key, mapping={"data": drawing_data.model_dump_json()})
+        pipeline.expire(key, self.ttl_seconds)
+        self._index(pipeline, drawing_data.canvas_id)
+        pipeline.execute()
+
+
+    def modify(self, canvas_id: str, fn: Callable[[DrawingData], Optional[bool]]) -> Optional[DrawingData]:
+        key = self._key(canvas_id)
+        with self._client.pipeline() as pipeline:
+            for _ in range(self.MAX_MODIFY_ATTEMPTS):
+                try:
+                    pipeline.watch(key)
+                    data = pipeline.hget(key, "data")
+                    if data is None:
+                        return None
+                    drawing_data = DrawingData.model_validate_json(data)
+                    if fn(drawing_data) is False:
+                        return drawing_data
+                    pipeline.multi()
+                    pipeline.hset(key, mapping={"data": drawing_data.model_dump_json()})
+                    pipeline.expire(key, self.ttl_seconds)
+                    self._index(pipeline, canvas_id)
+                    pipeline.execute()
+                    return drawing_data
+                except self._watch_error:
+                    continue
+        raise RuntimeError(f"Session update conflict: {canvas_id}")
+
+
+    def delete(self, canvas_id: str) -> None:
+        pipeline = self._client.pipeline()
+        pipeline.delete(self._key(canvas_id))
+        pipeline.zrem(self.INDEX_KEY, canvas_id)
+        pipeline.execute()
+
+
+    def __len__(self) -> int:
+        pipeline = self._client.pipeline()
+        pipeline.zremrangebyscore(self.INDEX_KEY, "-inf", time.time())
+        pipeline.zcard(self.INDEX_KEY)
+        return pipeline.execute()[-1]
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    def _index(self, pipeline, canvas_id: str):
+        """세션 색인에 만료 시각 기록"""
+        pipeline.zadd(self.INDEX_KEY, {canvas_id: time.time() + self.ttl_seconds})
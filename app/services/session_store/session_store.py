@@ -0,0 +1,88 @@
+# 추상 클래스와 추상 메서드를 위한 ABC 모듈 임포트
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+from app.models.drawing import DrawingData
+import asyncio
+
+
+# 그림 세션 저장소의 추상 인터페이스 클래스 정의
+# - Key: 캔버스 ID, Value: DrawingData
+# - 기존 딕셔너리 사용 코드(get / [] / in)와 호환되도록 매핑 연산 제공
+# - 조회한 DrawingData를 변경한 뒤에는 save()로 저장해야 영속 저장소에 반영됨
+# - 조회 후 await를 거쳐 저장하는 흐름은 서로 덮어쓰므로 update()로 최신 세션에 변경만 적용
+# - 이벤트 루프에서는 aget / asave / update 사용 (영속 저장소의 I/O는 스레드에서 실행)
+class SessionStore(ABC):
+
+    # /metrics 수집 시 len()으로 세션 수를 보고할지 여부
+    count_on_scrape = True
+
+
+    # 세션 조회 (없거나 만료되었으면 None)
+    @abstractmethod
+    def get(self, canvas_id: str) -> Optional[DrawingData]:
+        """캔버스 ID로 세션을 조회"""
+        pass
+
+
+    # 세션 저장 (DrawingData.canvas_id를 키로 사용)
+    @abstractmethod
+    def save(self, drawing_data: DrawingData) -> None:
+        """세션을 저장하거나 갱신"""
+        pass
+
+
+    # 세션 삭제
+    @abstractmethod
+    def delete(self, canvas_id: str) -> None:
+        """세션을 삭제"""
+        pass
+
+
+    # 세션 읽기-수정-쓰기 (fn이 False를 반환하면 저장하지 않음)
+    def modify(self, canvas_id: str, fn: Callable[[DrawingData], Optional[bool]]) -> Optional[DrawingData]:
+        """최신 세션에 fn을 적용해 저장하고 갱신된 세션을 반환 (세션이 없으면 None)
+
+        기본 구현은 조회 후 저장하며, 여러 프로세스가 공유하는 저장소는 버전 비교로 원자적으로 적용합니다.
+        """
+        drawing_data = self.get(canvas_id)
+        if drawing_data is None:
+            return None
+        if fn(drawing_data) is not False:
+            self.save(drawing_data)
+        return drawing_data
+
+
+    # 🛠️ 이벤트 루프용 비동기 메서드
+    async def aget(self, canvas_id: str) -> Optional[DrawingData]:
+        return await asyncio.to_thread(self.get, canvas_id)
+
+
+    async def asave(self, drawing_data: DrawingData) -> None:
+        await asyncio.to_thread(self.save, drawing_data)
+
+
+    async def update(self, canvas_id: str, fn: Callable[[DrawingData], Optional[bool]]) -> Optional[DrawingData]:
+        return await asyncio.to_thread(self.modify, canvas_id, fn)
+
+
+    # 저장된 세션 수
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+    def __contains__(self, canvas_id: str) -> bool:
+        return self.get(canvas_id) is not None
+
+
+    def __getitem__(self, canvas_id: str) -> DrawingData:
+        drawing_data = self.get(canvas_id)
+        if drawing_data is None:
+            raise KeyError(canvas_id)
+        return drawing_data
+
+
+    def __setitem__(self, canvas_id: str, drawing_data: DrawingData):
+        if canvas_id != drawing_data.canvas_id:
+            raise ValueError(f"canvas_id mismatch: {canvas_id} != {drawing_data.canvas_id}")
+        self.save(drawing_data)
@@ -0,0 +1,116 @@
+from typing import Callable, Optional
+from app.models.drawing import DrawingData
+from app.services.session_store.session_store import SessionStore
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# SQLite 기반 세션 저장소
+# - 서버 재시작 후에도 세션 유지
+# - 음성 데이터는 세션에 포함되지 않음 (AudioBlobStore의 audio_id만 저장)
+# - 마지막 저장 후 TTL이 지난 세션은 조회 시 제거
+# - 저장할 때마다 version 증가, modify()는 읽은 version이 그대로일 때만 저장 (다른 워커와 충돌하면 다시 시도)
+class SqliteSessionStore(SessionStore):
+
+    # modify() 충돌 시 최대 재시도 횟수
+    MAX_MODIFY_ATTEMPTS = 10
+
+    def __init__(self, path: str = "sessions.db", ttl_seconds: float = 21600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " canvas_id TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " version INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sessions)")}
+        if "version" not in columns:
+            self._conn.execute("ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions (updated_at)")
+
+
+    def get(self, canvas_id: str) -> Optional[DrawingData]:
+        loaded = self._load(canvas_id)
+        return loaded[0] if loaded else None
+
+
+    def save(self, drawing_data: DrawingData) -> None:
+        data = drawing_data.model_dump_json()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sessions (canvas_id, data, updated_at, version) VALUES (?, ?, ?, 0) "
+                "ON CONFLICT (canvas_id) DO UPDATE SET "
+                "data = excluded.data, updated_at = excluded.updated_at, version = sessions.version + 1",
+                (drawing_data.canvas_id, data, time.time())
+            )
+
+
+    def modify(self, canvas_id: str, fn: Callable[[DrawingData], Optional[bool]]) -> Optional[DrawingData]:
+        for _ in range(self.MAX_MODIFY_ATTEMPTS):
+            loaded = self._load(canvas_id)
+            if loaded is None:
+                return None
+            drawing_data, version = loaded
+            if fn(drawing_data) is False:
+                return drawing_data
+            with self._lock:
+                cursor = self._conn.execute(
+                    "UPDATE sessions SET data = ?, updated_at = ?, version = version + 1 "
+                    "WHERE canvas_id = ? AND version = ?",
+                    (drawing_data.model_dump_json(), time.time(), canvas_id, version)
+                )
+            if cursor.rowcount == 1:
+                return drawing_data
+            logger.debug(f"Session modified concurrently, retrying: {canvas_id}")
+        raise RuntimeError(f"Session update conflict: {canvas_id}")
+
+
+    def delete(self, canvas_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE canvas_id = ?", (canvas_id,))
+
+
+    # 만료된 세션 일괄 삭제
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.ttl_seconds,)
+            )
+        return cursor.rowcount
+
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    def _load(self, canvas_id: str):
+        """(DrawingData, version) 조회 (없거나 만료되었으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, updated_at, version FROM sessions WHERE canvas_id = ?", (canvas_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        data, updated_at, version = row
+        if time.time() - updated_at > self.ttl_seconds:
+            self.delete(canvas_id)
+            logger.info(f"Session expired: {canvas_id}")
+            return None
+        return DrawingData.model_validate_json(data), version
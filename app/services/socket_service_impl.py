@@ -1,21 +1,40 @@
 # WebSocket 연결과 비동기 처리를 위한 FastAPI 컴포넌트 임포트
 from fastapi import WebSocket, WebSocketDisconnect
 # 타입 힌팅을 위한 Dict, List 임포트
-from typing import Dict, List
+from typing import Awaitable, Deque, Dict, List, Optional
 # JSON 데이터 처리를 위한 모듈 임포트
 import json
 # base64 인코딩/디코딩을 위한 모듈 임포트
 import base64
 # 드로잉 서비스 의존성 가져오기
 from app.services.drawing_service.dependencies import get_drawing_service
+from app.services.drawing_service.drawing_service import DrawingService
+# 그림 피드백 전달 경로 (여러 워커/노드 간 공유 가능)
+from app.services.feedback_bus.feedback_bus import Feedback, FeedbackBus
+from app.services.feedback_bus.dependencies import get_feedback_bus
 # 드로잉 관련 데이터 모델 임포트
 from app.models.drawing import DrawingAnalysis, DrawingSocketRequest
-# OpenAI API 클라이언트 임포트
-from openai import OpenAI
-# OpenAI API 키 설정 임포트
-from app.config import OPENAI_API_KEY
-import tempfile
-import os
+# 공유 비동기 OpenAI 클라이언트 임포트
+from app.utils.clients import get_openai_client
+from app.utils.openai_scheduler import Priority, set_openai_priority
+from app.utils.call_policy import call_policy
+# 단계별 소요 시간 지표
+from app.utils.metrics import observe_stage, VOICE_TURNS_CANCELLED
+# 요청 추적 span
+from app.utils.tracing import span
+# 실시간 그림 프레임 스케줄러 임포트
+from app.utils.canvas_scheduler import CanvasFrameScheduler, frame_url
+from app.utils.image_cache import vision_message
+# 실시간 그림 피드백 설정 임포트
+from app.config import CANVAS_DEBOUNCE_SECONDS, CANVAS_MAX_WAIT_SECONDS, CANVAS_DIFF_THRESHOLD, CANVAS_MAX_INFLIGHT, VISION_MODEL
+from collections import deque
+import asyncio
+import contextlib
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
 
 
 # WebSocket 연결을 관리하는 클래스
@@ -23,14 +42,24 @@ class ConnectionManager:
     
     # 초기화 시 canvas_id별로 WebSocket 연결을 저장하는 딕셔너리 초기화
     # 음성 처리를 위한 WebSocket 연결 저장
-    # canvas_id별 텍스트 저장
-    def __init__(self):
+    # 그림 피드백 전달 경로
+    def __init__(self, feedback_bus: Optional[FeedbackBus] = None):
         # canvas_id별로 WebSocket 연결을 저장하는 딕셔너리 초기화
         self.active_connections: Dict[str, List[WebSocket]] = {}
         # 음성 처리를 위한 WebSocket 연결 저장
         self.voice_connections: Dict[str, WebSocket] = {}
-        # canvas_id별 텍스트 저장
-        self.text_storage: Dict[str, str] = {}
+        # 실시간 그림 피드백(/drawing/send) 연결 수
+        self.drawing_connections = 0
+        # 그림 피드백 전달 경로 (생성 즉시 음성 소켓의 전송 태스크가 꺼내 감)
+        # - FEEDBACK_BUS 설정에 따라 프로세스 내부 큐 / SQLite / Redis
+        # - /drawing/send 와 음성 소켓이 서로 다른 워커에 연결되어도 전달됨
+        self.feedback_bus = feedback_bus or get_feedback_bus()
+        # 피드백 생성 → 음성 전송 완료까지 걸린 시간 (ms, 최근 1000건)
+        self.feedback_latencies_ms: Deque[float] = deque(maxlen=1000)
+        # /drawing/send 프레임 처리 누적 지표 (종료된 연결 기준)
+        self.frame_stats: Dict[str, int] = {
+            "frames_received": 0, "frames_coalesced": 0, "frames_skipped": 0, "calls_made": 0, "calls_failed": 0
+        }
 
 
     # WebSocket 연결 수립
@@ -49,22 +78,45 @@ class ConnectionManager:
         if is_voice:
             if canvas_id in self.voice_connections:
                 del self.voice_connections[canvas_id]
+            # 로컬 피드백 대기 자원 정리
+            self.feedback_bus.release(canvas_id)
         else:
             if canvas_id in self.active_connections:
                 self.active_connections[canvas_id].remove(websocket)
                 if not self.active_connections[canvas_id]:
                     del self.active_connections[canvas_id]
-                 
+    
+    
                     
-    # 텍스트 저장
-    def store_text(self, canvas_id: str, text: str):
-        self.text_storage[canvas_id] = text
-        print(f"[텍스트 저장] canvas_id: {canvas_id}, text: {text}")
+    # 텍스트 저장 (대기 중인 음성 소켓에 즉시 전달됨)
+    async def store_text(self, canvas_id: str, text: str):
+        await self.feedback_bus.apublish(canvas_id, Feedback(text=text, created_at=time.time()))
+        logger.debug(f"[텍스트 저장] canvas_id: {canvas_id}, text: {text}")
         
         
-    # 텍스트 조회
-    def get_text(self, canvas_id: str) -> str:
-        return self.text_storage.get(canvas_id)
+    # 텍스트 조회 (대기하지 않음, 없으면 None)
+    async def get_text(self, canvas_id: str) -> Optional[str]:
+        feedback = await self.feedback_bus.aget_nowait(canvas_id)
+        return feedback.text if feedback else None
+    
+    
+    # 피드백이 생길 때까지 대기
+    async def wait_feedback(self, canvas_id: str) -> Feedback:
+        return await self.feedback_bus.wait(canvas_id)
+    
+    
+    # 피드백 전달 지연 시간 기록
+    def record_feedback_latency(self, feedback: Feedback) -> float:
+        latency_ms = (time.time() - feedback.created_at) * 1000
+        self.feedback_latencies_ms.append(latency_ms)
+        observe_stage("feedback_push", latency_ms / 1000)
+        return latency_ms
+
+
+    # 그림 프레임 처리 지표 누적
+    def record_frame_stats(self, stats: Dict[str, int]):
+        for key in self.frame_stats:
+            self.frame_stats[key] += stats.get(key, 0)
 
 
     
@@ -72,156 +124,298 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
+# 음성 WebSocket 전송 채널
+# - 읽기 루프와 피드백 전송 태스크가 동시에 전송하므로 프레임 단위로 잠금
+# - json 모드: 오디오를 base64로 인코딩해 JSON에 포함 (기존 클라이언트 호환)
+# - binary 모드: JSON 헤더(audio_bytes 포함) 전송 후 원본 오디오를 바이너리 프레임으로 전송
+class VoiceChannel:
+
+    def __init__(self, websocket: WebSocket, binary: bool = False):
+        self.websocket = websocket
+        self.binary = binary
+        self._send_lock = asyncio.Lock()
+
+
+    # JSON 프레임 전송
+    async def send_json(self, message: dict):
+        async with self._send_lock:
+            started = time.perf_counter()
+            with span("ws_send", type=message.get("type")):
+                await self.websocket.send_text(json.dumps(message))
+            observe_stage("ws_send", time.perf_counter() - started)
+
+
+    # 음성 프레임 전송 (헤더와 오디오 프레임 사이에 다른 프레임이 끼어들지 않음)
+    async def send_voice(self, header: dict, audio_data: bytes):
+        async with self._send_lock:
+            started = time.perf_counter()
+            with span("ws_send", type=header.get("type"), audio_bytes=len(audio_data), binary=self.binary):
+                send = asyncio.ensure_future(self._write_voice(header, audio_data))
+                try:
+                    await asyncio.shield(send)
+                except asyncio.CancelledError:
+                    # 턴이 취소되어도 이미 시작한 프레임은 끝까지 전송 (헤더만 가고 오디오가 빠지는 것 방지)
+                    await send
+                    raise
+            observe_stage("ws_send", time.perf_counter() - started)
+
+
+    async def _write_voice(self, header: dict, audio_data: bytes):
+        if self.binary:
+            await self.websocket.send_text(json.dumps({**header, "audio_bytes": len(audio_data)}))
+            await self.websocket.send_bytes(audio_data)
+        else:
+            await self.websocket.send_text(json.dumps({**header, "audio_data": base64.b64encode(audio_data).decode('utf-8')}))
+
+
+# 음성 대화 턴 실행기 (음성 연결당 하나)
+# - 턴은 수신 루프와 별도 태스크로 실행되어 응답을 만드는 중에도 다음 메시지를 받음
+# - 새 발화 / {"type": "cancel"} 이 오면 진행 중인 턴을 취소
+#   (진행 중인 OpenAI 요청은 중단되어 자리를 반납하고, 아직 보내지 않은 음성 청크는 버림)
+class VoiceTurns:
+
+    def __init__(self, channel: VoiceChannel, canvas_id: str):
+        self.channel = channel
+        self.canvas_id = canvas_id
+        self.turn_id = 0
+        self._task: Optional[asyncio.Task] = None
+
+
+    # 새 턴 시작
+    def start(self, turn: Awaitable[None]) -> int:
+        self.turn_id += 1
+        self._task = asyncio.ensure_future(turn)
+        self._task.add_done_callback(self._log_failure)
+        return self.turn_id
+
+
+    # 진행 중인 턴 취소 (취소한 턴이 있으면 클라이언트에 voice_cancelled 전송)
+    async def cancel(self, reason: str, notify: bool = True) -> bool:
+        task = self._task
+        if task is None or task.done():
+            return False
+        task.cancel()
+        # 취소된 턴의 전송이 끝난 뒤에 다음 프레임을 보냄
+        with contextlib.suppress(BaseException):
+            await task
+        VOICE_TURNS_CANCELLED.inc(reason=reason)
+        logger.info(f"[WebSocket] voice turn {self.turn_id} cancelled for canvas_id {self.canvas_id} ({reason})")
+        if notify:
+            await self.channel.send_json({"type": "voice_cancelled", "turn": self.turn_id, "reason": reason})
+        return True
+
+
+    def _log_failure(self, task: asyncio.Task):
+        if task.cancelled() or task.exception() is None or isinstance(task.exception(), WebSocketDisconnect):
+            return
+        logger.error(f"[WebSocket] voice turn failed for canvas_id {self.canvas_id}: {task.exception()!r}")
+
+
+# 음성 데이터 수신
+# - 메시지에 audio_data(base64)가 있으면 디코딩
+# - 없으면 헤더 다음에 오는 바이너리 프레임을 수신
+async def receive_voice_audio(websocket: WebSocket, message: dict) -> bytes:
+    if "audio_data" in message:
+        return base64.b64decode(message["audio_data"])
+    return await websocket.receive_bytes()
+
+
+# 그림 피드백을 생성 즉시 음성으로 변환해 전송하는 태스크
+async def push_feedback(channel: VoiceChannel, drawing_service: DrawingService, canvas_id: str):
+    while True:
+        feedback = await manager.wait_feedback(canvas_id)
+        try:
+            with span("feedback_push", canvas_id=canvas_id, text_length=len(feedback.text)):
+                # TTS 변환 (캐시 사용)
+                audio_content = await drawing_service.create_speech(feedback.text)
+                
+                # 음성 응답 전송
+                response = {
+                    "type": "voice",
+                    "text": feedback.text,
+                    "is_user": False
+                }
+                await channel.send_voice(response, audio_content)
+            
+            latency_ms = manager.record_feedback_latency(feedback)
+            logger.info(f"[WebSocket] feedback pushed for canvas_id {canvas_id}: {latency_ms:.0f}ms after generation")
+        
+        except WebSocketDisconnect:
+            raise
+        except Exception as e:
+            logger.error(f"[WebSocket] feedback push failed for canvas_id {canvas_id}: {str(e)}", exc_info=True)
+
+
+# 배경 이미지 작업(BACKGROUND_IMAGE_ASYNC)이 끝나면 결과를 전송하는 태스크
+# - 작업을 실행하는 워커의 음성 소켓에만 전달됨 (다른 워커는 GET /drawing/jobs/{job_id} 로 조회)
+async def push_background_images(channel: VoiceChannel, drawing_service: DrawingService, canvas_id: str):
+    background_jobs = drawing_service.background_jobs
+    updates = background_jobs.subscribe(canvas_id)
+    try:
+        while True:
+            job = await updates.get()
+            if job.kind != "background" or not job.finished:
+                continue
+            await channel.send_json({
+                "type": "background_image",
+                "job_id": job.job_id,
+                "status": job.status,
+                "background_image": (job.result or {}).get("background_image"),
+                "error": job.error
+            })
+            logger.info(f"[WebSocket] background image {job.status} pushed for canvas_id {canvas_id}")
+    finally:
+        background_jobs.unsubscribe(canvas_id, updates)
+
+
 # 음성 메시지를 처리하는 WebSocket 핸들러
 async def handle_websocket(websocket: WebSocket, robot_id: str, canvas_id: str):
     
+    # 음성 대화 턴의 OpenAI 요청은 배경 생성 등보다 먼저 처리 (이 연결의 하위 태스크에도 적용)
+    set_openai_priority(Priority.INTERACTIVE)
+    
     # WebSocket 연결 수립
     await manager.connect(websocket, canvas_id, is_voice=True)
     
     # 드로잉 서비스 인스턴스 생성
     drawing_service = get_drawing_service()
     
-    # OpenAI API 클라이언트 생성
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    # 스트리밍 모드 여부 (/ws/drawing/{robot_id}/{canvas_id}?stream=true)
+    stream_mode = websocket.query_params.get("stream", "").lower() in ("1", "true")
+    # 바이너리 프로토콜 여부 (?protocol=binary, 기본값은 base64 JSON)
+    binary = websocket.query_params.get("protocol", "json").lower() == "binary"
+    channel = VoiceChannel(websocket, binary)
+    
+    # 그림 피드백 전송 태스크 (수신 대기와 무관하게 피드백이 생기면 바로 전송)
+    feedback_task = asyncio.create_task(push_feedback(channel, drawing_service, canvas_id))
+    # 배경 이미지 완료 알림 태스크 (/drawing/done 이후 배경 작업이 끝나면 전송)
+    background_task = asyncio.create_task(push_background_images(channel, drawing_service, canvas_id))
+    # 음성 대화 턴 (한 번에 하나, 새 발화가 오면 이전 턴 취소)
+    turns = VoiceTurns(channel, canvas_id)
     
     try:
         while True:
-            # 저장된 텍스트 확인
-            text = manager.get_text(canvas_id)
-            
-            # 텍스트가 있으면
-            if text:
-                # TTS 변환
-                print(f"[WebSocket] TTS 변환 시작: {text}")
-                audio_response = client.audio.speech.create(
-                    model="tts-1",
-                    voice="nova",
-                    input=text,
-                    speed=1.0
-                )
-                
-                # 음성 응답 전송
-                response = {
-                    "type": "voice",
-                    "text": text,
-                    "audio_data": base64.b64encode(audio_response.content).decode('utf-8'),
-                    "is_user": False
-                }
-                await websocket.send_text(json.dumps(response))
-                
-                print("[WebSocket] 음성 응답 전송 완료")
-                
-                # 텍스트 삭제 (한 번 전송 후)
-                manager.text_storage.pop(canvas_id, None)
-                continue  # 다음 루프로 바로 넘어감
-            
             # 클라이언트로부터 데이터 수신
             data = await websocket.receive_text()
             # print(f"[WebSocket] 수신된 메시지: {data}")
             message = json.loads(data)
             
-            # 클라이언트로부터 데이터 수신
-            if message["type"] == "voice":
-                # base64 인코딩된 음성 데이터를 디코딩
-                audio_data = base64.b64decode(message["audio_data"])
-                
-                # 오디오 처리 및 응답 생성
-                result = await drawing_service.process_audio(audio_data, robot_id, canvas_id)
-                
-                # 사용자의 음성을 텍스트로 변환
-                with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                    temp_file.write(audio_data)
-                    temp_file_path = temp_file.name
-                
-                try:
-                    # 음성을 텍스트로 변환
-                    with open(temp_file_path, 'rb') as audio_file:
-                        transcript = drawing_service.client.audio.transcriptions.create(
-                            model="whisper-1",
-                            file=audio_file
-                        )
-                    user_text = transcript.text
-                    
-                    # 드로잉 데이터 조회
-                    drawing_data = drawing_service.drawing_data.get(canvas_id)
-                    if drawing_data:
-                        drawing_data.add_message("user", user_text)
-                    
-                    # 사용자 메시지를 클라이언트에 전송
-                    user_message = {
-                        "type": "voice",
-                        "text": user_text,
-                        "is_user": True
-                    }
-                    await websocket.send_text(json.dumps(user_message))
-                    
-                    # AI 응답 전송
+            # 세션의 초기 음성 요청 (/drawing/new, /drawing/make_friend 를 audio=binary 로 호출한 경우)
+            if message["type"] == "initial_audio":
+                drawing_data = await drawing_service.drawing_data.aget(canvas_id)
+                initial_audio = await drawing_service.get_session_audio(drawing_data) if drawing_data else None
+                if initial_audio:
                     response = {
                         "type": "voice",
-                        "text": result.text,
-                        "audio_data": base64.b64encode(result.audio_data).decode('utf-8'),
+                        "text": drawing_data.prompt,
                         "is_user": False
                     }
-                    await websocket.send_text(json.dumps(response))
-                
-                # 임시 파일 삭제
-                finally:
-                    os.unlink(temp_file_path)
+                    await channel.send_voice(response, initial_audio)
+            
+            # 진행 중인 턴 취소 요청 (아이가 말을 멈추게 한 경우 등)
+            if message["type"] == "cancel":
+                await turns.cancel("cancel")
+            
+            # 클라이언트로부터 데이터 수신
+            if message["type"] == "voice":
+                # 음성 데이터 수신 (base64 JSON 또는 헤더 뒤 바이너리 프레임)
+                audio_data = await receive_voice_audio(websocket, message)
+                # 이전 턴이 아직 진행 중이면 끼어들기: 이전 응답은 버리고 새 발화를 바로 처리
+                await turns.cancel("barge_in")
+                turns.start(run_voice_turn(
+                    channel, drawing_service, audio_data, robot_id, canvas_id, bool(stream_mode or message.get("stream"))
+                ))
             
     # 클라이언트 연결 종료  
     except WebSocketDisconnect:
-        print(f"\n[WebSocket] 클라이언트 연결 종료")
+        logger.info(f"[WebSocket] voice socket closed for canvas_id {canvas_id}")
+    finally:
+        await turns.cancel("disconnect", notify=False)
+        feedback_task.cancel()
+        background_task.cancel()
         manager.disconnect(websocket, canvas_id, is_voice=True)
         
         
 
-# 그림 분석을 처리하는 WebSocket 핸들러
-async def handle_drawing_websocket(websocket: WebSocket):
-    print("\n[WebSocket] 연결 시도 감지됨")
-    await websocket.accept()
-    print("[WebSocket] 연결 수락됨")
-    
-    # 드로잉 서비스 인스턴스 생성
-    drawing_service = get_drawing_service()
-    
-    # OpenAI API 클라이언트 생성
-    client = OpenAI(api_key=OPENAI_API_KEY)
-    
-    
-    # 클라이언트로부터 데이터 수신
-    try:
-        data = await websocket.receive_json()
-        print(f"\n[WebSocket] 수신된 메시지: {data}")
-        request = DrawingSocketRequest(**data)
-        canvas_id = request.canvas_id
+# 음성 대화 턴 하나 처리 (STT → chat → TTS → 전송)
+async def run_voice_turn(channel: VoiceChannel, drawing_service: DrawingService, audio_data: bytes,
+                         robot_id: str, canvas_id: str, stream: bool):
+    # 음성 턴 전체를 하나의 trace로 기록
+    with span("voice_turn", canvas_id=canvas_id, robot_id=robot_id, stream=stream):
+        turn_started = time.perf_counter()
         
+        # 스트리밍 모드: 문장 단위 음성 청크를 순서대로 전송
+        if stream:
+            await send_streamed_voice(channel, drawing_service, audio_data, robot_id, canvas_id)
+            observe_stage("turn", time.perf_counter() - turn_started)
+            return
         
-        # 피드백 요청 메시지 전송
-        response = {"status": "success"}
-        await websocket.send_json(response)
-        print(f"[WebSocket] 전송된 응답: {response}")
+        # 오디오 처리 및 응답 생성 (STT는 process_audio에서 한 번만 수행)
+        result = await drawing_service.process_audio(audio_data, robot_id, canvas_id)
         
+        # 사용자 메시지를 클라이언트에 전송
+        if result.user_text:
+            user_message = {
+                "type": "voice",
+                "text": result.user_text,
+                "is_user": True
+            }
+            await channel.send_json(user_message)
         
-        while True:
-            # 클라이언트로부터 데이터 수신
-            data = await websocket.receive_json()
-            print(f"\n[WebSocket] 메시지 수신")
-            
-            
-            # 이미지 데이터 조회
-            image_base64 = data.get("image_url")
-            if not image_base64:
-                continue
+        # AI 응답 전송
+        response = {
+            "type": "voice",
+            "text": result.text,
+            "is_user": False
+        }
+        await channel.send_voice(response, result.audio_data)
+        observe_stage("turn", time.perf_counter() - turn_started)
+
+
+# 음성 응답을 문장 단위 청크로 스트리밍 전송
+async def send_streamed_voice(channel: VoiceChannel, drawing_service: DrawingService, audio_data: bytes,
+                              robot_id: str, canvas_id: str):
+    started = time.perf_counter()
+    first_audio_ms = None
+    
+    # 턴이 취소되면 스트림을 바로 닫아 아직 보내지 않은 문장의 TTS도 취소
+    async with contextlib.aclosing(drawing_service.stream_audio(audio_data, robot_id, canvas_id)) as events:
+        async for event in events:
+            # 사용자 발화 텍스트 전송
+            if event.type == "transcript":
+                await channel.send_json({
+                    "type": "voice",
+                    "text": event.text,
+                    "is_user": True
+                })
         
-                
-            # 이미지 분석 시작
-            print(f"[WebSocket] 이미지 분석 시작")
-            response = client.chat.completions.create(
-                model="gpt-4-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """
+            # 문장 단위 음성 청크 전송 (index 순서대로 재생)
+            elif event.type == "chunk":
+                await channel.send_voice({
+                    "type": "voice_chunk",
+                    "index": event.index,
+                    "text": event.text,
+                    "is_user": False
+                }, event.audio_data)
+                if first_audio_ms is None:
+                    first_audio_ms = (time.perf_counter() - started) * 1000
+                    logger.info(f"[WebSocket] time-to-first-audio for canvas_id {canvas_id}: {first_audio_ms:.0f}ms")
+        
+            # 응답 완료 (전체 텍스트, 청크 수)
+            elif event.type == "end":
+                await channel.send_json({
+                    "type": "voice_end",
+                    "text": event.text,
+                    "chunks": event.index,
+                    "is_user": False
+                })
+    
+    logger.info(f"[WebSocket] streamed voice turn for canvas_id {canvas_id} done in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+
+
+# 실시간 그림 피드백 시스템 프롬프트
+DRAWING_FEEDBACK_PROMPT = """
                                     You are a close friend of children aged 3-7 years old.
                                     You can naturally interact and communicate from a child's perspective.
                                     You speak casually and friendly like a close friend.
@@ -244,33 +438,105 @@ async def handle_drawing_websocket(websocket: WebSocket):
                                     - Use Korean expressions and words that Korean children aged 3-7 can easily understand.
                                     - Your responses must ALWAYS be in Korean, regardless of the input language.
                                     """
-                    },
+
+
+# 그림 분석을 처리하는 WebSocket 핸들러
+# - 프레임은 CanvasFrameScheduler가 debounce / 비슷한 프레임 건너뛰기 / 동시 호출 제한 후 분석
+async def handle_drawing_websocket(websocket: WebSocket):
+    await websocket.accept()
+    manager.drawing_connections += 1
+    logger.debug("[WebSocket] drawing socket accepted")
+    
+    # 공유 비동기 OpenAI 클라이언트 (분석 중에도 다음 프레임을 계속 수신)
+    client = get_openai_client()
+    send_lock = asyncio.Lock()
+    scheduler: Optional[CanvasFrameScheduler] = None
+    canvas_id = None
+    
+    
+    # 프레임 분석 및 결과 전송 (스케줄러가 호출)
+    async def analyze_frame(image_base64: str):
+        # done 결과 초안용 최신 프레임 (SPECULATIVE_DONE 사용 시)
+        get_drawing_service().note_canvas_frame(canvas_id, image_base64)
+        # 1~3문장 피드백: 제한 시간을 짧게, 늦으면 헤징
+        with call_policy("chat_short"):
+            response = await client.chat.completions.create(
+                model=VISION_MODEL,
+                messages=[
                     {
-                        "role": "user",
-                        "content": f"Here is a drawing made by a child: {image_base64}\n\nPlease provide friendly feedback about this drawing as if you're talking to the child. Please respond with only 1-3 sentences in Korean. Use casual, friendly Korean language suitable for children. Do not make the response any longer."
-                    }
+                        "role": "system",
+                        "content": DRAWING_FEEDBACK_PROMPT
+                    },
+                    vision_message(
+                        "Here is a drawing made by a child.\n\nPlease provide friendly feedback about this drawing as if you're talking to the child. Please respond with only 1-3 sentences in Korean. Use casual, friendly Korean language suitable for children. Do not make the response any longer.",
+                        frame_url(image_base64)
+                    )
                 ],
                 max_tokens=300
             )
+        
+        # 분석 결과 조회
+        feedback_text = response.choices[0].message.content
+        logger.debug(f"[WebSocket] drawing feedback for canvas_id {canvas_id}: {feedback_text}")
+        
+        # 텍스트 저장
+        await manager.store_text(canvas_id, feedback_text)
+        
+        # 분석 결과 응답 전송
+        analysis_response = {
+            "type": "ai_response",
+            "status": "success",
+            "text": feedback_text,
+        }
+        async with send_lock:
+            started = time.perf_counter()
+            await websocket.send_json(analysis_response)
+            observe_stage("ws_send", time.perf_counter() - started)
+    
+    
+    # 클라이언트로부터 데이터 수신
+    try:
+        data = await websocket.receive_json()
+        request = DrawingSocketRequest(**data)
+        canvas_id = request.canvas_id
+        logger.debug(f"[WebSocket] drawing socket registered for canvas_id {canvas_id}")
+        
+        
+        # 피드백 요청 메시지 전송
+        response = {"status": "success"}
+        await websocket.send_json(response)
+        
+        # 연속 프레임 합치기 / 비슷한 프레임 건너뛰기 / 동시 호출 제한
+        scheduler = CanvasFrameScheduler(
+            analyze_frame,
+            debounce_seconds=CANVAS_DEBOUNCE_SECONDS,
+            max_wait_seconds=CANVAS_MAX_WAIT_SECONDS,
+            diff_threshold=CANVAS_DIFF_THRESHOLD,
+            max_inflight=CANVAS_MAX_INFLIGHT,
+        )
+        
+        
+        while True:
+            # 클라이언트로부터 데이터 수신
+            data = await websocket.receive_json()
             
-            # 분석 결과 조회
-            feedback_text = response.choices[0].message.content
-            print(f"[WebSocket] GPT 분석 결과: {feedback_text}")
             
-            # 텍스트 저장
-            manager.store_text(canvas_id, feedback_text)
+            # 이미지 데이터 조회
+            image_base64 = data.get("image_url")
+            if not image_base64:
+                continue
             
-            # 분석 결과 응답 전송
-            analysis_response = {
-                "type": "ai_response",
-                "status": "success",
-                "text": feedback_text,
-            }
-            await websocket.send_json(analysis_response)
-            print(f"[WebSocket] 분석 결과 전송 완료")
+            # 분석은 스케줄러가 debounce 후 마지막 프레임으로 수행
+            scheduler.submit(image_base64)
                 
     except WebSocketDisconnect:
-        print(f"\n[WebSocket] 클라이언트 연결 종료")
+        logger.debug(f"[WebSocket] drawing socket closed for canvas_id {canvas_id}")
     except Exception as e:
-        print(f"\n[WebSocket] 에러 발생: {str(e)}")
-        await websocket.close() 
\ No newline at end of file
+        logger.error(f"[WebSocket] drawing socket error for canvas_id {canvas_id}: {str(e)}", exc_info=True)
+        await websocket.close()
+    finally:
+        manager.drawing_connections -= 1
+        if scheduler:
+            manager.record_frame_stats(scheduler.stats())
+            logger.info(f"Canvas {canvas_id} frame stats: {scheduler.stats()}")
+            await scheduler.close()
@@ -0,0 +1,121 @@
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+from app.config import AUDIO_STORE_MEMORY_BYTES
+import base64
+import hashlib
+import logging
+import threading
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+class _Blob(NamedTuple):
+    data: bytes
+    # 처음 요청될 때 만들어 재사용하는 base64 문자열
+    encoded: Optional[str]
+
+
+# 세션 음성 저장소 (세션에는 음성 대신 audio_id만 보관)
+# - audio_id: 음성 데이터의 SHA-256 해시 (같은 음성은 한 번만 보관)
+# - 전체 크기(바이트)를 넘으면 가장 오래 사용하지 않은 음성부터 제거
+# - 제거된 음성은 세션의 audio_text로 다시 합성 (TTS 캐시에서 대부분 바로 반환)
+class AudioBlobStore:
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._blobs: "OrderedDict[str, _Blob]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # 지표
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    # 음성 저장 후 audio_id 반환
+    def put(self, data: bytes) -> str:
+        audio_id = hashlib.sha256(data).hexdigest()[:32]
+        with self._lock:
+            if audio_id in self._blobs:
+                self._blobs.move_to_end(audio_id)
+                return audio_id
+            self._blobs[audio_id] = _Blob(data, None)
+            self._size += len(data)
+            self._evict()
+        return audio_id
+
+
+    # 음성 조회 (없으면 None)
+    def get(self, audio_id: Optional[str]) -> Optional[bytes]:
+        blob = self._lookup(audio_id)
+        return blob.data if blob else None
+
+
+    # base64 문자열로 조회 (같은 음성은 한 번만 인코딩)
+    def get_base64(self, audio_id: Optional[str]) -> Optional[str]:
+        blob = self._lookup(audio_id)
+        if blob is None:
+            return None
+        if blob.encoded is not None:
+            return blob.encoded
+        encoded = base64.b64encode(blob.data).decode("utf-8")
+        with self._lock:
+            if self._blobs.get(audio_id) is blob:
+                self._blobs[audio_id] = _Blob(blob.data, encoded)
+                self._size += len(encoded)
+                self._evict()
+        return encoded
+
+
+    def __contains__(self, audio_id: str) -> bool:
+        return audio_id in self._blobs
+
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+
+    # 지표 조회
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._blobs),
+            "bytes": self._size,
+        }
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    def _lookup(self, audio_id: Optional[str]) -> Optional[_Blob]:
+        if not audio_id:
+            return None
+        with self._lock:
+            blob = self._blobs.get(audio_id)
+            if blob is None:
+                self.misses += 1
+                return None
+            self._blobs.move_to_end(audio_id)
+            self.hits += 1
+            return blob
+
+
+    def _evict(self):
+        # 방금 넣은 항목 하나는 크기와 관계없이 남김
+        while self._size > self.max_bytes and len(self._blobs) > 1:
+            audio_id, blob = self._blobs.popitem(last=False)
+            self._size -= len(blob.data) + len(blob.encoded or "")
+            self.evictions += 1
+            logger.debug(f"Audio blob evicted: {audio_id}")
+
+
+_audio_store: Optional[AudioBlobStore] = None
+
+
+def get_audio_store() -> AudioBlobStore:
+    """공유 세션 음성 저장소를 반환"""
+    global _audio_store
+    if _audio_store is None:
+        _audio_store = AudioBlobStore(AUDIO_STORE_MEMORY_BYTES)
+    return _audio_store
@@ -0,0 +1,349 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from app.config import (
+    OPENAI_TIMEOUTS, OPENAI_DEADLINES, OPENAI_HEDGE_AFTER, OPENAI_RETRIES,
+    OPENAI_CIRCUIT_FAILURES, OPENAI_CIRCUIT_RESET_SECONDS,
+)
+import asyncio
+import logging
+import random
+import time
+import httpx
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+# 요청 종류별 호출 정책
+@dataclass(frozen=True)
+class CallPolicy:
+    # 시도당 제한 시간 (초)
+    timeout: float = 30.0
+    # 재시도를 포함한 전체 제한 시간 (초)
+    deadline: float = 60.0
+    # 재시도 횟수 (429 / 5xx / 연결 오류 / 시간 초과)
+    retries: int = 2
+    # 재시도 대기 (지수 백오프 + full jitter)
+    backoff_base: float = 0.25
+    backoff_max: float = 4.0
+    # 이 시간(초) 안에 응답이 없으면 요청을 하나 더 보냄 (None이면 사용 안 함)
+    hedge_after: Optional[float] = None
+
+
+# 회로 차단기가 열려 있어 요청을 보내지 않음
+class CircuitOpenError(Exception):
+    pass
+
+
+# 전체 제한 시간이 지남 (요청 자리를 얻지 못했거나, 자리를 기다리느라 시도 제한 시간을 다 쓰지 못하고 끝남)
+# - 로컬 대기열 / 남은 시간 문제이므로 재시도하지 않고 회로 차단기 실패로도 세지 않음
+class DeadlineExceededError(asyncio.TimeoutError):
+    pass
+
+
+# 회로 차단기
+# - 연속 실패가 failure_threshold에 도달하면 열림 (reset_timeout 동안 바로 실패)
+# - reset_timeout이 지나면 요청 하나만 시험 삼아 보내고, 성공하면 닫힘
+class CircuitBreaker:
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+
+    def before_call(self):
+        state = self.state
+        if state == "open" or (state == "half_open" and self._probing):
+            raise CircuitOpenError(f"Circuit for {self.name} is open")
+        if state == "half_open":
+            self._probing = True
+
+
+    def abandon_probe(self):
+        """시험 요청이 결과 없이 취소됨 (다음 요청이 다시 시험)"""
+        self._probing = False
+
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info(f"Circuit for {self.name} closed")
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self._probing:
+                logger.warning(f"Circuit for {self.name} opened after {self.failures} failures")
+            self.opened_at = time.monotonic()
+            self._probing = False
+
+
+def is_retryable(error: BaseException) -> bool:
+    """429 / 5xx / 연결 오류 / 시간 초과 여부"""
+    if isinstance(error, (asyncio.TimeoutError, httpx.TransportError)):
+        return True
+    # openai.APIConnectionError / APITimeoutError
+    if type(error).__name__ in ("APIConnectionError", "APITimeoutError"):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code == 429 or (isinstance(status_code, int) and status_code >= 500)
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    response = getattr(error, "response", None)
+    value = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+# 호출 지표 (요청 종류별)
+class CallStats:
+
+    def __init__(self):
+        self.calls = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.failures = 0
+        self.rejected = 0
+        self.deadline_exceeded = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+# 호출 정책 실행기
+class CallPolicyRunner:
+
+    def __init__(self, policies: Dict[str, CallPolicy], failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.policies = policies
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.stats: Dict[str, CallStats] = {}
+
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        if name not in self.breakers:
+            self.breakers[name] = CircuitBreaker(name, self.failure_threshold, self.reset_timeout)
+        return self.breakers[name]
+
+
+    # 정책에 따라 호출 (factory는 시도마다 새 awaitable 생성)
+    # - admit을 주면 시도마다 먼저 요청 자리를 얻고 (전체 제한 시간까지만 대기) 그 결과인 release 함수를
+    #   factory(release)에 넘김, 시도 제한 시간은 자리를 얻은 뒤부터 계산
+    # - factory는 끝나면 release를 호출 (실패 / 취소 시에는 실행기가 호출, 여러 번 호출해도 안전해야 함)
+    async def call(self, operation: str, circuit: str, factory: Callable[..., Awaitable[T]],
+                   hedge: bool = True, admit: Optional[Callable[[], Awaitable[Callable[[], None]]]] = None) -> T:
+        policy = self.policies.get(operation) or CallPolicy()
+        stats = self.stats.setdefault(operation, CallStats())
+        breaker = self.breaker(circuit)
+        deadline = time.monotonic() + policy.deadline
+        stats.calls += 1
+
+        attempt = 0
+        last_error: Optional[Exception] = None
+        while True:
+            try:
+                breaker.before_call()
+            except CircuitOpenError:
+                stats.rejected += 1
+                if last_error is None:
+                    raise
+                # 재시도 중 회로가 열리면 마지막 오류로 실패
+                stats.failures += 1
+                raise last_error
+            try:
+                result = await self._attempt(factory, admit, policy, deadline, hedge, stats)
+            except asyncio.CancelledError:
+                breaker.abandon_probe()
+                raise
+            except DeadlineExceededError as e:
+                breaker.abandon_probe()
+                stats.deadline_exceeded += 1
+                stats.failures += 1
+                logger.error(f"{operation} ({circuit}) deadline exceeded: {e}")
+                raise
+            except Exception as e:
+                last_error = e
+                if not is_retryable(e):
+                    # 요청 자체의 문제(4xx)는 상대 서버 장애가 아님
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if isinstance(e, asyncio.TimeoutError):
+                    stats.timeouts += 1
+                delay = _retry_after(e) or random.uniform(0, min(policy.backoff_max, policy.backoff_base * 2 ** attempt))
+                if attempt >= policy.retries or time.monotonic() + delay >= deadline:
+                    stats.failures += 1
+                    logger.error(f"{operation} ({circuit}) failed after {attempt + 1} attempts: {type(e).__name__}: {e}")
+                    raise
+                attempt += 1
+                stats.retries += 1
+                logger.warning(f"{operation} ({circuit}) attempt {attempt} failed ({type(e).__name__}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            breaker.record_success()
+            return result
+
+
+    async def _attempt(self, factory: Callable[..., Awaitable[T]], admit, policy: CallPolicy, deadline: float,
+                       hedge: bool, stats: CallStats) -> T:
+        release = await self._admit(admit, deadline)
+        timeout = min(policy.timeout, deadline - time.monotonic())
+        try:
+            return await self._race(factory, admit, release, policy, timeout, deadline, hedge, stats)
+        except DeadlineExceededError:
+            raise
+        except asyncio.TimeoutError:
+            if timeout < policy.timeout:
+                # 시도 제한 시간을 다 쓰기 전에 전체 제한 시간이 끝남
+                raise DeadlineExceededError("Deadline reached before the attempt timeout") from None
+            raise
+
+
+    async def _race(self, factory: Callable[..., Awaitable[T]], admit, release: Optional[Callable[[], None]],
+                    policy: CallPolicy, timeout: float, deadline: float, hedge: bool, stats: CallStats) -> T:
+        if not hedge or policy.hedge_after is None or policy.hedge_after >= timeout:
+            return await self._send(factory, release, timeout)
+
+        # 🏁 요청 헤징: 첫 요청이 hedge_after 안에 끝나지 않으면 하나 더 보내고 먼저 성공한 응답 사용
+        primary = self._spawn(factory, release, timeout)
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=policy.hedge_after)
+            if not done:
+                stats.hedged += 1
+                tasks.append(asyncio.ensure_future(self._admitted(factory, admit, deadline)))
+            end = time.monotonic() + timeout - (policy.hedge_after if not done else 0)
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0.0, end - time.monotonic()), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise asyncio.TimeoutError()
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            stats.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            # 취소된 요청이 스케줄러 자리 등을 정리할 때까지 기다리지 않음
+            for task in tasks:
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    async def _admit(self, admit, deadline: float) -> Optional[Callable[[], None]]:
+        """요청 자리 확보 (전체 제한 시간까지만 대기, admit이 없으면 None)"""
+        if admit is None:
+            return None
+        try:
+            return await asyncio.wait_for(admit(), max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError("Timed out waiting for a request slot") from None
+
+
+    async def _send(self, factory: Callable[..., Awaitable[T]], release: Optional[Callable[[], None]],
+                    timeout: float) -> T:
+        """자리를 얻은 요청 한 번 실행 (실패 / 취소 / 시간 초과 시 자리 반납)"""
+        if release is None:
+            return await asyncio.wait_for(factory(), timeout)
+        try:
+            return await asyncio.wait_for(factory(release), timeout)
+        except BaseException:
+            release()
+            raise
+
+
+    def _spawn(self, factory: Callable[..., Awaitable[T]], release: Optional[Callable[[], None]],
+               timeout: float) -> "asyncio.Future[T]":
+        task = asyncio.ensure_future(self._send(factory, release, timeout))
+        if release is not None:
+            # 시작하기 전에 취소되면 _send가 실행되지 않으므로 여기서 자리 반납
+            task.add_done_callback(lambda t: release() if t.cancelled() else None)
+        return task
+
+
+    async def _admitted(self, factory: Callable[..., Awaitable[T]], admit, deadline: float) -> T:
+        """헤징 요청: 자리를 얻은 뒤 남은 시간 안에서 실행"""
+        release = await self._admit(admit, deadline)
+        return await self._send(factory, release, deadline - time.monotonic())
+
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": {operation: stats.as_dict() for operation, stats in self.stats.items()},
+            "circuits": {name: breaker.state for name, breaker in self.breakers.items()},
+        }
+
+
+# 현재 작업에서 사용할 호출 정책 이름 (미설정 시 요청 종류 기본값)
+_operation: ContextVar[Optional[str]] = ContextVar("call_policy", default=None)
+
+
+@contextmanager
+def call_policy(operation: str):
+    """블록 안의 OpenAI 요청에 적용할 호출 정책 지정 (예: 짧은 답변용 chat_short)"""
+    token = _operation.set(operation)
+    try:
+        yield
+    finally:
+        _operation.reset(token)
+
+
+def current_operation(default: str) -> str:
+    return _operation.get() or default
+
+
+def _default_policies() -> Dict[str, CallPolicy]:
+    return {
+        operation: CallPolicy(
+            timeout=OPENAI_TIMEOUTS.get(operation, 30.0),
+            deadline=OPENAI_DEADLINES.get(operation, 60.0),
+            retries=OPENAI_RETRIES,
+            hedge_after=OPENAI_HEDGE_AFTER.get(operation),
+        )
+        for operation in ("chat", "chat_short", "tts", "transcription", "image")
+    }
+
+
+_call_policy_runner: Optional[CallPolicyRunner] = None
+
+
+def get_call_policy_runner() -> CallPolicyRunner:
+    """공유 호출 정책 실행기를 반환"""
+    global _call_policy_runner
+    if _call_policy_runner is None:
+        _call_policy_runner = CallPolicyRunner(_default_policies(), OPENAI_CIRCUIT_FAILURES, OPENAI_CIRCUIT_RESET_SECONDS)
+    return _call_policy_runner
@@ -0,0 +1,172 @@
+from io import BytesIO
+from typing import Awaitable, Callable, Optional
+from PIL import Image
+import numpy as np
+import asyncio
+import base64
+import binascii
+import logging
+import time
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 프레임 비교용 축소 크기 (흑백 32x32)
+SIGNATURE_SIZE = 32
+
+
+def decode_frame(frame: str) -> Optional[bytes]:
+    """data URL / base64 문자열 프레임을 이미지 바이트로 변환 (URL 등 디코딩할 수 없으면 None)"""
+    if frame.startswith("data:"):
+        frame = frame.partition(",")[2]
+    elif frame.startswith(("http://", "https://")):
+        return None
+    try:
+        return base64.b64decode(frame, validate=True)
+    except (binascii.Error, ValueError):
+        return None
+
+
+def frame_url(frame: str) -> str:
+    """프레임을 비전 모델 image_url로 변환 (URL / data URL은 그대로, base64 문자열은 PNG data URL)"""
+    if frame.startswith(("data:", "http://", "https://")):
+        return frame
+    return f"data:image/png;base64,{frame}"
+
+
+def frame_signature(image_bytes: bytes) -> Optional[np.ndarray]:
+    """흑백으로 변환 후 작게 축소한 밝기 배열 (0~1), 디코딩 실패 시 None"""
+    try:
+        with Image.open(BytesIO(image_bytes)) as image:
+            image.draft("L", (SIGNATURE_SIZE * 4, SIGNATURE_SIZE * 4))
+            small = image.convert("L").resize((SIGNATURE_SIZE, SIGNATURE_SIZE), Image.BILINEAR)
+        return np.asarray(small, dtype=np.float32) / 255.0
+    except Exception:
+        return None
+
+
+def frame_difference(a: np.ndarray, b: np.ndarray) -> float:
+    """두 프레임 서명의 평균 밝기 차이 (0 = 동일, 1 = 완전히 다름)"""
+    return float(np.mean(np.abs(a - b)))
+
+
+# 캔버스별 실시간 그림 피드백 스케줄러
+# - 연속으로 들어오는 프레임은 마지막 프레임만 남김 (debounce 동안 새 프레임이 없을 때 분석,
+#   계속 그리는 중이어도 max_wait가 지나면 분석)
+# - 마지막으로 분석한 프레임과 거의 같은 프레임은 건너뜀
+# - 동시에 진행되는 비전 호출 수를 max_inflight로 제한
+class CanvasFrameScheduler:
+
+    def __init__(self, analyze: Callable[[str], Awaitable[None]], debounce_seconds: float = 0.5,
+                 max_wait_seconds: float = 2.0, diff_threshold: float = 0.02, max_inflight: int = 1):
+        self.analyze = analyze
+        self.debounce_seconds = debounce_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self.diff_threshold = diff_threshold
+        self._slots = asyncio.Semaphore(max_inflight)
+        self._latest: Optional[str] = None
+        self._first_pending_at = 0.0
+        self._frame_event = asyncio.Event()
+        self._last_signature: Optional[np.ndarray] = None
+        self._calls: set = set()
+        self._worker = asyncio.create_task(self._run())
+        # 지표
+        self.frames_received = 0
+        self.frames_coalesced = 0
+        self.frames_skipped = 0
+        self.calls_made = 0
+        self.calls_failed = 0
+
+
+    # 새 프레임 제출 (대기 중인 프레임은 교체됨)
+    def submit(self, frame: str):
+        self.frames_received += 1
+        if self._latest is not None:
+            self.frames_coalesced += 1
+        else:
+            self._first_pending_at = time.monotonic()
+        self._latest = frame
+        self._frame_event.set()
+
+
+    # 지표 조회
+    def stats(self) -> dict:
+        return {
+            "frames_received": self.frames_received,
+            "frames_coalesced": self.frames_coalesced,
+            "frames_skipped": self.frames_skipped,
+            "calls_made": self.calls_made,
+            "calls_failed": self.calls_failed,
+            "calls_inflight": len(self._calls),
+        }
+
+
+    # 스케줄러 종료 (진행 중인 호출 포함)
+    async def close(self):
+        self._worker.cancel()
+        for task in list(self._calls):
+            task.cancel()
+        await asyncio.gather(self._worker, *self._calls, return_exceptions=True)
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    async def _run(self):
+        while True:
+            await self._frame_event.wait()
+            await self._debounce()
+            await self._slots.acquire()
+            # 호출 자리를 기다리는 동안 들어온 프레임까지 반영해 가장 최신 프레임 사용
+            frame, self._latest = self._latest, None
+            self._frame_event.clear()
+            try:
+                launched = await self._dispatch(frame)
+            except BaseException:
+                self._slots.release()
+                raise
+            if not launched:
+                self._slots.release()
+
+
+    async def _debounce(self):
+        """debounce 동안 새 프레임이 없거나 max_wait가 지날 때까지 대기"""
+        while True:
+            self._frame_event.clear()
+            remaining = self.max_wait_seconds - (time.monotonic() - self._first_pending_at)
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(self._frame_event.wait(), timeout=min(self.debounce_seconds, remaining))
+            except asyncio.TimeoutError:
+                return
+
+
+    async def _dispatch(self, frame: str) -> bool:
+        image_bytes = decode_frame(frame)
+        signature = await asyncio.to_thread(frame_signature, image_bytes) if image_bytes else None
+        if signature is not None and self._last_signature is not None:
+            difference = frame_difference(signature, self._last_signature)
+            if difference < self.diff_threshold:
+                self.frames_skipped += 1
+                logger.debug(f"Skipped near-identical frame (difference {difference:.4f})")
+                return False
+
+        previous, self._last_signature = self._last_signature, signature
+        self.calls_made += 1
+        task = asyncio.create_task(self._call(frame, previous))
+        self._calls.add(task)
+        task.add_done_callback(self._calls.discard)
+        return True
+
+
+    async def _call(self, frame: str, previous_signature: Optional[np.ndarray]):
+        try:
+            await self.analyze(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.calls_failed += 1
+            # 실패한 프레임은 분석된 것으로 보지 않음 (같은 그림이 다시 오면 재시도)
+            self._last_signature = previous_signature
+            logger.error(f"Canvas frame analysis failed: {str(e)}", exc_info=True)
+        finally:
+            self._slots.release()
@@ -0,0 +1,115 @@
+import importlib.util
+import logging
+from typing import Optional
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+from app.config import (
+    OPENAI_API_KEY, OPENAI_BASE_URL, HTTP_TIMEOUT,
+    HTTP2_ENABLED, HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE, HTTP_KEEPALIVE_EXPIRY,
+)
+from app.utils.openai_scheduler import ScheduledOpenAI, get_openai_scheduler
+from app.utils.call_policy import get_call_policy_runner
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 프로세스 전체에서 공유하는 비동기 클라이언트
+# - 요청/연결마다 새로 만들지 않고 커넥션 풀을 재사용 (TLS 핸드셰이크는 연결당 한 번)
+# - app/main.py lifespan에서 open_clients()로 만들고 종료 시 close_clients()로 정리
+_openai_client: Optional[ScheduledOpenAI] = None
+_http_client: Optional[httpx.AsyncClient] = None
+# open_clients() ~ close_clients() 사이인지 여부 (밖에서 만든 클라이언트는 아무도 닫지 않음)
+_opened = False
+
+
+def _http2() -> bool:
+    """HTTP/2는 h2 패키지가 설치된 경우에만 사용 (pip install httpx[http2])"""
+    return HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+
+
+def _pool_limits(limits_type):
+    """공유 커넥션 풀 크기 (OpenAI SDK와 httpx가 서로 다른 Limits 타입을 쓸 수 있어 타입을 받음)"""
+    return limits_type(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def create_openai_client() -> ScheduledOpenAI:
+    """새 OpenAI 클라이언트 생성 (서비스 코드는 get_openai_client()로 공유 클라이언트를 사용)"""
+    # 재시도 / 제한 시간은 호출 정책이 담당 (SDK 자체 재시도는 끔)
+    http_client = openai.DefaultAsyncHttpxClient(
+        http2=_http2(),
+        limits=_pool_limits(type(openai.DEFAULT_CONNECTION_LIMITS)),
+    )
+    return ScheduledOpenAI(
+        AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, max_retries=0, http_client=http_client),
+        get_openai_scheduler(),
+        get_call_policy_runner(),
+    )
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """새 httpx 비동기 클라이언트 생성 (서비스 코드는 get_http_client()로 공유 클라이언트를 사용)"""
+    return httpx.AsyncClient(
+        timeout=HTTP_TIMEOUT,
+        follow_redirects=True,
+        http2=_http2(),
+        limits=_pool_limits(httpx.Limits),
+    )
+
+
+def _warn_unmanaged(name: str):
+    """lifespan 밖에서 공유 클라이언트를 만들면 경고 (close_clients()가 정리하지 않을 수 있음)"""
+    if not _opened:
+        logger.warning(f"Shared {name} client created outside the app lifespan (call open_clients() first)")
+
+
+def get_openai_client() -> ScheduledOpenAI:
+    """공유 AsyncOpenAI 클라이언트를 반환 (모든 요청은 호출 정책과 OpenAI 스케줄러를 거침)"""
+    global _openai_client
+    if _openai_client is None:
+        _warn_unmanaged("AsyncOpenAI")
+        _openai_client = create_openai_client()
+        logger.info("Shared AsyncOpenAI client created")
+    return _openai_client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """공유 httpx 비동기 클라이언트를 반환 (S3 이미지 다운로드 등)"""
+    global _http_client
+    if _http_client is None:
+        _warn_unmanaged("HTTP")
+        _http_client = create_http_client()
+        logger.info("Shared HTTP client created")
+    return _http_client
+
+
+def open_clients():
+    """서버 시작 시 공유 클라이언트를 미리 생성"""
+    global _opened
+    _opened = True
+    get_openai_client()
+    get_http_client()
+    logger.info(
+        f"Client registry ready (http2={_http2()}, max_connections={HTTP_MAX_CONNECTIONS}, "
+        f"keepalive={HTTP_MAX_KEEPALIVE}/{HTTP_KEEPALIVE_EXPIRY:.0f}s)"
+    )
+    if HTTP2_ENABLED and not _http2():
+        logger.info("h2 package not installed, using HTTP/1.1 keep-alive pools")
+
+
+async def close_clients():
+    """공유 클라이언트를 닫고 커넥션 풀을 정리"""
+    global _openai_client, _http_client, _opened
+    _opened = False
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -0,0 +1,52 @@
+import re
+from typing import Optional, Tuple
+
+# 단일 바이트 구간 (bytes=0-99, bytes=100-, bytes=-500)
+_BYTES_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+# 요청한 구간이 파일 범위를 벗어남 (416)
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Range 헤더를 (시작, 끝) 바이트 위치로 변환 (끝 포함)
+
+    헤더가 없거나 여러 구간 / 알 수 없는 형식 / 끝이 시작보다 앞이면 None (전체 응답, RFC 9110 14.2)
+    """
+    if not header:
+        return None
+    match = _BYTES_RANGE.match(header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    start_text, end_text = match.groups()
+    if start_text == "":
+        # 마지막 N 바이트
+        length = int(end_text)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+    start = int(start_text)
+    if end_text and int(end_text) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    end = min(int(end_text), size - 1) if end_text else size - 1
+    return start, end
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더에 etag가 포함되는지 (약한 비교)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def if_range_matches(if_range: Optional[str], etag: str) -> bool:
+    """If-Range 헤더가 없거나 etag와 같으면 True (강한 비교, 날짜 형식은 불일치로 처리)"""
+    if not if_range:
+        return True
+    return if_range.strip() == etag
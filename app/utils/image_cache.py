@@ -0,0 +1,199 @@
+from collections import OrderedDict
+from io import BytesIO
+from typing import Dict, NamedTuple, Optional
+from app.config import IMAGE_MAX_SIZE, IMAGE_FORMAT, IMAGE_JPEG_QUALITY, IMAGE_CACHE_SIZE, IMAGE_CACHE_TTL_SECONDS
+from app.utils.metrics import UPSTREAM_BYTES, observe_stage
+from app.utils.tracing import span
+from PIL import Image
+import asyncio
+import base64
+import httpx
+import logging
+import time
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+# 비전 모델 전송용으로 처리된 이미지
+class PreparedImage(NamedTuple):
+    base64: str
+    mime_type: str
+    width: int
+    height: int
+    original_bytes: int
+    encoded_bytes: int
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{self.base64}"
+
+
+def vision_message(text: str, image_url: str) -> dict:
+    """텍스트와 이미지를 함께 보내는 비전 모델용 사용자 메시지 (이미지는 image_url 파트로 전달)"""
+    return {
+        "role": "user",
+        "content": [
+            {"type": "text", "text": text},
+            {"type": "image_url", "image_url": {"url": image_url}},
+        ]
+    }
+
+
+class _CacheEntry(NamedTuple):
+    image: PreparedImage
+    etag: Optional[str]
+    fetched_at: float
+
+
+# 그림 이미지 다운로드 / 디코딩 캐시
+# - URL별로 한 번만 다운로드하고, 동시에 같은 URL을 요청하면 다운로드를 공유
+# - TTL이 지나면 ETag(If-None-Match)로 재검증하여 304면 다시 처리하지 않음
+# - Pillow로 긴 변을 max_size 이하로 줄이고 재인코딩 (토큰 수 / 업로드 크기 절감)
+class ImageCache:
+
+    def __init__(self, max_entries: int = 128, ttl_seconds: float = 300, max_size: int = 768,
+                 image_format: str = "JPEG", jpeg_quality: int = 85):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.image_format = image_format
+        self.jpeg_quality = jpeg_quality
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        # 다운로드 중인 URL
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # 지표
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+
+    # 이미지 조회, 없거나 오래됐으면 다운로드 후 처리
+    async def get(self, image_url: str, http_client: httpx.AsyncClient) -> PreparedImage:
+        entry = self._entries.get(image_url)
+        if entry and time.monotonic() - entry.fetched_at < self.ttl_seconds:
+            self._entries.move_to_end(image_url)
+            self.hits += 1
+            return entry.image
+
+        if image_url in self._inflight:
+            self.hits += 1
+            inflight = self._inflight[image_url]
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # 먼저 다운로드하던 요청만 취소된 경우 이 요청이 다시 다운로드
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                return await self.get(image_url, http_client)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[image_url] = future
+        try:
+            image = await self._fetch(image_url, http_client, entry)
+            future.set_result(image)
+            return image
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 대기자가 없으면 예외 미조회 경고 방지
+            future.exception()
+            raise
+        finally:
+            del self._inflight[image_url]
+
+
+    # 지표 조회
+    def stats(self) -> dict:
+        lookups = self.hits + self.revalidated + self.misses
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.revalidated) / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    async def _fetch(self, image_url: str, http_client: httpx.AsyncClient,
+                     entry: Optional[_CacheEntry]) -> PreparedImage:
+        headers = {"If-None-Match": entry.etag} if entry and entry.etag else None
+        logger.info(f"Downloading image from S3: {image_url}")
+        started = time.perf_counter()
+        with span("s3_fetch", revalidate=bool(headers)):
+            response = await http_client.get(image_url, headers=headers) if headers else await http_client.get(image_url)
+        observe_stage("s3_fetch", time.perf_counter() - started)
+
+        if entry and response.status_code == 304:
+            self.revalidated += 1
+            self._store(image_url, entry.image, entry.etag)
+            return entry.image
+        if response.status_code != 200:
+            raise ValueError(f"Failed to download image from S3. Status code: {response.status_code}")
+
+        self.misses += 1
+        UPSTREAM_BYTES.inc(len(response.content), service="s3", direction="received")
+        image = await asyncio.to_thread(self.prepare, response.content)
+        self._store(image_url, image, getattr(response, "headers", {}).get("ETag"))
+        logger.info(
+            f"Prepared image {image.width}x{image.height} "
+            f"({image.original_bytes} → {image.encoded_bytes} bytes)"
+        )
+        return image
+
+
+    def _store(self, image_url: str, image: PreparedImage, etag: Optional[str]):
+        self._entries.pop(image_url, None)
+        self._entries[image_url] = _CacheEntry(image, etag, time.monotonic())
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+    def prepare(self, content: bytes) -> PreparedImage:
+        """이미지를 축소 / 재인코딩 (디코딩할 수 없으면 원본 그대로 사용)"""
+        try:
+            with Image.open(BytesIO(content)) as source:
+                source.load()
+                image = source.copy()
+        except Exception as e:
+            logger.warning(f"Could not decode image, sending original bytes: {str(e)}")
+            return PreparedImage(base64.b64encode(content).decode("utf-8"), "image/png", 0, 0, len(content), len(content))
+
+        image.thumbnail((self.max_size, self.max_size), Image.LANCZOS)
+        buffer = BytesIO()
+        if self.image_format == "JPEG":
+            # 투명 배경은 흰 도화지 색으로 채움
+            if image.mode in ("RGBA", "LA", "P"):
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            elif image.mode != "RGB":
+                image = image.convert("RGB")
+            image.save(buffer, format="JPEG", quality=self.jpeg_quality, optimize=True)
+            mime_type = "image/jpeg"
+        else:
+            image.save(buffer, format="PNG", optimize=True)
+            mime_type = "image/png"
+
+        encoded = buffer.getvalue()
+        return PreparedImage(
+            base64.b64encode(encoded).decode("utf-8"), mime_type,
+            image.width, image.height, len(content), len(encoded)
+        )
+
+
+_image_cache: Optional[ImageCache] = None
+
+
+def get_image_cache() -> ImageCache:
+    """공유 이미지 캐시를 반환"""
+    global _image_cache
+    if _image_cache is None:
+        _image_cache = ImageCache(
+            IMAGE_CACHE_SIZE, IMAGE_CACHE_TTL_SECONDS, IMAGE_MAX_SIZE, IMAGE_FORMAT, IMAGE_JPEG_QUALITY
+        )
+    return _image_cache
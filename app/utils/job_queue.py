@@ -0,0 +1,215 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from app.models.job import Job
+from app.services.job_store.job_store import JobStore
+from app.utils.tracing import span
+import asyncio
+import contextvars
+import logging
+import time
+import uuid
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+# 비동기 작업 큐 (/drawing/done/batch 등)
+# - submit()은 작업을 저장하고 바로 반환, 작업은 프로세스 안의 워커가 순서대로 처리
+# - 동시에 처리하는 작업 수를 concurrency로 제한 (요청이 몰려도 OpenAI 호출이 한꺼번에 쏟아지지 않음)
+# - 대기 중인 작업을 최대 batch_size개씩 꺼내 prepare(작업 목록)로 한 번에 준비 (예: 대화 요약 묶어서 요청)
+#   prepare가 돌려준 {job_id: 값}은 run(작업, 값)에 전달
+# - 상태가 바뀔 때마다 batch_id 구독자(WebSocket)에게 알림
+# - 실행 전 저장소에서 작업을 claim하므로 저장소를 공유하는 여러 워커가 같은 작업을 두 번 실행하지 않음
+# - 저장소 호출은 비동기 메서드(aget / asave 등)로 이벤트 루프를 막지 않음
+class JobQueue:
+
+    def __init__(self, store: JobStore, run: Callable[[Job, Any], Awaitable[Dict[str, Any]]],
+                 concurrency: int = 4, batch_size: int = 8,
+                 prepare: Optional[Callable[[List[Job]], Awaitable[Dict[str, Any]]]] = None):
+        self.store = store
+        self.run = run
+        self.prepare = prepare
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        # asyncio 객체는 실행 중인 이벤트 루프에서 처음 쓸 때 만듦 (import / 생성 시점의 루프에 묶이지 않도록)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+        # 끝나지 않은 작업 수 (join 대기용)
+        self._unfinished = 0
+        self._idle: Optional[asyncio.Event] = None
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        # 중복 요청으로 다른 묶음에도 포함된 작업 (job_id → batch_id, 상태 알림용)
+        self._extra_batches: Dict[str, Set[str]] = {}
+        # 등록 중 (중복 확인 ~ 저장 사이에 같은 캔버스 요청이 끼어들지 않도록 한 번에 하나씩)
+        self._submitting: Optional[asyncio.Lock] = None
+
+
+    # 작업 등록 후 (batch_id, 작업 목록) 반환
+    # - 같은 캔버스 / 같은 그림(image_url)에 끝나지 않은 작업이 있으면 새로 만들지 않고 그 작업을 이번 묶음에도 포함해 돌려줌
+    #   (작업의 batch_id는 기존 묶음 그대로, 두 묶음 모두에서 조회 / 알림)
+    # - batch_id를 주지 않으면 새로 만듦 (배경 이미지 작업은 canvas_id를 batch_id로 사용)
+    async def submit(self, kind: str, items: List[Dict[str, Any]],
+                     batch_id: Optional[str] = None) -> Tuple[str, List[Job]]:
+        batch_id = batch_id or uuid.uuid4().hex
+        jobs = []
+        if self._submitting is None:
+            self._submitting = asyncio.Lock()
+        async with self._submitting:
+            for item in items:
+                params = dict(item)
+                canvas_id = params.pop("canvas_id")
+                existing = await self.store.afind_active(kind, canvas_id, params.get("image_url"))
+                if existing is not None:
+                    if existing.batch_id != batch_id:
+                        await self.store.aadd_to_batch(batch_id, existing.job_id)
+                        self._extra_batches.setdefault(existing.job_id, set()).add(batch_id)
+                    jobs.append(existing)
+                    continue
+                job = Job(kind=kind, canvas_id=canvas_id, batch_id=batch_id, params=params)
+                await self.store.asave(job)
+                self._queue().put_nowait(job.job_id)
+                self._unfinished += 1
+                self._idle_event().clear()
+                jobs.append(job)
+        self._ensure_dispatcher()
+        logger.info(f"Queued {len(jobs)} {kind} jobs (batch_id {batch_id})")
+        return batch_id, jobs
+
+
+    # 저장소에 남아 있는 대기 작업을 다시 큐에 넣음 (서버 시작 시, 반환값: 넣은 작업 수)
+    async def recover(self, kind: str) -> int:
+        jobs = await self.store.alist_queued(kind)
+        for job in jobs:
+            self._queue().put_nowait(job.job_id)
+            self._unfinished += 1
+            self._idle_event().clear()
+        if jobs:
+            self._ensure_dispatcher()
+            logger.info(f"Recovered {len(jobs)} queued {kind} jobs")
+        return len(jobs)
+
+
+    # 상태 변경 구독 (batch_id의 작업이 바뀔 때마다 Job이 들어옴)
+    def subscribe(self, batch_id: str) -> asyncio.Queue:
+        updates: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(batch_id, set()).add(updates)
+        return updates
+
+
+    def unsubscribe(self, batch_id: str, updates: asyncio.Queue):
+        subscribers = self._subscribers.get(batch_id)
+        if subscribers is not None:
+            subscribers.discard(updates)
+            if not subscribers:
+                del self._subscribers[batch_id]
+
+
+    # 처리 중인 작업을 모두 기다림 (테스트 / 종료 시)
+    async def join(self):
+        await self._idle_event().wait()
+
+
+    # 서버 종료 시 정리 (실행 중이던 작업은 queued로 되돌려 다음 시작 시 recover로 다시 실행)
+    async def close(self):
+        tasks = [task for task in (self._dispatcher, *self._running) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._dispatcher = None
+
+
+    # 🛠️ 공통 헬퍼 메서드
+    def _queue(self) -> asyncio.Queue:
+        if self._pending is None:
+            self._pending = asyncio.Queue()
+        return self._pending
+
+
+    def _slot_semaphore(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        return self._slots
+
+
+    def _idle_event(self) -> asyncio.Event:
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            self._idle.set()
+        return self._idle
+
+
+    def _finish(self):
+        self._unfinished -= 1
+        if self._unfinished <= 0:
+            self._idle_event().set()
+
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or self._dispatcher.done():
+            # 처음 작업을 등록한 요청의 컨텍스트(추적 span, OpenAI 우선순위)를 물려받지 않음
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch(), context=contextvars.Context())
+
+
+    async def _dispatch(self):
+        queue = self._queue()
+        while True:
+            # 처리할 자리가 생긴 뒤 대기 중인 작업을 batch_size개까지 꺼냄
+            await self._slot_semaphore().acquire()
+            job_ids = [await queue.get()]
+            while len(job_ids) < self.batch_size and not queue.empty():
+                job_ids.append(queue.get_nowait())
+            self._slot_semaphore().release()
+
+            jobs = [job for job in [await self.store.aget(job_id) for job_id in job_ids] if job is not None]
+            for _ in range(len(job_ids) - len(jobs)):
+                self._finish()
+            prepared: Dict[str, Any] = {}
+            if self.prepare is not None and jobs:
+                try:
+                    prepared = await self.prepare(jobs)
+                except Exception as e:
+                    logger.warning(f"Job batch preparation failed: {str(e)}")
+            for job in jobs:
+                await self._slot_semaphore().acquire()
+                task = asyncio.ensure_future(self._execute(job, prepared.get(job.job_id)))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+
+    async def _execute(self, job: Job, prepared: Any):
+        try:
+            # 다른 워커가 이미 가져간 작업 (저장소 공유 시 재시작 복구 중 등)
+            if not await self.store.aclaim(job.job_id):
+                logger.info(f"{job.kind} job {job.job_id} already claimed, skipping")
+                return
+            job.status, job.started_at = "running", time.time()
+            await self._update(job)
+            try:
+                with span(f"{job.kind}_job", job_id=job.job_id, canvas_id=job.canvas_id):
+                    job.result = await self.run(job, prepared)
+                job.status = "succeeded"
+            except asyncio.CancelledError:
+                job.status, job.started_at = "queued", None
+                await self.store.asave(job)
+                logger.info(f"{job.kind} job {job.job_id} interrupted, returned to queue")
+                raise
+            except Exception as e:
+                logger.error(f"{job.kind} job {job.job_id} failed for canvas_id {job.canvas_id}: {str(e)}")
+                job.status, job.error = "failed", str(e)
+            job.finished_at = time.time()
+            await self._update(job)
+        finally:
+            self._slot_semaphore().release()
+            self._finish()
+
+
+    async def _update(self, job: Job):
+        await self.store.asave(job)
+        # 알림 시점의 상태를 전달 (메모리 저장소의 Job은 이후에도 바뀜)
+        batch_ids = {job.batch_id, *self._extra_batches.get(job.job_id, ())}
+        if job.finished:
+            self._extra_batches.pop(job.job_id, None)
+        for batch_id in batch_ids:
+            for updates in self._subscribers.get(batch_id, ()):
+                updates.put_nowait(job.model_copy())
@@ -0,0 +1,199 @@
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import threading
+
+# Prometheus 텍스트 형식 지표 (외부 라이브러리 없이 프로세스 내부에서 집계)
+# - 워커 프로세스별로 집계되므로 여러 워커 실행 시 각 워커를 따로 수집
+
+# 지연 시간 히스토그램 기본 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _collect(callback) -> Dict[Tuple[str, ...], float]:
+    """수집 callback 실행 (실패해도 다른 지표 출력은 계속)"""
+    if callback is None:
+        return {}
+    try:
+        return {tuple(str(part) for part in key): float(value) for key, value in callback().items()}
+    except Exception:
+        return {}
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+# 누적 카운터 (callback이 있으면 수집 시점에 다른 객체의 누적 값을 읽음)
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 callback: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self.callback = callback
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        values.update(_collect(self.callback))
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+# 현재 값 (수집 시점에 callback으로 읽음)
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 callback: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self.callback = callback
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        values.update(_collect(self.callback))
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+# 구간별 분포
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # 라벨 값 -> (구간별 개수, 합계)
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            counts[bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels) -> int:
+        counts, _ = self._values.get(self._key(labels)) or ([], 0.0)
+        return sum(counts)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+# 지표 모음
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# ⏱️ 단계별 소요 시간
+# stage: vad, stt, chat, tts, vision, dalle, s3_fetch, ws_send, queue_wait, turn, feedback_push
+STAGE_SECONDS: Histogram = registry.register(Histogram(
+    "mic_stage_duration_seconds", "Duration of each pipeline stage in seconds", ("stage",)
+))
+
+# 🔌 OpenAI 요청
+OPENAI_REQUESTS: Counter = registry.register(Counter(
+    "mic_openai_requests_total", "OpenAI requests by model and outcome", ("model", "stage", "outcome")
+))
+OPENAI_TOKENS: Counter = registry.register(Counter(
+    "mic_openai_tokens_total", "OpenAI tokens reported in usage", ("model", "type")
+))
+UPSTREAM_BYTES: Counter = registry.register(Counter(
+    "mic_upstream_bytes_total", "Bytes sent to / received from upstream services", ("service", "direction")
+))
+
+
+# 🎙️ 음성 전처리 (outcome: speech, no_speech, passthrough / kind: input, uploaded)
+VOICE_CLIPS: Counter = registry.register(Counter(
+    "mic_voice_clips_total", "Voice clips by preprocessing outcome", ("outcome",)
+))
+STT_AUDIO_SECONDS: Counter = registry.register(Counter(
+    "mic_stt_audio_seconds_total", "Seconds of voice audio received and uploaded to STT", ("kind",)
+))
+
+# 🗣️ 취소된 음성 턴 (reason: barge_in, cancel, disconnect)
+VOICE_TURNS_CANCELLED: Counter = registry.register(Counter(
+    "mic_voice_turns_cancelled_total", "Voice turns cancelled before completion", ("reason",)
+))
+
+def observe_stage(stage: str, seconds: float):
+    """단계 소요 시간 기록"""
+    STAGE_SECONDS.observe(seconds, stage=stage)
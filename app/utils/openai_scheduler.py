@@ -0,0 +1,422 @@
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+from app.config import OPENAI_CONCURRENCY, OPENAI_DEFAULT_CONCURRENCY, OPENAI_IMAGE_TOKENS, OPENAI_RPM, OPENAI_TPM
+from app.utils.call_policy import CallPolicyRunner, CircuitOpenError, current_operation
+from app.utils.metrics import OPENAI_REQUESTS, OPENAI_TOKENS, UPSTREAM_BYTES, observe_stage
+from app.utils.tracing import span
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+# 요청 우선순위 (값이 작을수록 먼저 처리)
+class Priority(IntEnum):
+    INTERACTIVE = 0  # 음성 대화 턴 (아이가 기다리는 중)
+    NORMAL = 1       # 그림 분석 / 제목 등
+    BACKGROUND = 2   # 배경 이미지 생성, TTS 미리 합성 등
+
+
+# 현재 작업의 우선순위 (미설정 시 모델 기본값)
+_priority: ContextVar[Optional[Priority]] = ContextVar("openai_priority", default=None)
+
+
+def set_openai_priority(priority: Priority):
+    """현재 작업(태스크)과 여기서 만든 하위 태스크의 OpenAI 요청 우선순위 설정"""
+    _priority.set(priority)
+
+
+@contextmanager
+def openai_priority(priority: Priority):
+    """블록 안에서 보내는 OpenAI 요청의 우선순위 지정"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority(model: str) -> Priority:
+    priority = _priority.get()
+    if priority is not None:
+        return priority
+    # DALL-E는 느리고 아이가 바로 기다리지 않으므로 기본적으로 뒤로
+    return Priority.BACKGROUND if model.startswith("dall-e") else Priority.NORMAL
+
+
+# 토큰 버킷 (분당 허용량을 초당 속도로 채움)
+class TokenBucket:
+
+    def __init__(self, per_minute: float, burst_seconds: float = 10.0):
+        self.rate = per_minute / 60.0
+        # 한 번에 몰아서 쓸 수 있는 최대량 (burst_seconds 동안 채워지는 양)
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+
+    async def acquire(self, amount: float = 1.0):
+        amount = min(amount, self.capacity)
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+# 모델별 요청 통로 (동시 요청 수 제한 + 우선순위 대기열 + 속도 제한)
+class _ModelLane:
+
+    def __init__(self, model: str, limit: int, rpm: Optional[float], tpm: Optional[float]):
+        self.model = model
+        self.limit = limit
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.inflight = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        # 지표
+        self.queue_depth = 0
+        self.completed = 0
+        self.wait_ms: Deque[float] = deque(maxlen=1000)
+        self.wait_ms_by_priority: Dict[str, Deque[float]] = {
+            priority.name.lower(): deque(maxlen=1000) for priority in Priority
+        }
+
+
+    async def acquire(self, priority: Priority):
+        if self.inflight < self.limit and not self.queue_depth:
+            self.inflight += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), future))
+        self.queue_depth += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 자리를 넘겨받은 직후 취소됨 → 다음 대기자에게 양보
+                self.release()
+            else:
+                self.queue_depth -= 1
+            raise
+
+
+    def release(self):
+        """자리를 우선순위가 가장 높은 대기자에게 넘기거나 반납"""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.queue_depth -= 1
+                future.set_result(None)
+                return
+        self.inflight -= 1
+
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "inflight": self.inflight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "wait_ms_p50": _percentile(self.wait_ms, 0.5),
+            "wait_ms_p95": _percentile(self.wait_ms, 0.95),
+            "wait_ms_max": round(max(self.wait_ms), 1) if self.wait_ms else 0.0,
+            "wait_ms_p95_by_priority": {
+                name: _percentile(values, 0.95) for name, values in self.wait_ms_by_priority.items() if values
+            },
+        }
+
+
+def _percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 1)
+
+
+# OpenAI 요청 스케줄러
+# - 모델별 동시 요청 수 제한, 자리가 없으면 우선순위 순서로 대기
+# - 모델별 분당 요청 수 / 토큰 수(RPM / TPM) 토큰 버킷
+# - 대기열 길이, 대기 시간 지표 제공
+class OpenAIScheduler:
+
+    def __init__(self, concurrency: Optional[Dict[str, float]] = None, default_concurrency: int = 16,
+                 rpm: Optional[Dict[str, float]] = None, tpm: Optional[Dict[str, float]] = None):
+        self.concurrency = concurrency or {}
+        self.default_concurrency = default_concurrency
+        self.rpm = rpm or {}
+        self.tpm = tpm or {}
+        self._lanes: Dict[str, _ModelLane] = {}
+
+
+    def lane(self, model: str) -> _ModelLane:
+        if model not in self._lanes:
+            self._lanes[model] = _ModelLane(
+                model,
+                int(self.concurrency.get(model, self.default_concurrency)),
+                self.rpm.get(model),
+                self.tpm.get(model),
+            )
+        return self._lanes[model]
+
+
+    # 요청 자리 확보 (반드시 release 호출)
+    async def acquire(self, model: str, priority: Optional[Priority] = None, tokens: int = 0) -> _ModelLane:
+        priority = current_priority(model) if priority is None else priority
+        lane = self.lane(model)
+        started = time.perf_counter()
+        await lane.acquire(priority)
+        try:
+            # 우선순위 순서로 자리를 얻은 요청만 속도 제한을 기다림
+            if lane.requests:
+                await lane.requests.acquire(1)
+            if lane.tokens and tokens:
+                await lane.tokens.acquire(tokens)
+        except BaseException:
+            lane.release()
+            raise
+        wait_ms = (time.perf_counter() - started) * 1000
+        observe_stage("queue_wait", wait_ms / 1000)
+        lane.wait_ms.append(wait_ms)
+        lane.wait_ms_by_priority[priority.name.lower()].append(wait_ms)
+        if wait_ms > 1000:
+            logger.warning(f"OpenAI {model} request ({priority.name}) waited {wait_ms:.0f}ms for a slot")
+        return lane
+
+
+    def release(self, lane: _ModelLane):
+        lane.completed += 1
+        lane.release()
+
+
+    @asynccontextmanager
+    async def slot(self, model: str, priority: Optional[Priority] = None, tokens: int = 0):
+        lane = await self.acquire(model, priority, tokens)
+        try:
+            yield
+        finally:
+            self.release(lane)
+
+
+    # 모델별 지표
+    def stats(self) -> Dict[str, dict]:
+        return {model: lane.stats() for model, lane in self._lanes.items()}
+
+
+# 이미지 입력 파트 종류 (텍스트 안에 넣은 data URL은 이미지가 아니라 텍스트로 과금됨)
+_IMAGE_PARTS = ("image_url", "input_image", "image")
+
+
+def estimate_tokens(kwargs: dict) -> int:
+    """채팅 요청의 대략적인 토큰 수 (입력 글자 수 / 2 + 이미지 파트당 고정값 + 최대 출력 토큰)"""
+    chars, images = 0, 0
+    for message in kwargs.get("messages") or []:
+        content = message.get("content") if isinstance(message, dict) else None
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            for part in content:
+                if not isinstance(part, dict):
+                    continue
+                if part.get("type") in _IMAGE_PARTS:
+                    images += 1
+                else:
+                    chars += len(str(part.get("text", "")))
+    return chars // 2 + images * OPENAI_IMAGE_TOKENS + int(kwargs.get("max_tokens") or 256)
+
+
+# 스트리밍 응답은 끝까지 읽거나 닫을 때 자리를 반납
+class _ScheduledStream:
+
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        finally:
+            # 끝까지 읽지 않고 취소된 경우 (바지인 등) 응답도 닫아 연결을 반납
+            try:
+                await asyncio.shield(self._stream.close())
+            finally:
+                self._release()
+
+    async def close(self):
+        try:
+            await self._stream.close()
+        finally:
+            self._release()
+
+    def __getattr__(self, name: str):
+        return getattr(self._stream, name)
+
+
+# OpenAI 클라이언트 메서드를 호출 정책(제한 시간 / 재시도 / 헤징 / 회로 차단기)과
+# 스케줄러를 거쳐 호출하는 래퍼 (재시도 / 헤징 요청도 각각 스케줄러 자리를 얻음)
+class _ScheduledCall:
+
+    def __init__(self, scheduler: OpenAIScheduler, create, default_model: str, operation: str,
+                 policy_runner: Optional[CallPolicyRunner] = None, count_tokens: bool = False):
+        self._scheduler = scheduler
+        self._create = create
+        self._default_model = default_model
+        self._operation = operation
+        self._policy_runner = policy_runner
+        self._count_tokens = count_tokens
+
+    async def __call__(self, *args, **kwargs):
+        model = kwargs.get("model", self._default_model)
+        stage = _stage(self._operation, kwargs)
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with span(stage, model=model):
+                result = await self._call(args, kwargs)
+            outcome = "success"
+            _record_usage(model, stage, kwargs, result)
+            return result
+        except CircuitOpenError:
+            outcome = "circuit_open"
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            observe_stage(stage, time.perf_counter() - started)
+            OPENAI_REQUESTS.inc(model=model, stage=stage, outcome=outcome)
+
+    async def _call(self, args: tuple, kwargs: dict):
+        if self._policy_runner is None:
+            return await self._send(await self._admit(kwargs), args, kwargs)
+        # 스케줄러 자리를 기다린 시간은 시도 제한 시간 / 회로 차단기 실패에 넣지 않음
+        return await self._policy_runner.call(
+            current_operation(self._operation),
+            kwargs.get("model", self._default_model),
+            lambda release: self._send(release, args, kwargs),
+            # 스트리밍 응답은 중복 요청하지 않음
+            hedge=not kwargs.get("stream"),
+            admit=lambda: self._admit(kwargs),
+        )
+
+    async def _admit(self, kwargs: dict) -> Callable[[], None]:
+        """스케줄러 자리 확보 후 반납 함수 반환 (여러 번 호출해도 한 번만 반납)"""
+        model = kwargs.get("model", self._default_model)
+        tokens = estimate_tokens(kwargs) if self._count_tokens else 0
+        lane = await self._scheduler.acquire(model, tokens=tokens)
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self._scheduler.release(lane)
+
+        return release
+
+    async def _send(self, release: Callable[[], None], args: tuple, kwargs: dict):
+        try:
+            result = await self._create(*args, **kwargs)
+        except BaseException:
+            release()
+            raise
+        if kwargs.get("stream"):
+            return _ScheduledStream(result, release)
+        release()
+        return result
+
+
+# 요청 종류 → 지표 단계 이름
+_STAGES = {"chat": "chat", "tts": "tts", "transcription": "stt", "image": "dalle"}
+
+
+def _has_image(message: dict) -> bool:
+    content = message.get("content")
+    if isinstance(content, list):
+        return any(isinstance(part, dict) and part.get("type") in _IMAGE_PARTS for part in content)
+    return "data:image" in str(content or "")
+
+
+def _stage(operation: str, kwargs: dict) -> str:
+    if operation == "chat" and any(
+        _has_image(message) for message in kwargs.get("messages") or [] if isinstance(message, dict)
+    ):
+        return "vision"
+    return _STAGES.get(operation, operation)
+
+
+def _record_usage(model: str, stage: str, kwargs: dict, result):
+    """토큰 사용량 / 주고받은 바이트 수 기록"""
+    usage = getattr(result, "usage", None)
+    if usage is not None:
+        for kind in ("prompt_tokens", "completion_tokens"):
+            value = getattr(usage, kind, None)
+            if isinstance(value, int):
+                OPENAI_TOKENS.inc(value, model=model, type=kind.split("_")[0])
+
+    if stage == "tts":
+        UPSTREAM_BYTES.inc(len(kwargs.get("input", "").encode("utf-8")), service="openai", direction="sent")
+        content = getattr(result, "content", None)
+        if isinstance(content, (bytes, bytearray)):
+            UPSTREAM_BYTES.inc(len(content), service="openai", direction="received")
+    elif stage == "stt":
+        audio_file = kwargs.get("file")
+        if hasattr(audio_file, "getbuffer"):
+            UPSTREAM_BYTES.inc(audio_file.getbuffer().nbytes, service="openai", direction="sent")
+    elif kwargs.get("messages"):
+        sent = sum(len(str(message.get("content", ""))) for message in kwargs["messages"] if isinstance(message, dict))
+        UPSTREAM_BYTES.inc(sent, service="openai", direction="sent")
+
+
+class _Namespace:
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+# 스케줄러가 적용된 AsyncOpenAI 래퍼
+# - chat.completions.create / audio.speech.create / audio.transcriptions.create / images.generate
+# - 그 외 속성은 원래 클라이언트로 전달
+class ScheduledOpenAI:
+
+    def __init__(self, client, scheduler: OpenAIScheduler, policy_runner: Optional[CallPolicyRunner] = None):
+        self._client = client
+        self.scheduler = scheduler
+        self.policy_runner = policy_runner
+
+        def scheduled(create, model: str, operation: str, count_tokens: bool = False) -> _ScheduledCall:
+            return _ScheduledCall(scheduler, create, model, operation, policy_runner, count_tokens)
+
+        self.chat = _Namespace(completions=_Namespace(
+            create=scheduled(client.chat.completions.create, "gpt-3.5-turbo", "chat", count_tokens=True)
+        ))
+        self.audio = _Namespace(
+            speech=_Namespace(create=scheduled(client.audio.speech.create, "tts-1", "tts")),
+            transcriptions=_Namespace(create=scheduled(client.audio.transcriptions.create, "whisper-1", "transcription")),
+        )
+        self.images = _Namespace(generate=scheduled(client.images.generate, "dall-e-2", "image"))
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+
+_openai_scheduler: Optional[OpenAIScheduler] = None
+
+
+def get_openai_scheduler() -> OpenAIScheduler:
+    """공유 OpenAI 요청 스케줄러를 반환"""
+    global _openai_scheduler
+    if _openai_scheduler is None:
+        _openai_scheduler = OpenAIScheduler(OPENAI_CONCURRENCY, OPENAI_DEFAULT_CONCURRENCY, OPENAI_RPM, OPENAI_TPM)
+    return _openai_scheduler
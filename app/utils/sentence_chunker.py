@@ -0,0 +1,35 @@
+import re
+from typing import List, Optional
+
+# 문장 끝 (마침표/느낌표/물음표/말줄임표/물결 뒤에 공백)
+_SENTENCE_END = re.compile(r"[.!?…~。]+\s+")
+
+
+# 스트리밍 토큰을 문장 단위로 잘라주는 클래스
+class SentenceChunker:
+
+    def __init__(self, min_chars: int = 8):
+        # 너무 짧은 문장("와!")은 다음 문장과 합쳐 TTS 호출 수를 줄임
+        self.min_chars = min_chars
+        self._buffer = ""
+
+
+    # 토큰 추가 후 완성된 문장 반환
+    def feed(self, text: str) -> List[str]:
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            sentence = self._buffer[start:match.end()].strip()
+            if len(sentence) >= self.min_chars:
+                sentences.append(sentence)
+                start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+
+    # 남은 텍스트 반환 (스트림 종료 시)
+    def flush(self) -> Optional[str]:
+        sentence = self._buffer.strip()
+        self._buffer = ""
+        return sentence or None
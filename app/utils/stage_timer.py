@@ -0,0 +1,55 @@
+import time
+from app.utils.tracing import span
+from typing import Awaitable, Dict, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+# 파이프라인 단계별 소요 시간 측정기
+class StageTimer:
+
+    def __init__(self):
+        # 파이프라인 시작 시각
+        self.started = time.perf_counter()
+        # 단계 이름 -> (시작, 종료) 시각 (파이프라인 시작 기준 초)
+        self.stages: Dict[str, Tuple[float, float]] = {}
+
+
+    # 단계 실행 및 시간 기록
+    async def run(self, stage: str, awaitable: Awaitable[T]) -> T:
+        start = time.perf_counter() - self.started
+        try:
+            with span(stage):
+                return await awaitable
+        finally:
+            self.stages[stage] = (start, time.perf_counter() - self.started)
+
+
+    # 임계 경로 계산
+    def critical_path(self, dependencies: Dict[str, List[str]]) -> List[str]:
+        """가장 늦게 끝난 단계에서 시작해, 가장 늦게 끝난 선행 단계를 거슬러 올라감"""
+        if not self.stages:
+            return []
+        stage = max(self.stages, key=lambda name: self.stages[name][1])
+        path = [stage]
+        while True:
+            parents = [dep for dep in dependencies.get(stage, []) if dep in self.stages]
+            if not parents:
+                break
+            stage = max(parents, key=lambda name: self.stages[name][1])
+            path.append(stage)
+        return list(reversed(path))
+
+
+    # 단계별 결과 (ms)
+    def report(self, dependencies: Dict[str, List[str]] = None) -> Dict[str, dict]:
+        critical = set(self.critical_path(dependencies or {}))
+        return {
+            stage: {
+                "start_ms": round(start * 1000, 1),
+                "end_ms": round(end * 1000, 1),
+                "duration_ms": round((end - start) * 1000, 1),
+                "critical": stage in critical,
+            }
+            for stage, (start, end) in sorted(self.stages.items(), key=lambda item: item[1][0])
+        }
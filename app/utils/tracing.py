@@ -0,0 +1,216 @@
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+from app.config import TRACE_EXPORTERS, TRACE_FILE, TRACE_SLOW_MS
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 하위 span으로 그대로 전달되는 속성
+INHERITED_ATTRIBUTES = ("canvas_id", "robot_id")
+
+
+# 추적 구간 (음성 턴, 모델 호출, WebSocket 전송 등)
+class Span:
+
+    def __init__(self, name: str, trace_id: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+        # 느린 요청 분석용 하위 span (최상위 span이 끝나면 함께 해제됨)
+        self.children: List["Span"] = []
+
+
+    def set(self, **attributes):
+        """span 속성 추가 (canvas_id / robot_id는 이후 하위 span에도 전달)"""
+        self.attributes.update({key: value for key, value in attributes.items() if value is not None})
+
+
+    def finish(self):
+        self.duration_ms = round((time.perf_counter() - self._started) * 1000, 2)
+
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+# 프로세스 내부 exporter (최근 span 보관)
+class InMemoryExporter:
+
+    def __init__(self, max_spans: int = 5000):
+        self.spans: Deque[dict] = deque(maxlen=max_spans)
+
+    def export(self, span: Span):
+        self.spans.append(span.to_dict())
+
+    def trace(self, trace_id: str) -> List[dict]:
+        return [span for span in self.spans if span["trace_id"] == trace_id]
+
+
+# JSON-lines 파일 exporter (span 하나당 한 줄)
+# - 이벤트 루프에서는 큐에 넣기만 하고, 직렬화 / 파일 쓰기는 전용 스레드에서 처리
+class JsonLinesExporter:
+
+    def __init__(self, path: str):
+        self.path = path
+        self._queue: "queue.SimpleQueue[Optional[dict]]" = queue.SimpleQueue()
+        self._file = open(path, "a", encoding="utf-8")
+        self._writer = threading.Thread(target=self._write_loop, name="trace-jsonl-writer", daemon=True)
+        self._writer.start()
+
+    def export(self, span: Span):
+        if self._writer.is_alive():
+            self._queue.put(span.to_dict())
+
+    def close(self):
+        """남은 span을 모두 기록한 뒤 파일을 닫음"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _write_loop(self):
+        try:
+            while (record := self._queue.get()) is not None:
+                self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                # 잠시 쌓인 span은 한 번에 기록한 뒤 flush
+                if self._queue.empty():
+                    self._file.flush()
+        finally:
+            self._file.close()
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+# 추적기
+class Tracer:
+
+    def __init__(self, exporters: Optional[List[Any]] = None, slow_ms: float = 3000):
+        self.exporters = exporters or []
+        self.slow_ms = slow_ms
+
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """현재 span의 하위 span 생성 (없으면 새 trace 시작)"""
+        parent = _current_span.get()
+        inherited = {key: parent.attributes[key] for key in INHERITED_ATTRIBUTES if parent and key in parent.attributes}
+        span = Span(
+            name,
+            parent.trace_id if parent else os.urandom(16).hex(),
+            parent,
+            {**inherited, **{key: value for key, value in attributes.items() if value is not None}},
+        )
+        if parent is not None:
+            parent.children.append(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except asyncio.CancelledError:
+            # 음성 턴 끼어들기 등으로 취소됨 (오류 아님)
+            span.status = "cancelled"
+            raise
+        except BaseException as e:
+            span.status = "error"
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.finish()
+            self._export(span)
+            if parent is None and span.duration_ms >= self.slow_ms:
+                self._log_slow(span)
+
+
+    def _export(self, span: Span):
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning(f"Span export failed ({type(exporter).__name__}): {str(e)}")
+
+
+    def _log_slow(self, root: Span):
+        """느린 최상위 span의 하위 단계별 소요 시간 기록"""
+        lines = []
+
+        def walk(span: Span, depth: int):
+            for child in span.children:
+                duration = f"{child.duration_ms:.0f}ms" if child.duration_ms is not None else "running"
+                lines.append(f"{'  ' * depth}{child.name} {duration} ({child.status})")
+                walk(child, depth + 1)
+
+        walk(root, 1)
+        logger.warning(
+            f"Slow {root.name} {root.duration_ms:.0f}ms trace_id={root.trace_id} "
+            f"attributes={root.attributes}\n" + "\n".join(lines)
+        )
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def annotate(**attributes):
+    """현재 span에 속성 추가 (이후 만드는 하위 span에 canvas_id / robot_id 전달)"""
+    span = _current_span.get()
+    if span is not None:
+        span.set(**attributes)
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """공유 추적기를 반환 (TRACE_EXPORTERS 설정에 따라 exporter 구성)"""
+    global _tracer
+    if _tracer is None:
+        exporters = []
+        if "memory" in TRACE_EXPORTERS:
+            exporters.append(InMemoryExporter())
+        if "jsonl" in TRACE_EXPORTERS:
+            exporters.append(JsonLinesExporter(TRACE_FILE))
+        _tracer = Tracer(exporters, TRACE_SLOW_MS)
+    return _tracer
+
+
+def close_tracer():
+    """exporter 정리 (서버 종료 시, 파일에 남은 span 기록)"""
+    global _tracer
+    if _tracer is None:
+        return
+    for exporter in _tracer.exporters:
+        close = getattr(exporter, "close", None)
+        if close is not None:
+            close()
+    _tracer = None
+
+
+def span(name: str, **attributes):
+    """공유 추적기로 span 생성 (with span("stt", model="whisper-1"): ...)"""
+    return get_tracer().span(name, **attributes)
@@ -0,0 +1,207 @@
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+from app.config import TTS_CACHE_MEMORY_BYTES, TTS_CACHE_DIR, TTS_CACHE_DISK_BYTES
+import asyncio
+import hashlib
+import json
+import logging
+import os
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+# 내용 주소 기반 TTS 음성 캐시
+# - 키: (model, voice, speed, text)의 SHA-256 해시
+# - 메모리 계층 → 디스크 계층 → 합성 순서로 조회
+# - 각 계층은 최대 크기(바이트)를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+# - 같은 키를 동시에 요청하면 합성은 한 번만 수행
+class TTSCache:
+
+    def __init__(self, memory_bytes: int = 64 * 1024 * 1024, disk_dir: Optional[str] = None,
+                 disk_bytes: int = 1024 * 1024 * 1024):
+        self.memory_bytes = memory_bytes
+        self.disk_dir = disk_dir
+        self.disk_bytes = disk_bytes
+        # 메모리 계층: key -> 음성 데이터
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_size = 0
+        # 디스크 계층 인덱스: key -> 파일 크기
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_size = 0
+        # 합성 중인 키
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # 지표
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        if disk_dir:
+            self._load_disk_index()
+
+
+    # 캐시 키 생성
+    @staticmethod
+    def make_key(model: str, voice: str, speed: float, text: str) -> str:
+        payload = json.dumps([model, voice, float(speed), text], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+    # 캐시 조회, 없으면 합성 후 저장
+    async def get_or_create(self, model: str, voice: str, speed: float, text: str,
+                            synthesize: Callable[[], Awaitable[bytes]]) -> bytes:
+        key = self.make_key(model, voice, speed, text)
+
+        audio = self._memory_get(key)
+        if audio is not None:
+            self.memory_hits += 1
+            return audio
+
+        if key in self._inflight:
+            self.coalesced += 1
+            inflight = self._inflight[key]
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # 먼저 합성하던 요청만 취소된 경우 (음성 턴 끼어들기) 이 요청이 다시 합성
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                return await self.get_or_create(model, voice, speed, text, synthesize)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            audio = await self._disk_get(key)
+            if audio is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                audio = await synthesize()
+                await self._disk_put(key, audio)
+            self._memory_put(key, audio)
+            future.set_result(audio)
+            return audio
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 대기자가 없으면 예외 미조회 경고 방지
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+
+    # 지표 조회
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits + self.coalesced
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_size,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_size,
+        }
+
+
+    # 🧠 메모리 계층
+    def _memory_get(self, key: str) -> Optional[bytes]:
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+        return audio
+
+
+    def _memory_put(self, key: str, audio: bytes):
+        if len(audio) > self.memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_size -= len(self._memory.pop(key))
+        self._memory[key] = audio
+        self._memory_size += len(audio)
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+            self.evictions += 1
+
+
+    # 💾 디스크 계층
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.mp3")
+
+
+    def _load_disk_index(self):
+        """기존 캐시 파일을 마지막 사용 시각 순으로 인덱싱"""
+        os.makedirs(self.disk_dir, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if name.endswith(".mp3"):
+                stat = os.stat(os.path.join(self.disk_dir, name))
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_size += size
+        logger.info(f"TTS disk cache loaded: {len(self._disk)} entries, {self._disk_size} bytes")
+
+
+    async def _disk_get(self, key: str) -> Optional[bytes]:
+        if not self.disk_dir or key not in self._disk:
+            return None
+        self._disk.move_to_end(key)
+        try:
+            return await asyncio.to_thread(self._read_file, self._path(key))
+        except OSError:
+            self._disk_size -= self._disk.pop(key, 0)
+            return None
+
+
+    async def _disk_put(self, key: str, audio: bytes):
+        if not self.disk_dir or len(audio) > self.disk_bytes:
+            return
+        await asyncio.to_thread(self._write_file, self._path(key), audio)
+        self._disk_size += len(audio) - self._disk.pop(key, 0)
+        self._disk[key] = len(audio)
+        while self._disk_size > self.disk_bytes:
+            evicted, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(evicted))
+            except OSError:
+                pass
+
+
+    @staticmethod
+    def _read_file(path: str) -> bytes:
+        with open(path, "rb") as audio_file:
+            audio = audio_file.read()
+        # 마지막 사용 시각 갱신 (재시작 시 LRU 순서 복원용)
+        os.utime(path)
+        return audio
+
+
+    @staticmethod
+    def _write_file(path: str, audio: bytes):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as audio_file:
+            audio_file.write(audio)
+        os.replace(temp_path, path)
+
+
+_tts_cache: Optional[TTSCache] = None
+
+
+def get_tts_cache() -> TTSCache:
+    """공유 TTS 캐시를 반환"""
+    global _tts_cache
+    if _tts_cache is None:
+        _tts_cache = TTSCache(TTS_CACHE_MEMORY_BYTES, TTS_CACHE_DIR or None, TTS_CACHE_DISK_BYTES)
+    return _tts_cache
@@ -0,0 +1,105 @@
+from io import BytesIO
+from typing import NamedTuple, Optional, Tuple
+import numpy as np
+import wave
+
+# 에너지 계산 프레임 길이 (ms)
+FRAME_MS = 20
+# 잡음 바닥 위로 이만큼(dB) 커야 발화로 봄
+NOISE_MARGIN_DB = 10.0
+# 발화 기준을 낮추더라도 잡음 바닥 위로 최소 이만큼(dB)은 커야 발화로 봄 (일정한 잡음 제외)
+MIN_RISE_DB = 6.0
+
+
+class SpeechClip(NamedTuple):
+    audio: Optional[bytes]    # Whisper로 보낼 음성 (None이면 발화 없음)
+    outcome: str              # "speech" | "no_speech" | "passthrough" (WAV가 아니어서 그대로 전송)
+    input_seconds: float = 0.0
+    output_seconds: float = 0.0
+
+
+def decode_wav(data: bytes) -> Optional[Tuple[np.ndarray, int]]:
+    """PCM WAV를 모노 float32 샘플(-1~1)과 샘플링 레이트로 변환 (WAV가 아니거나 지원하지 않는 형식이면 None)"""
+    try:
+        with wave.open(BytesIO(data)) as wav:
+            channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    if width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        return None
+    # 채널 평균으로 모노 변환
+    samples = samples[: len(samples) - len(samples) % channels]
+    return samples.reshape(-1, channels).mean(axis=1), rate
+
+
+def encode_wav(samples: np.ndarray, rate: int) -> bytes:
+    """모노 float32 샘플을 16-bit PCM WAV로 변환"""
+    buffer = BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes((np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def speech_bounds(samples: np.ndarray, rate: int, energy_db: float = -45.0,
+                  min_speech_ms: float = 200.0) -> Optional[Tuple[int, int]]:
+    """발화 구간 (시작, 끝) 샘플 위치, 발화가 min_speech_ms보다 짧으면 None
+
+    프레임 에너지가 energy_db와 잡음 바닥 + NOISE_MARGIN_DB 중 큰 값을 넘으면 발화 프레임
+    (처음부터 끝까지 말한 음성은 잡음 바닥이 높게 잡히므로 최대 에너지 - NOISE_MARGIN_DB로 제한하되,
+    에너지가 거의 일정한 잡음이 발화로 잡히지 않도록 잡음 바닥 + MIN_RISE_DB 아래로는 내리지 않음)
+    """
+    frame = max(1, rate * FRAME_MS // 1000)
+    count = len(samples) // frame
+    if count == 0:
+        return None
+    frames = samples[: count * frame].reshape(count, frame)
+    level = 20 * np.log10(np.sqrt(np.mean(frames ** 2, axis=1)) + 1e-10)
+    floor = np.percentile(level, 10)
+    noise_floor = max(min(floor + NOISE_MARGIN_DB, level.max() - NOISE_MARGIN_DB), floor + MIN_RISE_DB)
+    voiced = np.flatnonzero(level > max(energy_db, noise_floor))
+    if len(voiced) * FRAME_MS < min_speech_ms:
+        return None
+    return int(voiced[0]) * frame, (int(voiced[-1]) + 1) * frame
+
+
+def resample(samples: np.ndarray, rate: int, target_rate: int) -> np.ndarray:
+    """선형 보간으로 샘플링 레이트 변환 (낮출 때는 이동 평균으로 고주파를 먼저 줄임)"""
+    if rate == target_rate or len(samples) == 0:
+        return samples
+    if rate > target_rate:
+        width = rate // target_rate
+        if width > 1:
+            samples = np.convolve(samples, np.ones(width, dtype=np.float32) / width, mode="same")
+    length = max(1, round(len(samples) * target_rate / rate))
+    positions = np.linspace(0, len(samples) - 1, length)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def prepare_speech(data: bytes, target_rate: int = 16000, energy_db: float = -45.0,
+                   min_speech_ms: float = 200.0, padding_ms: float = 200.0) -> SpeechClip:
+    """STT 전송용 음성 준비: 앞뒤 무음 제거 → 모노 target_rate Hz 16-bit WAV
+
+    발화가 없으면 audio=None, WAV가 아니면 원본을 그대로 반환
+    """
+    decoded = decode_wav(data)
+    if decoded is None:
+        return SpeechClip(data, "passthrough")
+    samples, rate = decoded
+    input_seconds = len(samples) / rate if rate else 0.0
+    bounds = speech_bounds(samples, rate, energy_db, min_speech_ms) if rate else None
+    if bounds is None:
+        return SpeechClip(None, "no_speech", input_seconds)
+    padding = int(rate * padding_ms / 1000)
+    start, end = max(0, bounds[0] - padding), min(len(samples), bounds[1] + padding)
+    speech = resample(samples[start:end], rate, target_rate)
+    return SpeechClip(encode_wav(speech, target_rate), "speech", input_seconds, len(speech) / target_rate)
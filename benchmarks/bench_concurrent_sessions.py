@@ -0,0 +1,92 @@
+"""동시 세션 부하 벤치마크
+
+가짜 OpenAI 서버를 띄우고 N개의 로봇 세션이 동시에
+new → 음성 1턴 → done 을 수행할 때의 전체 소요 시간과
+이벤트 루프 정지 시간(loop lag)을 측정합니다.
+
+OpenAI 호출이 이벤트 루프를 막으면 총 소요 시간이 세션 수에 비례해 늘어나고,
+비동기 클라이언트라면 단일 세션 소요 시간과 비슷하게 유지됩니다.
+
+실행: python -m benchmarks.bench_concurrent_sessions --sessions 20
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.fake_openai import FakeLatency, create_fake_openai_app, isolated_env, run_fake_server
+
+
+async def _run_session(service, index: int, image_url: str):
+    from app.models.drawing import NewDrawingRequest, DoneDrawingRequest
+
+    canvas_id = f"bench-canvas-{index}"
+    await service.handle_new_drawing(NewDrawingRequest(
+        robot_id=f"bench-robot-{index}", name="아이", age=5, canvas_id=canvas_id
+    ))
+    await service.process_audio(b"RIFF fake wav", f"bench-robot-{index}", canvas_id)
+    await service.handle_done_drawing(DoneDrawingRequest(canvas_id=canvas_id, image_url=image_url))
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """이벤트 루프가 가장 길게 멈춘 시간 (초)"""
+    max_lag = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, time.perf_counter() - started - interval)
+    return max_lag
+
+
+async def _run(sessions: int, base_url: str):
+    from app.services.drawing_service.drawing_service_impl import DrawingServiceImpl
+    from app.utils.clients import close_clients
+
+    service = DrawingServiceImpl()
+    image_url = f"{base_url}/s3/drawing.png"
+
+    # 단일 세션 기준 시간
+    started = time.perf_counter()
+    await _run_session(service, -1, image_url)
+    single = time.perf_counter() - started
+
+    # N개 세션 동시 실행
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_loop_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(_run_session(service, i, image_url) for i in range(sessions)))
+    concurrent = time.perf_counter() - started
+    stop.set()
+    max_lag = await lag_task
+
+    await close_clients()
+    return single, concurrent, max_lag
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 세션 부하 벤치마크")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="chat/whisper/tts 지연 (초)")
+    parser.add_argument("--image-latency", type=float, default=1.0, help="DALL-E 지연 (초)")
+    args = parser.parse_args()
+
+    latency = FakeLatency(chat=args.latency, whisper=args.latency, tts=args.latency, images=args.image_latency)
+    app = create_fake_openai_app(latency)
+    with run_fake_server(app) as base_url, tempfile.TemporaryDirectory() as directory:
+        # 앱 모듈 로드 전에 가짜 서버를 바라보도록 설정
+        os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+        os.environ["OPENAI_BASE_URL"] = f"{base_url}/v1"
+        os.environ.update(isolated_env(directory))
+        single, concurrent, max_lag = asyncio.run(_run(args.sessions, base_url))
+
+    print(f"sessions              : {args.sessions}")
+    print(f"single session        : {single:.3f}s")
+    print(f"{args.sessions} concurrent sessions: {concurrent:.3f}s")
+    print(f"serialization ratio   : {concurrent / single:.2f}x (1.0 = fully concurrent, {args.sessions} = serialized)")
+    print(f"max event loop lag    : {max_lag * 1000:.1f}ms")
+    print(f"upstream calls        : {app.state.calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""OpenAI 연결 재사용 벤치마크
+
+로봇 여러 대가 음성 턴을 보내는 동안 가짜 OpenAI 서버가 받은 TCP 연결 수를 셉니다.
+(실제 API는 HTTPS이므로 새 TCP 연결마다 TLS 핸드셰이크가 한 번 더 일어납니다)
+
+- per-socket: 예전 방식처럼 WebSocket 연결(세션)마다 OpenAI 클라이언트를 새로 만들고 닫음
+- shared    : 서버 수명 동안 공유하는 클라이언트 레지스트리 (app/utils/clients.py)
+
+실행: python -m benchmarks.bench_connections --robots 50 --sessions 4 --turns 5
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.fake_openai import FakeLatency, create_fake_openai_app, isolated_env, run_fake_server
+
+
+async def _robot(index: int, mode: str, args):
+    from app.models.drawing import NewDrawingRequest
+    from app.services.drawing_service.drawing_service_impl import DrawingServiceImpl
+    from app.utils.clients import create_openai_client
+
+    for session in range(args.sessions):
+        service = DrawingServiceImpl()
+        if mode == "per-socket":
+            service.client = create_openai_client()
+        canvas_id = f"bench-conn-{mode}-{index}-{session}"
+        robot_id = f"bench-robot-{index}"
+        await service.handle_new_drawing(NewDrawingRequest(
+            robot_id=robot_id, name="아이", age=5, canvas_id=canvas_id
+        ))
+        for _ in range(args.turns):
+            await service.process_audio(b"RIFF fake wav", robot_id, canvas_id)
+        if mode == "per-socket":
+            await service.client.close()
+
+
+async def _run(mode: str, args) -> float:
+    from app.utils.clients import close_clients, open_clients
+
+    open_clients()
+    started = time.perf_counter()
+    await asyncio.gather(*(_robot(index, mode, args) for index in range(args.robots)))
+    elapsed = time.perf_counter() - started
+    await close_clients()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI 연결 재사용 벤치마크")
+    parser.add_argument("--robots", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=4, help="로봇당 세션(WebSocket 연결) 수")
+    parser.add_argument("--turns", type=int, default=5, help="세션당 음성 턴 수")
+    parser.add_argument("--latency", type=float, default=0.05, help="whisper/chat/tts 지연 (초)")
+    args = parser.parse_args()
+
+    latency = FakeLatency(chat=args.latency, whisper=args.latency, tts=args.latency)
+    app = create_fake_openai_app(latency)
+    turns = args.robots * args.sessions * args.turns
+    print(f"robots {args.robots} x sessions {args.sessions} x turns {args.turns} = {turns} turns")
+    with run_fake_server(app) as base_url, tempfile.TemporaryDirectory() as directory:
+        os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+        os.environ["OPENAI_BASE_URL"] = f"{base_url}/v1"
+        os.environ.update(isolated_env(directory))
+        for mode in ("per-socket", "shared"):
+            app.state.peers.clear()
+            requests_before = sum(app.state.calls.values())
+            elapsed = asyncio.run(_run(mode, args))
+            connections = len(app.state.peers)
+            requests = sum(app.state.calls.values()) - requests_before
+            print(f"{mode:<10} connections {connections:>5} "
+                  f"({connections * 1000 / turns:.0f} per 1000 turns, {requests / max(connections, 1):.1f} requests/connection) "
+                  f"in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
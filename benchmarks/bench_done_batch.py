@@ -0,0 +1,147 @@
+"""수업 종료 시 /drawing/done 몰림 벤치마크
+
+가짜 OpenAI / S3 서버와 실제 서버(uvicorn 별도 프로세스)를 띄우고 로봇 N대의 세션을 만든 뒤
+(/drawing/new → 음성 대화 턴), 모든 로봇이 동시에 그림을 완성하는 상황을 두 가지 방식으로 비교합니다.
+
+- direct: 로봇마다 /drawing/done 을 동시에 호출 (클라이언트 제한 시간 --timeout 초과 시 실패)
+- batch : /drawing/done/batch 한 번으로 작업 ID를 받고 WebSocket으로 완료 알림을 받음
+
+완료까지 걸린 시간(p50/p95), 전체 소요 시간, 제한 시간 초과 수, done 단계의 chat 호출 수를 출력합니다.
+
+실행: python -m benchmarks.bench_done_batch --robots 40 --timeout 10
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+import websockets
+
+from benchmarks.bench_robots import Recorder, _voice_turns, _wait_ready, percentile
+from benchmarks.fake_openai import FakeLatency, _free_port, create_fake_openai_app, isolated_env, run_fake_server
+
+
+async def _open_sessions(client: httpx.AsyncClient, base_url: str, mode: str, args) -> List[str]:
+    ws_base = base_url.replace("http://", "ws://")
+    audio = base64.b64encode(b"RIFF" + os.urandom(1000)).decode("utf-8")
+    recorder = Recorder()
+
+    async def _session(index: int) -> str:
+        robot_id, canvas_id = f"bench-robot-{index}", f"bench-{mode}-{index}"
+        response = await client.post(f"{base_url}/drawing/new", json={
+            "robot_id": robot_id, "name": "아이", "age": 5, "canvas_id": canvas_id
+        })
+        response.raise_for_status()
+        await _voice_turns(f"{ws_base}/ws/drawing/{robot_id}/{canvas_id}", args.turns, audio, recorder)
+        return canvas_id
+
+    return await asyncio.gather(*(_session(index) for index in range(args.robots)))
+
+
+async def _direct(client: httpx.AsyncClient, base_url: str, fake_url: str, canvas_ids: List[str], args) -> Dict:
+    latencies, timeouts = [], 0
+
+    async def _done(canvas_id: str):
+        nonlocal timeouts
+        started = time.perf_counter()
+        try:
+            response = await client.post(f"{base_url}/drawing/done", timeout=args.timeout, json={
+                "canvas_id": canvas_id, "image_url": f"{fake_url}/s3/{canvas_id}.png"
+            })
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+        except httpx.TimeoutException:
+            timeouts += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_done(canvas_id) for canvas_id in canvas_ids))
+    return {"latencies": latencies, "timeouts": timeouts, "failed": 0, "elapsed": time.perf_counter() - started}
+
+
+async def _batch(client: httpx.AsyncClient, base_url: str, fake_url: str, canvas_ids: List[str], args) -> Dict:
+    started = time.perf_counter()
+    response = await client.post(f"{base_url}/drawing/done/batch", json={"items": [
+        {"canvas_id": canvas_id, "image_url": f"{fake_url}/s3/{canvas_id}.png"} for canvas_id in canvas_ids
+    ]})
+    response.raise_for_status()
+    accepted = response.json()
+    accept_latency = time.perf_counter() - started
+
+    latencies, failed = {}, 0
+    async with websockets.connect(base_url.replace("http://", "ws://") + accepted["ws_url"]) as ws:
+        async for raw in ws:
+            message = json.loads(raw)
+            if message["type"] == "batch_done":
+                failed = message["counts"].get("failed", 0)
+                break
+            if message["status"] in ("succeeded", "failed") and message["job_id"] not in latencies:
+                latencies[message["job_id"]] = time.perf_counter() - started
+    return {"latencies": list(latencies.values()), "timeouts": 0, "failed": failed,
+            "elapsed": time.perf_counter() - started, "accept": accept_latency}
+
+
+async def _run(mode: str, base_url: str, fake_url: str, fake_app, args) -> Dict:
+    limits = httpx.Limits(max_connections=args.robots, max_keepalive_connections=args.robots)
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        canvas_ids = await _open_sessions(client, base_url, mode, args)
+        chat_before = fake_app.state.calls["chat"]
+        runner = _direct if mode == "direct" else _batch
+        result = await runner(client, base_url, fake_url, canvas_ids, args)
+        result["chat_calls"] = fake_app.state.calls["chat"] - chat_before
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수업 종료 시 /drawing/done 몰림 벤치마크")
+    parser.add_argument("--robots", type=int, default=40)
+    parser.add_argument("--turns", type=int, default=1, help="로봇당 음성 대화 턴 수")
+    parser.add_argument("--timeout", type=float, default=10.0, help="direct 모드 클라이언트 제한 시간 (초)")
+    parser.add_argument("--latency", type=float, default=0.3, help="chat/whisper/tts 지연 (초)")
+    parser.add_argument("--image-latency", type=float, default=1.5, help="DALL-E 지연 (초)")
+    parser.add_argument("--modes", default="direct,batch", help="실행할 방식 (쉼표 구분)")
+    args = parser.parse_args()
+
+    latency = FakeLatency(chat=args.latency, whisper=args.latency, tts=args.latency, images=args.image_latency)
+    fake_app = create_fake_openai_app(latency)
+    results = {}
+    with run_fake_server(fake_app) as fake_url, tempfile.TemporaryDirectory() as directory:
+        port = _free_port()
+        env = {
+            **os.environ,
+            **isolated_env(directory),
+            "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "bench-key"),
+            "OPENAI_BASE_URL": f"{fake_url}/v1",
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            _wait_ready(base_url, server)
+            for mode in args.modes.split(","):
+                results[mode] = asyncio.run(_run(mode, base_url, fake_url, fake_app, args))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    print(f"robots: {args.robots}  client timeout: {args.timeout:.0f}s")
+    print(f"{'mode':<8}{'done':>6}{'timeouts':>10}{'failed':>8}{'p50 s':>8}{'p95 s':>8}{'elapsed s':>11}{'chat calls':>12}")
+    for mode, result in results.items():
+        latencies = result["latencies"]
+        print(f"{mode:<8}{len(latencies):>6}{result['timeouts']:>10}{result['failed']:>8}"
+              f"{percentile(latencies, 50):>8.2f}{percentile(latencies, 95):>8.2f}"
+              f"{result['elapsed']:>11.2f}{result['chat_calls']:>12}")
+    if "accept" in results.get("batch", {}):
+        print(f"batch accepted in {results['batch']['accept'] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
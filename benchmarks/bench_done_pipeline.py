@@ -0,0 +1,90 @@
+"""/drawing/done 파이프라인 지연 시간 벤치마크
+
+가짜 OpenAI 서버를 대상으로 handle_done_drawing 을 반복 실행하고
+p50 지연 시간과 단계별 시작/종료 시각, 임계 경로를 출력합니다.
+배경 이미지 동기 생성(sync)과 작업 큐 비동기 생성(async, BACKGROUND_IMAGE_ASYNC)을 비교하며,
+async 는 done 응답 지연과 배경 이미지가 준비될 때까지의 시간을 따로 출력합니다.
+
+실행: python -m benchmarks.bench_done_pipeline --runs 10
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import statistics
+import time
+
+from benchmarks.fake_openai import FakeLatency, create_fake_openai_app, isolated_env, run_fake_server
+
+
+async def _run(runs: int, base_url: str, background_async: bool):
+    from app.models.drawing import NewDrawingRequest, DoneDrawingRequest
+    from app.services.drawing_service.drawing_service_impl import DrawingServiceImpl
+    from app.services.job_store.memory_job_store import MemoryJobStore
+    from app.utils.clients import close_clients
+
+    service = DrawingServiceImpl(background_async=background_async, job_store=MemoryJobStore())
+    latencies, image_latencies = [], []
+    last_timings = {}
+    for index in range(runs):
+        canvas_id = f"bench-done-{background_async}-{index}"
+        await service.handle_new_drawing(NewDrawingRequest(
+            robot_id="bench-robot", name="아이", age=5, canvas_id=canvas_id
+        ))
+        updates = service.background_jobs.subscribe(canvas_id)
+        started = time.perf_counter()
+        await service.handle_done_drawing(DoneDrawingRequest(
+            canvas_id=canvas_id, image_url=f"{base_url}/s3/drawing.png"
+        ))
+        latencies.append(time.perf_counter() - started)
+        # 배경 이미지가 세션에 반영될 때까지 (sync 는 done 응답 시점)
+        while background_async and not (await updates.get()).finished:
+            pass
+        image_latencies.append(time.perf_counter() - started)
+        service.background_jobs.unsubscribe(canvas_id, updates)
+        last_timings = service.drawing_data[canvas_id].stage_timings
+
+    await close_clients()
+    return latencies, image_latencies, last_timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/drawing/done 파이프라인 벤치마크")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.3, help="chat/tts 지연 (초)")
+    parser.add_argument("--image-latency", type=float, default=1.5, help="DALL-E 지연 (초)")
+    parser.add_argument("--background", choices=("sync", "async", "both"), default="both",
+                        help="배경 이미지 생성 방식")
+    args = parser.parse_args()
+    modes = ("sync", "async") if args.background == "both" else (args.background,)
+
+    latency = FakeLatency(chat=args.latency, tts=args.latency, images=args.image_latency)
+    app = create_fake_openai_app(latency)
+    with run_fake_server(app) as base_url, tempfile.TemporaryDirectory() as directory:
+        os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+        os.environ["OPENAI_BASE_URL"] = f"{base_url}/v1"
+        os.environ.update(isolated_env(directory))
+        results = {}
+        for mode in modes:
+            s3_before = app.state.calls["s3"]
+            results[mode] = asyncio.run(_run(args.runs, base_url, mode == "async"))
+            results[mode] += (app.state.calls["s3"] - s3_before,)
+
+    sequential = 4 * args.latency + args.image_latency + args.latency + latency.s3 * 2
+    print(f"runs                  : {args.runs}")
+    print(f"sequential estimate   : {sequential:.3f}s")
+    for mode, (latencies, image_latencies, timings, s3_calls) in results.items():
+        print(f"[{mode}]")
+        print(f"p50 done latency      : {statistics.median(latencies):.3f}s")
+        print(f"p50 background ready  : {statistics.median(image_latencies):.3f}s")
+        print(f"s3 downloads per run  : {s3_calls / args.runs:.1f}")
+        print("stage timings (last run):")
+        for stage, timing in timings.items():
+            marker = "*" if timing["critical"] else " "
+            print(f"  {marker} {stage:<18} {timing['start_ms']:>8.1f} → {timing['end_ms']:>8.1f}ms "
+                  f"({timing['duration_ms']:.1f}ms)")
+        print("  (* = critical path)")
+
+
+if __name__ == "__main__":
+    main()
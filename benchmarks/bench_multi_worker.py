@@ -0,0 +1,83 @@
+"""여러 워커 프로세스 세션 공유 확인
+
+uvicorn --workers N 으로 서버를 띄우고 /drawing/new 로 세션을 만든 뒤,
+매번 새 연결로 /drawing/chat-history 를 조회해 다른 워커에서도 세션이 보이는지 확인합니다.
+memory 저장소는 세션을 만든 워커에서만 조회되고, sqlite/redis 저장소는 모든 워커에서 조회됩니다.
+
+실행: python -m benchmarks.bench_multi_worker --workers 4 --store sqlite
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.fake_openai import FakeLatency, _free_port, create_fake_openai_app, isolated_env, run_fake_server
+
+
+def _wait_ready(base_url: str, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(f"{base_url}/drawing/chat-history/ping", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 워커 세션 공유 확인")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--store", default="sqlite", help="memory | sqlite | redis")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--reads", type=int, default=10, help="세션당 조회 횟수 (매번 새 연결)")
+    args = parser.parse_args()
+
+    app = create_fake_openai_app(FakeLatency(tts=0.01))
+    with run_fake_server(app) as fake_url, tempfile.TemporaryDirectory() as directory:
+        port = _free_port()
+        env = {
+            **os.environ,
+            **isolated_env(directory),
+            "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "bench-key"),
+            "OPENAI_BASE_URL": f"{fake_url}/v1",
+            "SESSION_STORE": args.store,
+            "FEEDBACK_BUS": args.store,
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+             "--workers", str(args.workers), "--log-level", "warning"],
+            env=env
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            _wait_ready(base_url)
+            found = missing = 0
+            for index in range(args.sessions):
+                canvas_id = f"multi-worker-{index}"
+                httpx.post(f"{base_url}/drawing/new", json={
+                    "robot_id": "bench-robot", "name": "아이", "age": 5, "canvas_id": canvas_id
+                }, timeout=30).raise_for_status()
+                for _ in range(args.reads):
+                    # 매 요청마다 새 연결을 사용해 워커 분산을 유도
+                    with httpx.Client(timeout=10) as client:
+                        response = client.get(f"{base_url}/drawing/chat-history/{canvas_id}")
+                    if response.status_code == 200:
+                        found += 1
+                    else:
+                        missing += 1
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    total = found + missing
+    print(f"workers: {args.workers}  store: {args.store}")
+    print(f"session reads found on any worker: {found}/{total} ({found / total * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""로봇 N대 종단 간 부하 벤치마크
+
+가짜 OpenAI / S3 서버와 실제 서버(uvicorn 별도 프로세스)를 띄우고,
+로봇 N대가 동시에 실제 클라이언트와 같은 순서로 요청을 보냅니다.
+
+  /drawing/new → 음성 WebSocket 대화 턴 → /drawing/send 실시간 그림 프레임 → /drawing/done
+
+단계별 처리량과 p50/p95/p99 지연 시간, 서버 프로세스 RSS(현재 / 최대)를 출력합니다.
+--budget 으로 단계별 p95 상한(ms)을 주면 초과 시 종료 코드 1로 끝나므로 배포 전 회귀 확인에 사용할 수 있습니다.
+
+실행: python -m benchmarks.bench_robots --robots 50 --turns 2 --frames 5
+      python -m benchmarks.bench_robots --robots 20 --budget "new=1500,turn=2000,done=5000" --json result.json
+"""
+import argparse
+import asyncio
+import base64
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+import websockets
+from PIL import Image
+
+from benchmarks.fake_openai import FakeLatency, _free_port, create_fake_openai_app, isolated_env, run_fake_server
+
+# 측정 단계 (출력 순서)
+STAGES = ("new", "turn", "canvas_feedback", "done", "robot")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """선형 보간 백분위수 (q: 0~100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _frame(index: int, size: int = 256) -> str:
+    """그리는 중인 캔버스 프레임 (프레임마다 색칠한 영역이 늘어남)"""
+    image = Image.new("RGB", (size, size), (255, 255, 255))
+    image.paste((40, 90, 200), (0, 0, size, min(size, (index + 1) * size // 8)))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+def _process_memory(pid: int) -> Dict[str, Optional[float]]:
+    """서버 프로세스 RSS (MiB, /proc가 없는 환경에서는 None)"""
+    memory: Dict[str, Optional[float]] = {"rss_mib": None, "peak_rss_mib": None}
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    memory["rss_mib"] = int(line.split()[1]) / 1024
+                elif line.startswith("VmHWM:"):
+                    memory["peak_rss_mib"] = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return memory
+
+
+class Recorder:
+    """단계별 지연 시간 / 오류 수 기록"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def observe(self, stage: str, started: float):
+        self.latencies[stage].append(time.perf_counter() - started)
+
+    def error(self, stage: str, e: BaseException):
+        self.errors[stage] += 1
+        if self.errors[stage] == 1:
+            print(f"[{stage}] first error: {type(e).__name__}: {e}", file=sys.stderr)
+
+    def summary(self, elapsed: float) -> Dict[str, dict]:
+        return {
+            stage: {
+                "count": len(self.latencies[stage]),
+                "errors": self.errors[stage],
+                "throughput_per_s": round(len(self.latencies[stage]) / elapsed, 2) if elapsed else 0.0,
+                "p50_ms": round(percentile(self.latencies[stage], 50) * 1000, 1),
+                "p95_ms": round(percentile(self.latencies[stage], 95) * 1000, 1),
+                "p99_ms": round(percentile(self.latencies[stage], 99) * 1000, 1),
+            }
+            for stage in STAGES
+        }
+
+
+async def _voice_turns(ws_url: str, turns: int, audio: str, recorder: Recorder):
+    """음성 WebSocket 대화 턴 (응답 음성을 받을 때까지)"""
+    async with websockets.connect(ws_url, max_size=None) as websocket:
+        for _ in range(turns):
+            started = time.perf_counter()
+            try:
+                await websocket.send(json.dumps({"type": "voice", "audio_data": audio}))
+                while True:
+                    message = json.loads(await asyncio.wait_for(websocket.recv(), 60))
+                    if message.get("type") == "voice" and not message.get("is_user"):
+                        break
+                recorder.observe("turn", started)
+            except Exception as e:
+                recorder.error("turn", e)
+                return
+
+
+async def _canvas_frames(ws_url: str, canvas_id: str, frames: int, interval: float, recorder: Recorder):
+    """실시간 그림 프레임 전송 후 마지막 프레임 이후 피드백까지의 시간 측정"""
+    async with websockets.connect(ws_url, max_size=None) as websocket:
+        try:
+            await websocket.send(json.dumps({"canvas_id": canvas_id}))
+            await asyncio.wait_for(websocket.recv(), 10)
+            for index in range(frames):
+                await websocket.send(json.dumps({"image_url": _frame(index)}))
+                if index < frames - 1:
+                    await asyncio.sleep(interval)
+            started = time.perf_counter()
+            while True:
+                message = json.loads(await asyncio.wait_for(websocket.recv(), 60))
+                if message.get("type") == "ai_response":
+                    break
+            recorder.observe("canvas_feedback", started)
+        except Exception as e:
+            recorder.error("canvas_feedback", e)
+
+
+async def _robot(index: int, client: httpx.AsyncClient, base_url: str, fake_url: str, args, recorder: Recorder):
+    robot_id = f"bench-robot-{index}"
+    canvas_id = f"bench-canvas-{index}-{os.getpid()}"
+    ws_base = base_url.replace("http://", "ws://")
+    audio = base64.b64encode(b"RIFF" + os.urandom(args.audio_bytes)).decode("utf-8")
+    robot_started = time.perf_counter()
+
+    started = time.perf_counter()
+    try:
+        response = await client.post(f"{base_url}/drawing/new?audio=binary", json={
+            "robot_id": robot_id, "name": "아이", "age": 5, "canvas_id": canvas_id
+        })
+        response.raise_for_status()
+        recorder.observe("new", started)
+    except Exception as e:
+        recorder.error("new", e)
+        return
+
+    await _voice_turns(f"{ws_base}/ws/drawing/{robot_id}/{canvas_id}", args.turns, audio, recorder)
+    if args.frames:
+        await _canvas_frames(f"{ws_base}/drawing/send", canvas_id, args.frames, args.frame_interval, recorder)
+
+    started = time.perf_counter()
+    try:
+        response = await client.post(f"{base_url}/drawing/done", json={
+            "canvas_id": canvas_id, "image_url": f"{fake_url}/s3/{canvas_id}.png"
+        })
+        response.raise_for_status()
+        recorder.observe("done", started)
+    except Exception as e:
+        recorder.error("done", e)
+        return
+    recorder.observe("robot", robot_started)
+
+
+async def _run(args, base_url: str, fake_url: str, recorder: Recorder) -> float:
+    limits = httpx.Limits(max_connections=args.robots, max_keepalive_connections=args.robots)
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(_robot(i, client, base_url, fake_url, args, recorder) for i in range(args.robots)))
+        return time.perf_counter() - started
+
+
+def _wait_ready(base_url: str, server: subprocess.Popen, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            httpx.get(f"{base_url}/metrics", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def _parse_budget(value: str) -> Dict[str, float]:
+    """"new=1500,done=5000" → {"new": 1500.0, "done": 5000.0}"""
+    budget = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        stage, _, limit = item.partition("=")
+        budget[stage.strip()] = float(limit)
+    return budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로봇 N대 종단 간 부하 벤치마크")
+    parser.add_argument("--robots", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=2, help="로봇당 음성 대화 턴 수")
+    parser.add_argument("--frames", type=int, default=5, help="로봇당 실시간 그림 프레임 수 (0이면 /drawing/send 생략)")
+    parser.add_argument("--frame-interval", type=float, default=0.2, help="프레임 전송 간격 (초)")
+    parser.add_argument("--audio-bytes", type=int, default=64_000, help="음성 턴 업로드 크기")
+    parser.add_argument("--latency", type=float, default=0.2, help="chat/whisper/tts 지연 (초)")
+    parser.add_argument("--image-latency", type=float, default=1.0, help="DALL-E 지연 (초)")
+    parser.add_argument("--s3-latency", type=float, default=0.05, help="S3 이미지 다운로드 지연 (초)")
+    parser.add_argument("--tts-bytes", type=int, default=32_000, help="TTS 응답 크기")
+    parser.add_argument("--image-size", type=int, default=1024, help="S3 이미지 한 변 크기 (px)")
+    parser.add_argument("--reply-repeat", type=int, default=1, help="chat 응답 길이 (기본 응답 반복 횟수)")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--budget", default="", help='단계별 p95 상한 ms (예: "turn=2000,done=5000")')
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    latency = FakeLatency(chat=args.latency, whisper=args.latency, tts=args.latency,
+                          images=args.image_latency, s3=args.s3_latency)
+    fake_app = create_fake_openai_app(latency, args.tts_bytes, args.image_size, args.reply_repeat)
+    recorder = Recorder()
+    with run_fake_server(fake_app) as fake_url, tempfile.TemporaryDirectory() as directory:
+        port = _free_port()
+        env = {
+            **os.environ,
+            **isolated_env(directory),
+            "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "bench-key"),
+            "OPENAI_BASE_URL": f"{fake_url}/v1",
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+             "--workers", str(args.workers), "--log-level", "warning"],
+            env=env, stdout=subprocess.DEVNULL
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            _wait_ready(base_url, server)
+            idle_memory = _process_memory(server.pid)
+            elapsed = asyncio.run(_run(args, base_url, fake_url, recorder))
+            memory = _process_memory(server.pid)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    stages = recorder.summary(elapsed)
+    result = {
+        "robots": args.robots,
+        "elapsed_s": round(elapsed, 3),
+        "stages": stages,
+        "server_memory": {"idle_rss_mib": idle_memory["rss_mib"], **memory},
+        "upstream_calls": dict(fake_app.state.calls),
+    }
+
+    print(f"robots: {args.robots}  turns: {args.turns}  frames: {args.frames}  workers: {args.workers}")
+    print(f"elapsed: {elapsed:.2f}s  ({args.robots / elapsed:.2f} robots/s)")
+    print(f"{'stage':<16}{'count':>7}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, row in stages.items():
+        print(f"{stage:<16}{row['count']:>7}{row['errors']:>8}{row['throughput_per_s']:>9}"
+              f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}")
+    if memory["rss_mib"] is not None:
+        print(f"server RSS: idle {idle_memory['rss_mib']:.1f} MiB → {memory['rss_mib']:.1f} MiB "
+              f"(peak {memory['peak_rss_mib']:.1f} MiB)")
+    print(f"upstream calls: {fake_app.state.calls}")
+    if args.workers > 1:
+        print("note: RSS is the uvicorn supervisor process only when --workers > 1")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as output:
+            json.dump(result, output, ensure_ascii=False, indent=2)
+
+    # 회귀 확인: 오류가 있거나 p95 상한을 넘으면 실패
+    failed = [f"{stage}: {count} errors" for stage, count in recorder.errors.items() if count]
+    for stage, limit in _parse_budget(args.budget).items():
+        if stage in stages and stages[stage]["p95_ms"] > limit:
+            failed.append(f"{stage}: p95 {stages[stage]['p95_ms']}ms > {limit:.0f}ms")
+    if failed:
+        print("FAILED: " + "; ".join(failed))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
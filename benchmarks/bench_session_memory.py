@@ -0,0 +1,73 @@
+"""세션 저장소 메모리 사용량 벤치마크
+
+음성 데이터와 대화 기록을 가진 세션 N개를 저장소별로 저장하고
+tracemalloc 기준 파이썬 힙 사용량을 비교합니다.
+음성은 세션 밖의 AudioBlobStore(최대 --audio-store-bytes)에 보관되며 측정에 포함됩니다.
+
+- dict: 기존 방식 (제한 없는 딕셔너리)
+- memory: LRU + TTL 메모리 저장소 (SESSION_MAX_SIZE 만큼만 보관)
+- sqlite: 파일 기반 저장소 (프로세스 메모리에는 세션을 보관하지 않음)
+
+실행: python -m benchmarks.bench_session_memory --sessions 10000
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+
+def _make_session(index: int, audio_bytes: int, messages: int, audio_store):
+    from app.models.drawing import DrawingData
+
+    drawing_data = DrawingData(robot_id=f"robot-{index}", name="아이", age=5, canvas_id=f"canvas-{index}")
+    for turn in range(messages):
+        drawing_data.add_message("user" if turn % 2 == 0 else "ai", f"{turn}번째 대화: 나는 강아지를 그렸어!")
+    drawing_data.audio_id = audio_store.put(os.urandom(audio_bytes))
+    drawing_data.audio_text = "안녕! 같이 그림 그려볼까?"
+    return drawing_data
+
+
+def _measure(name: str, store, sessions: int, audio_bytes: int, messages: int, audio_store_bytes: int):
+    from app.utils.audio_store import AudioBlobStore
+
+    gc.collect()
+    tracemalloc.start()
+    audio_store = AudioBlobStore(audio_store_bytes)
+    started = time.perf_counter()
+    for index in range(sessions):
+        store[f"canvas-{index}"] = _make_session(index, audio_bytes, messages, audio_store)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<8} sessions kept: {len(store):>6}  heap: {current / 1024 / 1024:>8.1f} MiB  "
+          f"({current / max(len(store), 1) / 1024:.1f} KiB/session kept, {elapsed:.2f}s)  "
+          f"audio kept: {len(audio_store)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="세션 저장소 메모리 벤치마크")
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--audio-bytes", type=int, default=32_000)
+    parser.add_argument("--messages", type=int, default=10)
+    parser.add_argument("--max-size", type=int, default=1000)
+    parser.add_argument("--audio-store-bytes", type=int, default=64 * 1024 * 1024)
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+    from app.services.session_store.memory_session_store import MemorySessionStore
+    from app.services.session_store.sqlite_session_store import SqliteSessionStore
+
+    print(f"{args.sessions} sessions, {args.audio_bytes} audio bytes, {args.messages} messages each")
+    _measure("dict", {}, args.sessions, args.audio_bytes, args.messages, args.audio_store_bytes)
+    _measure("memory", MemorySessionStore(max_size=args.max_size), args.sessions, args.audio_bytes, args.messages, args.audio_store_bytes)
+    with tempfile.TemporaryDirectory() as directory:
+        store = SqliteSessionStore(os.path.join(directory, "sessions.db"))
+        _measure("sqlite", store, args.sessions, args.audio_bytes, args.messages, args.audio_store_bytes)
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
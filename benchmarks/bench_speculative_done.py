@@ -0,0 +1,98 @@
+"""/drawing/done 추측 생성 벤치마크
+
+가짜 OpenAI 서버를 대상으로 같은 세션 흐름(new → 음성 턴 → 그림 프레임 → 대기 → done)을
+추측 생성 끈 상태 / 켠 상태로 실행해 done 지연 시간과 OpenAI 토큰 사용량을 비교합니다.
+--late-turns 비율만큼의 세션은 초안 이후 한 턴 더 대화해 초안이 버려지는 경우를 흉내 냅니다.
+
+실행: python -m benchmarks.bench_speculative_done --sessions 10
+"""
+import argparse
+import asyncio
+import base64
+import os
+import tempfile
+import statistics
+import time
+
+from benchmarks.fake_openai import FakeLatency, _png_bytes, create_fake_openai_app, isolated_env, run_fake_server
+
+
+def _total_tokens() -> float:
+    from app.utils.metrics import OPENAI_TOKENS
+    return sum(OPENAI_TOKENS._values.values())
+
+
+async def _run(speculative: bool, sessions: int, turns: int, late_turns: float, base_url: str):
+    from unittest.mock import patch
+    from app.models.drawing import NewDrawingRequest, DoneDrawingRequest
+    from app.services.drawing_service.drawing_service_impl import DrawingServiceImpl
+    from app.utils.clients import close_clients
+
+    # 배경 프롬프트 초안 재사용 효과가 done 지연 시간에 드러나도록 배경 이미지는 동기 생성
+    service = DrawingServiceImpl(speculative=speculative, background_async=False)
+    frame = "data:image/png;base64," + base64.b64encode(_png_bytes()).decode()
+    idle = 0.2
+    latencies = []
+    tokens_before = _total_tokens()
+    with patch("app.services.drawing_service.drawing_service_impl.SPECULATIVE_IDLE_SECONDS", idle):
+        for index in range(sessions):
+            canvas_id = f"bench-speculative-{speculative}-{index}"
+            await service.handle_new_drawing(NewDrawingRequest(
+                robot_id="bench-robot", name="아이", age=5, canvas_id=canvas_id
+            ))
+            for _ in range(turns):
+                await service.process_audio(b"RIFF fake wav", "bench-robot", canvas_id)
+            service.note_canvas_frame(canvas_id, frame)
+            # 아이가 잠시 멈춘 사이 초안 생성
+            await asyncio.sleep(idle)
+            await asyncio.gather(*service._speculation_tasks.values(), return_exceptions=True)
+            if index < sessions * late_turns:
+                await service.process_audio(b"RIFF fake wav", "bench-robot", canvas_id)
+
+            started = time.perf_counter()
+            await service.handle_done_drawing(DoneDrawingRequest(
+                canvas_id=canvas_id, image_url=f"{base_url}/s3/drawing.png"
+            ))
+            latencies.append(time.perf_counter() - started)
+
+    tokens = _total_tokens() - tokens_before
+    stats = dict(service.speculation_stats)
+    await close_clients()
+    return latencies, tokens, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/drawing/done 추측 생성 벤치마크")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=3, help="세션당 음성 턴 수")
+    parser.add_argument("--late-turns", type=float, default=0.2, help="초안 이후 대화가 이어지는 세션 비율")
+    parser.add_argument("--latency", type=float, default=0.3, help="chat/tts 지연 (초)")
+    parser.add_argument("--image-latency", type=float, default=1.5, help="DALL-E 지연 (초)")
+    args = parser.parse_args()
+
+    latency = FakeLatency(chat=args.latency, tts=args.latency, images=args.image_latency)
+    app = create_fake_openai_app(latency)
+    results = {}
+    with run_fake_server(app) as base_url, tempfile.TemporaryDirectory() as directory:
+        os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+        os.environ["OPENAI_BASE_URL"] = f"{base_url}/v1"
+        os.environ.update(isolated_env(directory))
+        for speculative in (False, True):
+            results[speculative] = asyncio.run(
+                _run(speculative, args.sessions, args.turns, args.late_turns, base_url)
+            )
+
+    (off_latencies, off_tokens, _), (on_latencies, on_tokens, stats) = results[False], results[True]
+    off_p50, on_p50 = statistics.median(off_latencies), statistics.median(on_latencies)
+    print(f"sessions              : {args.sessions} ({args.turns} turns, {args.late_turns:.0%} late turns)")
+    print(f"p50 done latency      : off {off_p50:.3f}s / on {on_p50:.3f}s "
+          f"(saved {off_p50 - on_p50:.3f}s, {(off_p50 - on_p50) / off_p50:.0%})")
+    print(f"tokens per session    : off {off_tokens / args.sessions:.0f} / on {on_tokens / args.sessions:.0f} "
+          f"(extra {(on_tokens - off_tokens) / max(off_tokens, 1):+.0%})")
+    print("speculation outcomes  :")
+    for (artifact, outcome), count in sorted(stats.items()):
+        print(f"  {artifact:<18} {outcome:<8} {count}")
+
+
+if __name__ == "__main__":
+    main()
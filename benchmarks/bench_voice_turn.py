@@ -0,0 +1,76 @@
+"""음성 턴 time-to-first-audio 벤치마크
+
+가짜 OpenAI 서버를 대상으로 같은 음성 턴을
+- 일괄 처리 (process_audio: STT → 전체 GPT 응답 → 전체 TTS)
+- 스트리밍 처리 (stream_audio: STT → GPT 토큰 스트림 → 문장 단위 TTS)
+로 실행하여 첫 음성이 준비되기까지의 시간을 비교합니다.
+
+실행: python -m benchmarks.bench_voice_turn --runs 10
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import statistics
+import time
+
+from benchmarks.fake_openai import CHAT_REPLY, FakeLatency, create_fake_openai_app, isolated_env, run_fake_server
+
+
+async def _run(runs: int):
+    from app.models.drawing import NewDrawingRequest
+    from app.services.drawing_service.drawing_service_impl import DrawingServiceImpl
+    from app.utils.clients import close_clients
+
+    service = DrawingServiceImpl()
+    await service.handle_new_drawing(NewDrawingRequest(
+        robot_id="bench-robot", name="아이", age=5, canvas_id="bench-voice"
+    ))
+
+    batch, streamed, streamed_total = [], [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await service.process_audio(b"RIFF fake wav", "bench-robot", "bench-voice")
+        batch.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        first_audio = None
+        async for event in service.stream_audio(b"RIFF fake wav", "bench-robot", "bench-voice"):
+            if event.type == "chunk" and first_audio is None:
+                first_audio = time.perf_counter() - started
+        streamed.append(first_audio)
+        streamed_total.append(time.perf_counter() - started)
+
+    await close_clients()
+    return batch, streamed, streamed_total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="음성 턴 time-to-first-audio 벤치마크")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--tts-latency", type=float, default=0.15, help="TTS 기본 지연 (초)")
+    parser.add_argument("--tts-per-char", type=float, default=0.01, help="TTS 글자당 지연 (초)")
+    parser.add_argument("--token-latency", type=float, default=0.05, help="GPT 토큰당 지연 (초)")
+    args = parser.parse_args()
+
+    # 일괄 응답 지연 = 첫 토큰 + 토큰 수 × 토큰당 지연 (스트리밍과 동일한 생성 속도)
+    tokens = len(CHAT_REPLY.split(" "))
+    latency = FakeLatency(
+        chat=0.1 + tokens * args.token_latency, chat_first_token=0.1, chat_token=args.token_latency,
+        tts=args.tts_latency, tts_per_char=args.tts_per_char
+    )
+    app = create_fake_openai_app(latency)
+    with run_fake_server(app) as base_url, tempfile.TemporaryDirectory() as directory:
+        os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+        os.environ["OPENAI_BASE_URL"] = f"{base_url}/v1"
+        os.environ.update(isolated_env(directory))
+        batch, streamed, streamed_total = asyncio.run(_run(args.runs))
+
+    print(f"runs                          : {args.runs}")
+    print(f"p50 time-to-first-audio batch : {statistics.median(batch) * 1000:.0f}ms")
+    print(f"p50 time-to-first-audio stream: {statistics.median(streamed) * 1000:.0f}ms")
+    print(f"p50 full streamed turn        : {statistics.median(streamed_total) * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
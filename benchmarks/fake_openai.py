@@ -0,0 +1,227 @@
+"""벤치마크용 로컬 가짜 OpenAI 서버
+
+chat / whisper / tts / images 엔드포인트를 지연 시간과 응답 크기만 흉내 내어 응답하고,
+S3 이미지 호스트 역할(/s3/{name})도 함께 제공합니다.
+inject_faults()로 다음 요청들에 오류 응답(429 / 5xx)이나 추가 지연을 넣을 수 있습니다.
+app.state.peers 로 클라이언트가 연 TCP 연결 수를 셀 수 있습니다.
+"""
+import asyncio
+import io
+import json
+import os
+import re
+import socket
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from PIL import Image
+
+
+@dataclass
+class FakeLatency:
+    """엔드포인트별 응답 지연 시간 (초)"""
+    chat: float = 0.2
+    chat_first_token: float = 0.1
+    chat_token: float = 0.02
+    whisper: float = 0.2
+    tts: float = 0.2
+    tts_per_char: float = 0.0
+    images: float = 1.0
+    s3: float = 0.05
+
+
+# 가짜 GPT 응답 (두 문장)
+CHAT_REPLY = "우와, 정말 멋진 그림이야! 어떤 색을 제일 좋아해?"
+
+# 가짜 usage 계산용 이미지 한 장의 토큰 수 (detail=auto 512px 기준 근사)
+IMAGE_TOKENS = 255
+
+
+def _estimate_tokens(text: str) -> int:
+    """한국어 기준 대략 두 글자당 한 토큰"""
+    return max(1, len(text) // 2)
+
+
+def _usage(messages: list, reply: str) -> dict:
+    """요청 메시지와 응답 길이로 usage 근사 (추측 생성 토큰 비용 비교용)"""
+    prompt = 0
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, str):
+            prompt += _estimate_tokens(content)
+            continue
+        for part in content:
+            if part.get("type") == "image_url":
+                prompt += IMAGE_TOKENS
+            else:
+                prompt += _estimate_tokens(part.get("text", ""))
+    completion = _estimate_tokens(reply)
+    return {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion}
+
+
+def _png_bytes(size: int = 512) -> bytes:
+    """가짜 S3 이미지로 사용할 PNG 생성"""
+    buffer = io.BytesIO()
+    Image.new("RGB", (size, size), (255, 220, 180)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def create_fake_openai_app(latency: FakeLatency = None, tts_bytes: int = 32_000, image_size: int = 512,
+                           reply_repeat: int = 1) -> FastAPI:
+    """가짜 OpenAI API FastAPI 앱 생성
+
+    tts_bytes: TTS 응답 크기, image_size: S3 이미지 한 변 크기 (px),
+    reply_repeat: chat 응답 길이 (CHAT_REPLY 반복 횟수)
+    """
+    latency = latency or FakeLatency()
+    app = FastAPI()
+    app.state.calls = {"chat": 0, "whisper": 0, "tts": 0, "images": 0, "s3": 0}
+    app.state.faults = {name: deque() for name in app.state.calls}
+    # 요청을 보낸 (host, port) 목록 = 서버가 받은 TCP 연결 수
+    app.state.peers = set()
+    image = _png_bytes(image_size)
+    audio = b"\xff\xf3" * (tts_bytes // 2)
+    reply = " ".join([CHAT_REPLY] * reply_repeat)
+
+    @app.middleware("http")
+    async def record_peer(request: Request, call_next):
+        if request.client:
+            app.state.peers.add((request.client.host, request.client.port))
+        return await call_next(request)
+
+    async def _chat_stream():
+        await asyncio.sleep(latency.chat_first_token)
+        for index, token in enumerate(reply.split(" ")):
+            if index:
+                await asyncio.sleep(latency.chat_token)
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": "gpt-3.5-turbo",
+                "choices": [{"index": 0, "delta": {"content": ("" if index == 0 else " ") + token}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    async def _fault(name: str):
+        """대기 중인 장애가 있으면 적용 (오류 응답 반환 또는 추가 지연)"""
+        faults = app.state.faults[name]
+        if not faults:
+            return None
+        fault = faults.popleft()
+        if isinstance(fault, int):
+            headers = {"retry-after": "0"} if fault == 429 else None
+            return JSONResponse({"error": {"message": f"injected {fault}", "type": "fake"}},
+                                status_code=fault, headers=headers)
+        await asyncio.sleep(fault)
+        return None
+
+    @app.post("/v1/chat/completions")
+    async def chat(request: Request):
+        app.state.calls["chat"] += 1
+        if (error := await _fault("chat")) is not None:
+            return error
+        body = json.loads(await request.body() or b"{}")
+        if body.get("stream"):
+            return StreamingResponse(_chat_stream(), media_type="text/event-stream")
+        await asyncio.sleep(latency.chat)
+        content = reply
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            # 묶음 요약: 사용자 메시지의 [n] 번호마다 답변 하나
+            text = body["messages"][-1]["content"]
+            content = json.dumps({n: reply for n in re.findall(r"^\[(\d+)\]$", text, re.MULTILINE)}, ensure_ascii=False)
+        return JSONResponse({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "gpt-3.5-turbo",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": _usage(body.get("messages", []), content),
+        })
+
+    @app.post("/v1/audio/transcriptions")
+    async def transcriptions(request: Request):
+        app.state.calls["whisper"] += 1
+        if (error := await _fault("whisper")) is not None:
+            return error
+        await request.body()
+        await asyncio.sleep(latency.whisper)
+        return JSONResponse({"text": "나는 강아지를 그렸어"})
+
+    @app.post("/v1/audio/speech")
+    async def speech(request: Request):
+        app.state.calls["tts"] += 1
+        if (error := await _fault("tts")) is not None:
+            return error
+        body = json.loads(await request.body() or b"{}")
+        await asyncio.sleep(latency.tts + latency.tts_per_char * len(body.get("input", "")))
+        return Response(content=audio, media_type="audio/mpeg")
+
+    @app.post("/v1/images/generations")
+    async def images(request: Request):
+        app.state.calls["images"] += 1
+        if (error := await _fault("images")) is not None:
+            return error
+        await request.body()
+        await asyncio.sleep(latency.images)
+        return JSONResponse({
+            "created": int(time.time()),
+            "data": [{"url": "https://fake.local/background.png"}],
+        })
+
+    @app.get("/s3/{name}")
+    async def s3_image(name: str):
+        app.state.calls["s3"] += 1
+        await asyncio.sleep(latency.s3)
+        return Response(content=image, media_type="image/png")
+
+    return app
+
+
+def inject_faults(app: FastAPI, endpoint: str, *faults):
+    """다음 요청들에 순서대로 장애 주입 (int: 해당 상태 코드로 응답, float: 초 단위 추가 지연)"""
+    app.state.faults[endpoint].extend(faults)
+
+
+def isolated_env(directory: str) -> dict:
+    """벤치마크용 서버가 실제 TTS 캐시 / DB / 추적 파일을 건드리지 않도록 하는 환경 변수 (directory: 임시 디렉터리)"""
+    return {
+        # 가짜 TTS 음성은 디스크 캐시(.tts_cache)에 남기지 않음
+        "TTS_CACHE_DIR": "",
+        "SESSION_DB_PATH": os.path.join(directory, "sessions.db"),
+        "JOB_DB_PATH": os.path.join(directory, "jobs.db"),
+        "TRACE_FILE": os.path.join(directory, "traces.jsonl"),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def run_fake_server(app: FastAPI, port: int = None):
+    """가짜 서버를 별도 스레드에서 실행하고 base URL을 반환"""
+    port = port or _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
@@ -3,6 +3,8 @@ import sys
 import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# 테스트에서는 실제 API 키 없이 설정 모듈을 로드
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
 
 from app.services.drawing_service.drawing_service_impl import DrawingServiceImpl
 
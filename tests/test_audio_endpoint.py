@@ -0,0 +1,90 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.controllers.drawing_controller import router as drawing_router
+from app.services.drawing_service.drawing_service import StoredAudio
+from app.utils.http_range import RangeNotSatisfiable, parse_range
+
+AUDIO = bytes(range(100))
+RESYNTHESIZED = bytes(range(100, 150))
+
+
+def _get_audio(audio_id, canvas_id=None):
+    if audio_id == "abc":
+        return StoredAudio("abc", AUDIO)
+    # 다른 워커에서 만든 세션 음성: 다시 합성돼 내용 해시가 달라짐
+    if audio_id == "evicted" and canvas_id:
+        return StoredAudio("fresh", RESYNTHESIZED)
+    return None
+
+
+@pytest.fixture
+def client():
+    drawing_service = MagicMock()
+    drawing_service.get_audio = AsyncMock(side_effect=_get_audio)
+    app = FastAPI()
+    app.include_router(drawing_router)
+    with patch("app.controllers.drawing_controller.get_drawing_service", return_value=drawing_service):
+        yield TestClient(app)
+
+
+# 📝 Test: 전체 다운로드 + 캐시 헤더, ETag 일치 시 304
+def test_audio_download_with_etag(client):
+    response = client.get("/drawing/audio/abc")
+    assert response.status_code == 200
+    assert response.content == AUDIO
+    assert response.headers["content-type"] == "audio/mpeg"
+    assert response.headers["etag"] == '"abc"'
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["accept-ranges"] == "bytes"
+
+    cached = client.get("/drawing/audio/abc", headers={"If-None-Match": '"abc"'})
+    assert cached.status_code == 304 and cached.content == b""
+
+    assert client.get("/drawing/audio/missing").status_code == 404
+
+
+# 📝 Test: Range 요청은 해당 구간만 206으로 응답
+def test_audio_range_requests(client):
+    response = client.get("/drawing/audio/abc", headers={"Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == AUDIO[10:20]
+    assert response.headers["content-range"] == "bytes 10-19/100"
+
+    suffix = client.get("/drawing/audio/abc", headers={"Range": "bytes=-5"})
+    assert suffix.content == AUDIO[-5:]
+
+    unsatisfiable = client.get("/drawing/audio/abc", headers={"Range": "bytes=200-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == "bytes */100"
+
+    # 끝이 시작보다 앞인 구간은 무시하고 전체 응답 (RFC 9110)
+    invalid = client.get("/drawing/audio/abc", headers={"Range": "bytes=5-3"})
+    assert invalid.status_code == 200 and invalid.content == AUDIO
+
+    # If-Range가 현재 ETag와 다르면 구간 대신 전체 응답
+    stale = client.get("/drawing/audio/abc", headers={"Range": "bytes=10-19", "If-Range": '"old"'})
+    assert stale.status_code == 200 and stale.content == AUDIO
+
+
+# 📝 Test: 다시 합성된 음성은 실제 내용의 ETag로, 캐시 고정 / 이어 받기 없이 전체 응답
+def test_resynthesized_audio_uses_served_etag(client):
+    response = client.get("/drawing/audio/evicted?canvas_id=c1", headers={"Range": "bytes=10-", "If-Range": '"evicted"'})
+    assert response.status_code == 200
+    assert response.content == RESYNTHESIZED
+    assert response.headers["etag"] == '"fresh"'
+    assert "immutable" not in response.headers["cache-control"]
+
+    resumed = client.get("/drawing/audio/evicted?canvas_id=c1", headers={"Range": "bytes=10-"})
+    assert resumed.status_code == 200 and resumed.content == RESYNTHESIZED
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-", 100) == (0, 99)
+    assert parse_range("bytes=90-200", 100) == (90, 99)
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    assert parse_range("bytes=5-2", 100) is None
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=100-", 100)
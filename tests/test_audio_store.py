@@ -0,0 +1,50 @@
+import base64
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.models.drawing import DrawingData
+from app.utils.audio_store import AudioBlobStore
+
+
+# 📝 Test: 같은 음성은 한 번만 보관, base64는 한 번만 인코딩
+def test_put_deduplicates_and_caches_base64():
+    store = AudioBlobStore()
+    first = store.put(b"GREETING")
+    second = store.put(b"GREETING")
+
+    assert first == second and len(store) == 1
+    assert store.get(first) == b"GREETING"
+    encoded = store.get_base64(first)
+    assert base64.b64decode(encoded) == b"GREETING"
+    assert store.get_base64(first) is encoded
+
+
+# 📝 Test: 전체 크기를 넘으면 오래 사용하지 않은 음성부터 제거
+def test_evicts_least_recently_used_by_bytes():
+    store = AudioBlobStore(max_bytes=10)
+    a = store.put(b"aaaa")
+    b = store.put(b"bbbb")
+    store.get(a)
+    c = store.put(b"cccc")
+
+    assert a in store and c in store
+    assert b not in store and store.get(b) is None
+    assert store.stats()["evictions"] == 1
+
+
+# 📝 Test: 저장소에서 제거된 세션 음성은 audio_text로 다시 합성
+@pytest.mark.asyncio
+async def test_session_audio_is_resynthesized_after_eviction():
+    from app.services.drawing_service.drawing_service_impl import DrawingServiceImpl
+    from app.utils.tts_cache import TTSCache
+
+    mock_client = MagicMock()
+    mock_client.audio.speech.create = AsyncMock(return_value=SimpleNamespace(content=b"GREETING"))
+    drawing_data = DrawingData(robot_id="robot_123", name="아이", age=5, canvas_id="canvas_123",
+                               audio_id="evicted", audio_text="안녕!")
+    with patch("app.services.drawing_service.drawing_service_impl.get_openai_client", return_value=mock_client):
+        drawing_service = DrawingServiceImpl(tts_cache=TTSCache(), audio_store=AudioBlobStore())
+        assert await drawing_service.get_session_audio_base64(drawing_data) == base64.b64encode(b"GREETING").decode()
+    mock_client.audio.speech.create.assert_awaited_once()
+    # 읽기 경로에서는 세션을 바꾸지 않음
+    assert drawing_data.audio_id == "evicted"
@@ -0,0 +1,119 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from openai import AsyncOpenAI, BadRequestError
+from app.utils.call_policy import CallPolicy, CallPolicyRunner, CircuitOpenError, DeadlineExceededError, call_policy
+from app.utils.openai_scheduler import OpenAIScheduler, ScheduledOpenAI
+from benchmarks.fake_openai import FakeLatency, create_fake_openai_app, inject_faults, run_fake_server
+
+
+@pytest.fixture(scope="module")
+def fake_app():
+    return create_fake_openai_app(FakeLatency(chat=0.02, tts=0.02))
+
+
+@pytest.fixture(scope="module")
+def fake_url(fake_app):
+    with run_fake_server(fake_app) as base_url:
+        yield f"{base_url}/v1"
+
+
+@pytest.fixture
+async def policy_client(fake_app, fake_url):
+    for faults in fake_app.state.faults.values():
+        faults.clear()
+    runner = CallPolicyRunner({
+        "chat": CallPolicy(timeout=0.5, deadline=2.0, retries=2, backoff_base=0.01),
+        "chat_short": CallPolicy(timeout=1.0, deadline=2.0, retries=0, hedge_after=0.1),
+        "tts": CallPolicy(timeout=0.5, deadline=2.0, retries=0),
+    }, failure_threshold=3, reset_timeout=60)
+    raw_client = AsyncOpenAI(api_key="test-key", base_url=fake_url, max_retries=0)
+    yield ScheduledOpenAI(raw_client, OpenAIScheduler(), runner), runner
+    await raw_client.close()
+
+
+async def _chat(client, model="gpt-3.5-turbo"):
+    response = await client.chat.completions.create(model=model, messages=[{"role": "user", "content": "안녕"}])
+    return response.choices[0].message.content
+
+
+# 📝 Test: 429 / 5xx는 지터 백오프 후 재시도
+async def test_retry_on_429_and_5xx(fake_app, policy_client):
+    client, runner = policy_client
+    inject_faults(fake_app, "chat", 429, 503)
+
+    assert await _chat(client)
+    assert runner.stats["chat"].retries == 2
+
+
+# 📝 Test: 시도당 제한 시간을 넘기면 재시도
+async def test_timeout_then_retry(fake_app, policy_client):
+    client, runner = policy_client
+    inject_faults(fake_app, "chat", 2.0)
+
+    assert await _chat(client)
+    assert runner.stats["chat"].timeouts == 1
+
+
+# 📝 Test: 4xx는 재시도하지 않음
+async def test_client_error_not_retried(fake_app, policy_client):
+    client, runner = policy_client
+    inject_faults(fake_app, "chat", 400)
+
+    with pytest.raises(BadRequestError):
+        await _chat(client)
+    assert runner.stats["chat"].retries == 0
+    assert runner.breaker("gpt-3.5-turbo").state == "closed"
+
+
+# 📝 Test: 느린 짧은 요청은 헤징 요청이 먼저 응답
+async def test_hedged_request_wins(fake_app, policy_client):
+    client, runner = policy_client
+    inject_faults(fake_app, "chat", 0.8)
+
+    with call_policy("chat_short"):
+        assert await _chat(client)
+    assert runner.stats["chat_short"].hedged == 1
+    assert runner.stats["chat_short"].hedge_wins == 1
+
+
+# 📝 Test: 연속 실패 시 회로가 열려 바로 실패
+async def test_circuit_opens(fake_app, policy_client):
+    client, runner = policy_client
+    inject_faults(fake_app, "tts", 500, 500, 500)
+
+    for _ in range(3):
+        with pytest.raises(Exception):
+            await client.audio.speech.create(model="tts-1", voice="nova", input="안녕")
+    calls = fake_app.state.calls["tts"]
+    with pytest.raises(CircuitOpenError):
+        await client.audio.speech.create(model="tts-1", voice="nova", input="안녕")
+
+    assert fake_app.state.calls["tts"] == calls
+    assert runner.snapshot()["circuits"]["tts-1"] == "open"
+
+
+# 📝 Test: 스케줄러 자리를 기다린 시간은 시도 제한 시간 / 회로 차단기 실패에 넣지 않음
+async def test_queue_wait_not_counted_as_upstream_failure():
+    async def create(**kwargs):
+        await asyncio.sleep(0.2)
+        return SimpleNamespace(choices=[])
+
+    raw_client = MagicMock()
+    raw_client.images.generate = AsyncMock(side_effect=create)
+    runner = CallPolicyRunner({"image": CallPolicy(timeout=0.3, deadline=1.0, retries=2)}, failure_threshold=2)
+    client = ScheduledOpenAI(raw_client, OpenAIScheduler({"dall-e-3": 1}), runner)
+
+    # 자리 하나에 네 요청: 뒤의 요청은 시도 제한 시간보다 오래 기다리지만 모두 한 번에 성공
+    await asyncio.gather(*(client.images.generate(model="dall-e-3", prompt="배경") for _ in range(4)))
+    assert raw_client.images.generate.await_count == 4
+    assert runner.stats["image"].timeouts == runner.stats["image"].retries == 0
+
+    # 전체 제한 시간 안에 자리를 얻지 못한 요청은 실패하지만 회로는 닫힌 채로 유지
+    results = await asyncio.gather(
+        *(client.images.generate(model="dall-e-3", prompt="배경") for _ in range(8)), return_exceptions=True
+    )
+    assert any(isinstance(result, DeadlineExceededError) for result in results)
+    assert runner.stats["image"].deadline_exceeded > 0 and runner.stats["image"].timeouts == 0
+    assert runner.breaker("dall-e-3").state == "closed"
@@ -0,0 +1,77 @@
+import asyncio
+import base64
+import pytest
+from io import BytesIO
+from PIL import Image, ImageDraw
+from app.utils.canvas_scheduler import CanvasFrameScheduler
+
+
+def _frame(stroke: int = 0) -> str:
+    image = Image.new("RGB", (256, 256), "white")
+    draw = ImageDraw.Draw(image)
+    for index in range(stroke):
+        draw.rectangle((index * 30, 0, index * 30 + 25, 255), fill="black")
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+# 📝 Test: 연속 프레임은 debounce 후 마지막 프레임만 분석
+@pytest.mark.asyncio
+async def test_burst_coalesced_to_latest_frame():
+    analyzed = []
+
+    async def analyze(frame):
+        analyzed.append(frame)
+
+    scheduler = CanvasFrameScheduler(analyze, debounce_seconds=0.05)
+    frames = [_frame(stroke) for stroke in range(1, 6)]
+    for frame in frames:
+        scheduler.submit(frame)
+    await asyncio.sleep(0.2)
+    await scheduler.close()
+
+    assert analyzed == [frames[-1]]
+    assert scheduler.stats()["frames_coalesced"] == 4
+
+
+# 📝 Test: 거의 같은 프레임은 건너뜀
+@pytest.mark.asyncio
+async def test_near_identical_frame_skipped():
+    analyzed = []
+
+    async def analyze(frame):
+        analyzed.append(frame)
+
+    scheduler = CanvasFrameScheduler(analyze, debounce_seconds=0.01)
+    for frame in (_frame(2), _frame(2), _frame(5)):
+        scheduler.submit(frame)
+        await asyncio.sleep(0.1)
+    await scheduler.close()
+
+    assert len(analyzed) == 2
+    assert scheduler.stats()["frames_skipped"] == 1
+
+
+# 📝 Test: 동시 비전 호출 수 제한
+@pytest.mark.asyncio
+async def test_inflight_calls_capped():
+    running = 0
+    peak = 0
+
+    async def analyze(frame):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.1)
+        running -= 1
+
+    scheduler = CanvasFrameScheduler(analyze, debounce_seconds=0.01, max_inflight=1)
+    for stroke in range(1, 4):
+        scheduler.submit(_frame(stroke))
+        await asyncio.sleep(0.03)
+    await asyncio.sleep(0.4)
+    await scheduler.close()
+
+    assert peak == 1
+    assert scheduler.stats()["calls_made"] == 2
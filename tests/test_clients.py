@@ -0,0 +1,47 @@
+import pytest
+from app.services.chat_service.dependencies import get_chat_service
+from app.utils import clients
+
+
+# 📝 Test: 시작 시 만든 공유 클라이언트를 모든 호출이 재사용하고 종료 시 정리
+@pytest.mark.asyncio
+async def test_client_registry_reuses_and_closes_clients():
+    await clients.close_clients()
+    clients.open_clients()
+    openai_client, http_client = clients.get_openai_client(), clients.get_http_client()
+
+    assert clients.get_openai_client() is openai_client
+    assert clients.get_http_client() is http_client
+
+    await clients.close_clients()
+    assert http_client.is_closed
+    assert clients.get_http_client() is not http_client
+    await clients.close_clients()
+
+
+# 📝 Test: 채팅 서비스는 요청마다 새로 만들지 않음
+def test_chat_service_is_shared():
+    assert get_chat_service() is get_chat_service()
+
+
+# 📝 Test: 드로잉 서비스는 lifespan이 다시 연 클라이언트를 사용하고, lifespan 밖에서 만들면 경고
+@pytest.mark.asyncio
+async def test_drawing_service_follows_client_lifespan(caplog):
+    from app.services.drawing_service.drawing_service_impl import DrawingServiceImpl
+
+    await clients.close_clients()
+    clients.open_clients()
+    drawing_service = DrawingServiceImpl()
+    first = drawing_service.http_client
+    await clients.close_clients()
+
+    clients.open_clients()
+    assert drawing_service.http_client is not first and not drawing_service.http_client.is_closed
+    assert drawing_service.client is clients.get_openai_client()
+    await clients.close_clients()
+
+    with caplog.at_level("WARNING", logger="app.utils.clients"):
+        unmanaged = clients.get_http_client()
+    assert "outside the app lifespan" in caplog.text
+    await clients.close_clients()
+    assert unmanaged.is_closed
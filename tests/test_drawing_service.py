@@ -1,15 +1,33 @@
 import pytest
-from unittest.mock import AsyncMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 from app.models.drawing import NewDrawingRequest, DoneDrawingRequest, ChatMessage
 from app.services.drawing_service.drawing_service_impl import DrawingServiceImpl
+from app.utils.tts_cache import TTSCache
+from app.utils.image_cache import ImageCache
+from app.services.job_store.memory_job_store import MemoryJobStore
+
+
+def _chat_completion(content: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
 
 # ✅ 공통 Mock 설정
 @pytest.fixture
 def mock_openai():
-    with patch("app.services.drawing_service.drawing_service_impl.DrawingServiceImpl.client") as mock_client:
-        mock_client.chat.completions.create = AsyncMock(return_value={"choices": [{"message": {"content": "Mocked Response"}}]})
-        mock_client.audio.speech.create = AsyncMock(return_value=AsyncMock(content=b"Mocked Audio"))
-        mock_client.images.generate = AsyncMock(return_value=AsyncMock(data=[{"url": "https://generated.background/image.jpg"}]))
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=_chat_completion("Mocked Response"))
+    mock_client.audio.speech.create = AsyncMock(return_value=SimpleNamespace(content=b"Mocked Audio"))
+    mock_client.audio.transcriptions.create = AsyncMock(return_value=SimpleNamespace(text="Mocked Transcript"))
+    mock_client.images.generate = AsyncMock(return_value=SimpleNamespace(data=[SimpleNamespace(url="https://generated.background/image.jpg")]))
+
+    mock_http = MagicMock()
+    mock_http.get = AsyncMock(return_value=SimpleNamespace(status_code=200, content=b"\x89PNG mocked image", headers={}))
+
+    with patch("app.services.drawing_service.drawing_service_impl.get_openai_client", return_value=mock_client), \
+         patch("app.services.drawing_service.drawing_service_impl.get_http_client", return_value=mock_http), \
+         patch("app.services.drawing_service.drawing_service_impl.get_tts_cache", return_value=TTSCache()), \
+         patch("app.services.drawing_service.drawing_service_impl.get_image_cache", return_value=ImageCache()):
         yield mock_client
 
 
@@ -27,13 +45,15 @@ async def test_handle_new_drawing(mock_openai):
     assert response == "success"
     assert "canvas_123" in drawing_service.drawing_data
     assert drawing_service.drawing_data["canvas_123"].prompt != ""
-    assert drawing_service.drawing_data["canvas_123"].audio_data is not None
+    drawing_data = drawing_service.drawing_data["canvas_123"]
+    assert drawing_data.audio_text == drawing_data.prompt
+    assert await drawing_service.get_session_audio(drawing_data) == b"Mocked Audio"
 
 
 # 📝 Test: handle_done_drawing
 @pytest.mark.asyncio
 async def test_handle_done_drawing(mock_openai):
-    drawing_service = DrawingServiceImpl()
+    drawing_service = DrawingServiceImpl(background_async=False)
     new_request = NewDrawingRequest(
         robot_id="robot_123",
         name="아이",
@@ -55,6 +75,128 @@ async def test_handle_done_drawing(mock_openai):
     assert drawing_data.image_id.startswith("https://generated.background")
 
 
+# 📝 Test: handle_done_drawing 파이프라인 (이미지 1회 다운로드, 단계별 시간 기록)
+@pytest.mark.asyncio
+async def test_handle_done_drawing_pipeline(mock_openai):
+    drawing_service = DrawingServiceImpl(background_async=False)
+    await drawing_service.handle_new_drawing(NewDrawingRequest(
+        robot_id="robot_123", name="아이", age=5, canvas_id="canvas_123"
+    ))
+
+    response = await drawing_service.handle_done_drawing(DoneDrawingRequest(
+        canvas_id="canvas_123", image_url="https://example.com/image.png"
+    ))
+    assert response == "success"
+    drawing_service.http_client.get.assert_awaited_once_with("https://example.com/image.png")
+
+    timings = drawing_service.drawing_data["canvas_123"].stage_timings
+    assert set(timings) == {
+        "s3_fetch", "summary", "analysis", "background_prompt", "drawing_name", "background_image", "tts"
+    }
+    assert timings["drawing_name"]["start_ms"] >= timings["analysis"]["end_ms"]
+    assert any(timing["critical"] for timing in timings.values())
+
+
+# 📝 Test: 배경 이미지 비동기 생성 (done은 DALL-E를 기다리지 않고, 작업 완료 후 세션에 반영)
+@pytest.mark.asyncio
+async def test_done_drawing_defers_background_image(mock_openai):
+    drawing_service = DrawingServiceImpl(background_async=True, job_store=MemoryJobStore())
+    await drawing_service.handle_new_drawing(NewDrawingRequest(
+        robot_id="robot_123", name="아이", age=5, canvas_id="canvas_async"
+    ))
+
+    response = await drawing_service.handle_done_drawing(DoneDrawingRequest(
+        canvas_id="canvas_async", image_url="https://example.com/image.png"
+    ))
+    assert response == "success"
+    drawing_data = drawing_service.drawing_data["canvas_async"]
+    assert drawing_data.drawing_name != "" and drawing_data.background_image is None
+    assert "background_image" not in drawing_data.stage_timings
+    mock_openai.images.generate.assert_not_awaited()
+    updates = drawing_service.background_jobs.subscribe("canvas_async")
+
+    await drawing_service.background_jobs.join()
+    drawing_data = drawing_service.drawing_data["canvas_async"]
+    assert drawing_data.background_image == drawing_data.image_id == "https://generated.background/image.jpg"
+    job = drawing_service.background_jobs.store.get(drawing_data.background_job_id)
+    assert job.status == "succeeded" and job.result == {"background_image": drawing_data.background_image}
+    assert [updates.get_nowait().status for _ in range(updates.qsize())] == ["running", "succeeded"]
+    # 분석과 배경 프롬프트가 같은 이미지를 공유 (다운로드 1회)
+    drawing_service.http_client.get.assert_awaited_once_with("https://example.com/image.png")
+
+
+# 📝 Test: 배경 작업이 끝나기 전에 새 그림으로 다시 done하면 이전 작업을 재사용하지 않고 새 그림으로 생성
+@pytest.mark.asyncio
+async def test_done_with_new_image_submits_new_background_job(mock_openai):
+    import asyncio
+
+    # 첫 배경 작업이 DALL-E를 기다리는 동안 새 그림으로 다시 done
+    release = asyncio.Event()
+
+    async def generate(**kwargs):
+        await release.wait()
+        return SimpleNamespace(data=[SimpleNamespace(url="https://generated.background/image.jpg")])
+
+    mock_openai.images.generate = AsyncMock(side_effect=generate)
+    drawing_service = DrawingServiceImpl(background_async=True, job_store=MemoryJobStore())
+    await drawing_service.handle_new_drawing(NewDrawingRequest(
+        robot_id="robot_123", name="아이", age=5, canvas_id="canvas_async"
+    ))
+
+    await drawing_service.handle_done_drawing(DoneDrawingRequest(
+        canvas_id="canvas_async", image_url="https://example.com/image.png"
+    ))
+    first_job_id = drawing_service.drawing_data["canvas_async"].background_job_id
+    await drawing_service.handle_done_drawing(DoneDrawingRequest(
+        canvas_id="canvas_async", image_url="https://example.com/image-v2.png"
+    ))
+    second_job_id = drawing_service.drawing_data["canvas_async"].background_job_id
+    assert second_job_id != first_job_id
+
+    release.set()
+    await drawing_service.background_jobs.join()
+    drawing_data = drawing_service.drawing_data["canvas_async"]
+    assert drawing_data.background_job_id == second_job_id
+    job = drawing_service.background_jobs.store.get(second_job_id)
+    assert job.status == "succeeded" and job.params["image_url"] == "https://example.com/image-v2.png"
+
+
+# 📝 Test: SQLite 세션에서 음성 대화 턴과 배경 작업이 겹쳐도 서로의 변경을 덮어쓰지 않음
+@pytest.mark.asyncio
+async def test_concurrent_session_updates_are_not_lost(mock_openai, tmp_path):
+    import asyncio
+    from app.services.session_store.sqlite_session_store import SqliteSessionStore
+
+    drawing_service = DrawingServiceImpl(
+        session_store=SqliteSessionStore(str(tmp_path / "sessions.db")), background_async=True, job_store=MemoryJobStore()
+    )
+    await drawing_service.handle_new_drawing(NewDrawingRequest(
+        robot_id="robot_123", name="아이", age=5, canvas_id="canvas_123"
+    ))
+    await drawing_service.handle_done_drawing(DoneDrawingRequest(
+        canvas_id="canvas_123", image_url="https://example.com/image.png"
+    ))
+
+    # 음성 대화 턴이 세션을 읽은 뒤 STT를 기다리는 동안 배경 작업 완료
+    transcribing, release = asyncio.Event(), asyncio.Event()
+
+    async def transcribe(**kwargs):
+        transcribing.set()
+        await release.wait()
+        return SimpleNamespace(text="Mocked Transcript")
+
+    mock_openai.audio.transcriptions.create = AsyncMock(side_effect=transcribe)
+    turn = asyncio.ensure_future(drawing_service.process_audio(b"RIFF fake wav", "robot_123", "canvas_123"))
+    await transcribing.wait()
+    await drawing_service.background_jobs.join()
+    release.set()
+    await turn
+
+    drawing_data = drawing_service.drawing_data["canvas_123"]
+    assert drawing_data.background_image == "https://generated.background/image.jpg"
+    assert [msg.role for msg in drawing_data.chat_history[-2:]] == ["user", "ai"]
+
+
 # 📝 Test: 오류 처리
 @pytest.mark.asyncio
 async def test_handle_new_drawing_missing_key(mock_openai):
@@ -77,7 +219,7 @@ async def test_summarize_conversation(mock_openai):
         ChatMessage(role="user", text="나는 나무를 그리고 싶어"),
         ChatMessage(role="assistant", text="정말 멋진 나무 그림이 될 것 같아요!")
     ]
-    response = drawing_service._summarize_conversation(chat_history)
+    response = await drawing_service._summarize_conversation(chat_history)
     assert "Mocked Response" in response
 
 
@@ -85,7 +227,7 @@ async def test_summarize_conversation(mock_openai):
 async def test_analyze_final_image(mock_openai):
     drawing_service = DrawingServiceImpl()
     image_url = "https://example.com/sample_image.jpg"
-    response = drawing_service._analyze_final_image(image_url)
+    response = await drawing_service._analyze_final_image(image_url, "")
     assert "Mocked Response" in response
 
 
@@ -94,7 +236,7 @@ async def test_generate_drawing_name(mock_openai):
     drawing_service = DrawingServiceImpl()
     analysis = "행복함 감정이 느껴지는 숲 주제"
     summary = "아이와 나무 이야기를 나눴다"
-    response = drawing_service._generate_drawing_name(analysis, summary)
+    response = await drawing_service._generate_drawing_name(analysis, summary)
     assert "Mocked Response" in response
 
 
@@ -102,5 +244,308 @@ async def test_generate_drawing_name(mock_openai):
 async def test_generate_background_image(mock_openai):
     drawing_service = DrawingServiceImpl()
     image_url = "https://example.com/sample_image.jpg"
-    response = drawing_service._generate_background_image(image_url)
+    response = await drawing_service._generate_background_image(image_url, "")
     assert response.startswith("https://generated.background")
+
+
+# 📝 Test: 음성 처리 (STT 1회, 메모리 버퍼 전달)
+@pytest.mark.asyncio
+async def test_process_audio_transcribes_once(mock_openai):
+    drawing_service = DrawingServiceImpl()
+    await drawing_service.handle_new_drawing(NewDrawingRequest(
+        robot_id="robot_123", name="아이", age=5, canvas_id="canvas_123"
+    ))
+
+    result = await drawing_service.process_audio(b"RIFF fake wav", "robot_123", "canvas_123")
+    assert result.user_text == "Mocked Transcript"
+    assert result.text == "Mocked Response"
+    mock_openai.audio.transcriptions.create.assert_awaited_once()
+    audio_file = mock_openai.audio.transcriptions.create.call_args.kwargs["file"]
+    assert audio_file.getvalue() == b"RIFF fake wav"
+
+    user_messages = [msg for msg in drawing_service.drawing_data["canvas_123"].chat_history if msg.role == "user"]
+    assert len(user_messages) == 1
+
+
+# 📝 Test: 긴 세션은 오래된 대화를 누적 요약으로 합쳐 대화 기록 크기를 일정하게 유지
+@pytest.mark.asyncio
+async def test_long_session_history_is_folded(mock_openai):
+    import asyncio
+
+    drawing_service = DrawingServiceImpl()
+    await drawing_service.handle_new_drawing(NewDrawingRequest(
+        robot_id="robot_123", name="아이", age=5, canvas_id="canvas_123"
+    ))
+    initial_messages = len(drawing_service.drawing_data["canvas_123"].chat_history)
+    with patch("app.services.drawing_service.drawing_service_impl.CHAT_WINDOW_MESSAGES", 4), \
+         patch("app.services.drawing_service.drawing_service_impl.CHAT_SUMMARY_BATCH", 2):
+        for _ in range(10):
+            await drawing_service.process_audio(b"RIFF fake wav", "robot_123", "canvas_123")
+            await asyncio.gather(*drawing_service._folding.values())
+
+    drawing_data = drawing_service.drawing_data["canvas_123"]
+    assert len(drawing_data.chat_history) < 4 + 2
+    assert drawing_data.summarized_messages + len(drawing_data.chat_history) == initial_messages + 20
+    assert drawing_data.history_summary == "Mocked Response"
+    assert drawing_data.conversation_text().startswith("이전 대화 요약: Mocked Response")
+
+    # 최종 요약 요청에는 요약문과 최근 대화만 포함
+    await drawing_service.handle_done_drawing(DoneDrawingRequest(
+        canvas_id="canvas_123", image_url="https://example.com/image.png"
+    ))
+    summary_calls = [
+        call.kwargs["messages"] for call in mock_openai.chat.completions.create.call_args_list
+        if call.kwargs["messages"][0]["content"] == "다음 대화 내용을 요약해 주세요."
+    ]
+    assert summary_calls[-1][1]["content"].count("Mocked Transcript") == sum(
+        msg.role == "user" for msg in drawing_data.chat_history
+    )
+
+
+# 📝 Test: 말소리가 없는 음성은 STT / 대화 생성 없이 다시 말해 달라고 응답
+@pytest.mark.asyncio
+async def test_silent_audio_skips_stt_and_chat(mock_openai):
+    from io import BytesIO
+    import wave
+
+    drawing_service = DrawingServiceImpl()
+    await drawing_service.handle_new_drawing(NewDrawingRequest(
+        robot_id="robot_123", name="아이", age=5, canvas_id="canvas_123"
+    ))
+    buffer = BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(b"\x00\x00" * 16000)
+    chat_calls = mock_openai.chat.completions.create.await_count
+    messages = len(drawing_service.drawing_data["canvas_123"].chat_history)
+
+    result = await drawing_service.process_audio(buffer.getvalue(), "robot_123", "canvas_123")
+
+    assert result.user_text == ""
+    assert result.audio_data == b"Mocked Audio"
+    mock_openai.audio.transcriptions.create.assert_not_awaited()
+    assert mock_openai.chat.completions.create.await_count == chat_calls
+    assert len(drawing_service.drawing_data["canvas_123"].chat_history) == messages
+
+
+def _png(color, mode: str = "RGB") -> bytes:
+    from io import BytesIO
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new(mode, (64, 64), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _transparent_png() -> bytes:
+    """투명한 캔버스에 선 하나만 그린 RGBA PNG"""
+    from io import BytesIO
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
+    ImageDraw.Draw(image).line((8, 8, 56, 56), fill=(200, 40, 40, 255), width=4)
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+# 📝 Test: 추측 생성 모드는 대화 / 그림이 그대로면 done에서 요약과 배경 프롬프트 초안을 재사용
+# (투명 배경 그림도 초안 프레임과 최종 그림을 같은 방식으로 비교)
+@pytest.mark.asyncio
+@pytest.mark.parametrize("image", [_png((200, 40, 40)), _transparent_png()], ids=["opaque", "transparent"])
+async def test_speculative_done_reuses_drafts(mock_openai, image):
+    import asyncio
+    import base64
+
+    drawing_service = DrawingServiceImpl(speculative=True)
+    drawing_service.http_client.get = AsyncMock(return_value=SimpleNamespace(
+        status_code=200, content=image, headers={}
+    ))
+    await drawing_service.handle_new_drawing(NewDrawingRequest(
+        robot_id="robot_123", name="아이", age=5, canvas_id="canvas_123"
+    ))
+    with patch("app.services.drawing_service.drawing_service_impl.SPECULATIVE_IDLE_SECONDS", 0):
+        await drawing_service.process_audio(b"RIFF fake wav", "robot_123", "canvas_123")
+        drawing_service.note_canvas_frame(
+            "canvas_123", "data:image/png;base64," + base64.b64encode(image).decode()
+        )
+        await asyncio.gather(*drawing_service._speculation_tasks.values())
+
+    chat_calls = mock_openai.chat.completions.create.await_count
+    response = await drawing_service.handle_done_drawing(DoneDrawingRequest(
+        canvas_id="canvas_123", image_url="https://example.com/image.png"
+    ))
+    assert response == "success"
+    assert drawing_service.speculation_stats[("summary", "reused")] == 1
+    assert drawing_service.speculation_stats[("background_prompt", "reused")] == 1
+    # done에서는 분석과 제목만 새로 요청
+    assert mock_openai.chat.completions.create.await_count - chat_calls == 2
+
+
+# 📝 Test: 초안 이후 대화가 이어지면 요약 초안은 버리고 다시 생성
+@pytest.mark.asyncio
+async def test_speculative_done_discards_stale_summary(mock_openai):
+    import asyncio
+
+    drawing_service = DrawingServiceImpl(speculative=True)
+    await drawing_service.handle_new_drawing(NewDrawingRequest(
+        robot_id="robot_123", name="아이", age=5, canvas_id="canvas_123"
+    ))
+    with patch("app.services.drawing_service.drawing_service_impl.SPECULATIVE_IDLE_SECONDS", 0):
+        await drawing_service.process_audio(b"RIFF fake wav", "robot_123", "canvas_123")
+        await asyncio.gather(*drawing_service._speculation_tasks.values())
+    with patch("app.services.drawing_service.drawing_service_impl.SPECULATIVE_IDLE_SECONDS", 60):
+        await drawing_service.process_audio(b"RIFF fake wav", "robot_123", "canvas_123")
+
+    await drawing_service.handle_done_drawing(DoneDrawingRequest(
+        canvas_id="canvas_123", image_url="https://example.com/image.png"
+    ))
+    assert drawing_service.speculation_stats[("summary", "drafted")] == 1
+    assert drawing_service.speculation_stats[("summary", "stale")] == 1
+    assert not drawing_service._speculation_tasks
+
+
+# 📝 Test: 스트리밍 음성 응답 (문장 단위 TTS, 순서 보장)
+@pytest.mark.asyncio
+async def test_stream_audio_sentence_chunks(mock_openai):
+    import asyncio
+
+    async def token_stream():
+        for token in ["우와, 정말 ", "멋진 강아지구나! ", "이름은 ", "뭐야?"]:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+
+    async def chat_create(**kwargs):
+        return token_stream() if kwargs.get("stream") else _chat_completion("Mocked Response")
+
+    async def speech_create(**kwargs):
+        # 첫 문장의 TTS가 더 늦게 끝나도 순서는 유지되어야 함
+        await asyncio.sleep(0.02 if kwargs["input"].startswith("우와") else 0)
+        return SimpleNamespace(content=kwargs["input"].encode())
+
+    mock_openai.chat.completions.create = AsyncMock(side_effect=chat_create)
+    mock_openai.audio.speech.create = AsyncMock(side_effect=speech_create)
+
+    drawing_service = DrawingServiceImpl()
+    await drawing_service.handle_new_drawing(NewDrawingRequest(
+        robot_id="robot_123", name="아이", age=5, canvas_id="canvas_123"
+    ))
+    events = [event async for event in drawing_service.stream_audio(b"RIFF fake wav", "robot_123", "canvas_123")]
+
+    assert [event.type for event in events] == ["transcript", "chunk", "chunk", "end"]
+    assert events[0].text == "Mocked Transcript"
+    assert [event.text for event in events[1:3]] == ["우와, 정말 멋진 강아지구나!", "이름은 뭐야?"]
+    assert [event.audio_data.decode() for event in events[1:3]] == ["우와, 정말 멋진 강아지구나!", "이름은 뭐야?"]
+    assert events[-1].index == 2
+    assert drawing_service.drawing_data["canvas_123"].chat_history[-1].text == "우와, 정말 멋진 강아지구나! 이름은 뭐야?"
+
+
+# 📝 Test: 스트림을 중간에 닫으면 (음성 턴 취소) 남은 문장의 TTS도 취소되고 보낸 문장까지만 기록
+@pytest.mark.asyncio
+async def test_closing_stream_cancels_pending_tts(mock_openai):
+    import asyncio
+
+    async def token_stream():
+        for token in ["우와, 정말 ", "멋진 강아지구나! ", "이름은 ", "뭐야?"]:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+
+    async def chat_create(**kwargs):
+        return token_stream() if kwargs.get("stream") else _chat_completion("Mocked Response")
+
+    cancelled = []
+
+    async def speech_create(**kwargs):
+        if kwargs["input"].startswith("이름은"):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(kwargs["input"])
+                raise
+        return SimpleNamespace(content=kwargs["input"].encode())
+
+    mock_openai.chat.completions.create = AsyncMock(side_effect=chat_create)
+    mock_openai.audio.speech.create = AsyncMock(side_effect=speech_create)
+
+    drawing_service = DrawingServiceImpl()
+    await drawing_service.handle_new_drawing(NewDrawingRequest(
+        robot_id="robot_123", name="아이", age=5, canvas_id="canvas_123"
+    ))
+    stream = drawing_service.stream_audio(b"RIFF fake wav", "robot_123", "canvas_123")
+    assert (await stream.__anext__()).type == "transcript"
+    assert (await stream.__anext__()).text == "우와, 정말 멋진 강아지구나!"
+    await asyncio.sleep(0.01)
+    await stream.aclose()
+    await asyncio.sleep(0.01)
+
+    assert cancelled == ["이름은 뭐야?"]
+    user, reply = drawing_service.drawing_data["canvas_123"].chat_history[-2:]
+    assert (user.role, user.text) == ("user", "Mocked Transcript")
+    assert (reply.role, reply.text) == ("ai", "우와, 정말 멋진 강아지구나!")
+
+
+# 📝 Test: 응답 문장을 보내기 전에 턴이 취소되면 사용자 메시지도 남기지 않고, 보낸 뒤 취소되면 보낸 문장까지 기록
+@pytest.mark.asyncio
+async def test_cancelled_stream_records_turn_consistently(mock_openai):
+    import asyncio
+    import contextlib
+
+    async def token_stream():
+        for token in ["우와, 정말 ", "멋진 강아지구나! ", "이름은 ", "뭐야?"]:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+
+    async def chat_create(**kwargs):
+        return token_stream() if kwargs.get("stream") else _chat_completion("Mocked Response")
+
+    async def speech_create(**kwargs):
+        if kwargs["input"].startswith("이름은"):
+            await asyncio.sleep(10)
+        return SimpleNamespace(content=kwargs["input"].encode())
+
+    mock_openai.chat.completions.create = AsyncMock(side_effect=chat_create)
+    mock_openai.audio.speech.create = AsyncMock(side_effect=speech_create)
+
+    drawing_service = DrawingServiceImpl()
+    await drawing_service.handle_new_drawing(NewDrawingRequest(
+        robot_id="robot_123", name="아이", age=5, canvas_id="canvas_123"
+    ))
+    history = drawing_service.drawing_data["canvas_123"].chat_history
+    messages = len(history)
+
+    # 사용자 발화만 보낸 뒤 취소
+    stream = drawing_service.stream_audio(b"RIFF fake wav", "robot_123", "canvas_123")
+    assert (await stream.__anext__()).type == "transcript"
+    await stream.aclose()
+    assert len(history) == messages
+
+    # 첫 문장을 보낸 뒤 두 번째 문장의 TTS를 기다리는 중에 턴 태스크 취소 (바지인)
+    received = []
+
+    async def turn():
+        async with contextlib.aclosing(drawing_service.stream_audio(b"RIFF fake wav", "robot_123", "canvas_123")) as events:
+            async for event in events:
+                received.append(event.type)
+
+    task = asyncio.ensure_future(turn())
+    while received.count("chunk") < 1:
+        await asyncio.sleep(0.001)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert [(message.role, message.text) for message in history[messages:]] == [
+        ("user", "Mocked Transcript"), ("ai", "우와, 정말 멋진 강아지구나!")
+    ]
+
+
+# 📝 Test: 같은 문장의 TTS는 한 번만 합성
+@pytest.mark.asyncio
+async def test_create_tts_response_uses_cache(mock_openai):
+    drawing_service = DrawingServiceImpl()
+    first = await drawing_service._create_tts_response("죄송해요, 잘 이해하지 못했어요.")
+    second = await drawing_service.create_speech("죄송해요, 잘 이해하지 못했어요.")
+
+    assert first == second == b"Mocked Audio"
+    mock_openai.audio.speech.create.assert_awaited_once()
+    assert drawing_service.tts_cache.stats()["memory_hits"] == 1
+
@@ -0,0 +1,146 @@
+import asyncio
+import multiprocessing
+import time
+import pytest
+from app.models.drawing import DrawingData
+from app.services.feedback_bus.feedback_bus import Feedback
+from app.services.feedback_bus.memory_feedback_bus import MemoryFeedbackBus
+from app.services.feedback_bus.sqlite_feedback_bus import SqliteFeedbackBus
+from app.services.session_store.sqlite_session_store import SqliteSessionStore
+
+
+# 다른 워커 프로세스: /drawing/new 처리 후 /drawing/send 피드백 발행
+def _worker(path: str, canvas_id: str):
+    store = SqliteSessionStore(path)
+    drawing_data = DrawingData(robot_id="robot_123", name="아이", age=5, canvas_id=canvas_id)
+    drawing_data.add_message("assistant", "안녕!")
+    store.save(drawing_data)
+    SqliteFeedbackBus(path).publish(canvas_id, Feedback(text="멋진 그림이야!", created_at=time.time()))
+
+
+# 📝 Test: 메모리 피드백 큐 (최대 개수 초과 시 오래된 피드백 제거)
+@pytest.mark.asyncio
+async def test_memory_bus_drops_oldest():
+    bus = MemoryFeedbackBus(max_size=2)
+    for text in ["1", "2", "3"]:
+        bus.publish("canvas_123", Feedback(text=text, created_at=time.time()))
+
+    assert (await bus.wait("canvas_123")).text == "2"
+    assert bus.get_nowait("canvas_123").text == "3"
+    assert bus.get_nowait("canvas_123") is None
+    await bus.apublish("canvas_123", Feedback(text="4", created_at=time.time()))
+    assert (await bus.aget_nowait("canvas_123")).text == "4"
+
+
+# 📝 Test: 음성 소켓 없이 발행만 된 캔버스 큐는 최대 개수 / TTL을 넘으면 제거 (대기 중인 큐는 유지)
+@pytest.mark.asyncio
+async def test_memory_bus_bounds_canvas_queues():
+    bus = MemoryFeedbackBus(max_canvases=2)
+    waiter = asyncio.ensure_future(bus.wait("voice"))
+    await asyncio.sleep(0)
+    for canvas_id in ["a", "b", "c"]:
+        bus.publish(canvas_id, Feedback(text=canvas_id, created_at=time.time()))
+
+    assert len(bus) == 2 and "voice" in bus.queues and "c" in bus.queues
+    bus.publish("voice", Feedback(text="안녕", created_at=time.time()))
+    assert (await waiter).text == "안녕"
+
+    bus.ttl_seconds = 0
+    await asyncio.sleep(0.01)
+    bus.publish("d", Feedback(text="d", created_at=time.time()))
+    assert list(bus.queues) == ["d"]
+
+
+# 📝 Test: 여러 워커 프로세스 간 세션 / 피드백 공유 (SQLite)
+@pytest.mark.asyncio
+async def test_sqlite_backends_shared_across_processes(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    store = SqliteSessionStore(path)
+    bus = SqliteFeedbackBus(path, poll_interval=0.01)
+    waiter = asyncio.ensure_future(bus.wait("canvas_123"))
+
+    processes = [
+        multiprocessing.get_context("spawn").Process(target=_worker, args=(path, f"canvas_{i}"))
+        for i in ["123", "456"]
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        await asyncio.to_thread(process.join, 30)
+        assert process.exitcode == 0
+
+    feedback = await asyncio.wait_for(waiter, timeout=5)
+    assert feedback.text == "멋진 그림이야!"
+    assert store["canvas_123"].chat_history[0].text == "안녕!"
+    assert "canvas_456" in store
+    assert bus.get_nowait("canvas_456").text == "멋진 그림이야!"
+
+
+# 📝 Test: SQLite 대기는 폴러 하나가 모든 소켓을 확인하고, 같은 워커의 발행은 바로 깨움
+@pytest.mark.asyncio
+async def test_sqlite_bus_shares_one_poller(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    bus = SqliteFeedbackBus(path, poll_interval=0.01)
+    waiters = [asyncio.ensure_future(bus.wait(f"canvas_{i}")) for i in range(5)]
+    await asyncio.sleep(0.05)
+    assert len(bus._waiters) == 5
+    polls = 0
+    pending = bus._pending
+
+    def count_polls(canvas_ids):
+        nonlocal polls
+        polls += 1
+        return pending(canvas_ids)
+
+    bus._pending = count_polls
+    await asyncio.sleep(0.1)
+    # 대기 중인 소켓 수와 관계없이 간격마다 조회 한 번
+    assert 0 < polls <= 12
+
+    # 다른 워커의 발행은 다음 폴링에서, 같은 워커의 발행은 바로 전달
+    SqliteFeedbackBus(path).publish("canvas_0", Feedback(text="다른 워커", created_at=time.time()))
+    assert (await asyncio.wait_for(waiters[0], timeout=1)).text == "다른 워커"
+    bus.poll_interval = 60
+    await bus.apublish("canvas_1", Feedback(text="같은 워커", created_at=time.time()))
+    assert (await asyncio.wait_for(waiters[1], timeout=1)).text == "같은 워커"
+
+    for waiter in waiters[2:]:
+        waiter.cancel()
+    await asyncio.gather(*waiters[2:], return_exceptions=True)
+    assert bus._waiters == {}
+    bus.close()
+
+
+# 📝 Test: Redis 백엔드 (로컬 가짜 Redis)
+@pytest.mark.asyncio
+async def test_redis_backends():
+    fakeredis = pytest.importorskip("fakeredis")
+    from app.services.feedback_bus.redis_feedback_bus import RedisFeedbackBus
+    from app.services.session_store.redis_session_store import RedisSessionStore
+
+    server = fakeredis.FakeServer()
+    store = RedisSessionStore(client=fakeredis.FakeRedis(server=server))
+    drawing_data = DrawingData(robot_id="robot_123", name="아이", age=5, canvas_id="canvas_123")
+    drawing_data.audio_id = "a1b2c3"
+    drawing_data.add_message("user", "나는 강아지를 그렸어")
+    store.save(drawing_data)
+    assert store["canvas_123"].audio_id == "a1b2c3"
+    assert store["canvas_123"].chat_history == drawing_data.chat_history
+    assert len(store) == 1
+    store.modify("canvas_123", lambda latest: latest.add_message("ai", "멋지다!"))
+    assert store["canvas_123"].chat_history[-1].text == "멋지다!"
+    store.delete("canvas_123")
+    assert len(store) == 0
+
+    bus = RedisFeedbackBus(
+        max_size=2,
+        client=fakeredis.FakeRedis(server=server),
+        async_client=fakeredis.FakeAsyncRedis(server=server)
+    )
+    for text in ["1", "2", "3"]:
+        bus.publish("canvas_123", Feedback(text=text, created_at=time.time()))
+    assert (await bus.wait("canvas_123")).text == "2"
+    assert bus.get_nowait("canvas_123").text == "3"
+    assert bus.get_nowait("canvas_123") is None
+    await bus.apublish("canvas_123", Feedback(text="4", created_at=time.time()))
+    assert (await bus.aget_nowait("canvas_123")).text == "4"
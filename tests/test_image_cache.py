@@ -0,0 +1,89 @@
+import asyncio
+import base64
+import pytest
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from PIL import Image
+from app.utils.image_cache import ImageCache
+
+
+def _png(width: int, height: int) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGBA", (width, height), (255, 0, 0, 128)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _http(status_code=200, content=b"", etag=None, delay=0.0):
+    async def get(url, headers=None):
+        await asyncio.sleep(delay)
+        return SimpleNamespace(status_code=status_code, content=content, headers={"ETag": etag} if etag else {})
+
+    http = MagicMock()
+    http.get = AsyncMock(side_effect=get)
+    return http
+
+
+# 📝 Test: 긴 변 기준 축소 및 JPEG 재인코딩
+@pytest.mark.asyncio
+async def test_image_downsized_and_reencoded():
+    cache = ImageCache(max_size=256)
+    image = await cache.get("https://s3/a.png", _http(content=_png(1024, 512)))
+
+    assert (image.width, image.height) == (256, 128)
+    assert image.mime_type == "image/jpeg"
+    assert image.data_url.startswith("data:image/jpeg;base64,")
+    assert Image.open(BytesIO(base64.b64decode(image.base64))).size == (256, 128)
+
+
+# 📝 Test: 같은 URL은 동시에 요청해도 한 번만 다운로드
+@pytest.mark.asyncio
+async def test_same_url_fetched_once():
+    cache = ImageCache()
+    http = _http(content=_png(64, 64), delay=0.05)
+
+    results = await asyncio.gather(*(cache.get("https://s3/a.png", http) for _ in range(3)))
+    await cache.get("https://s3/a.png", http)
+
+    assert http.get.await_count == 1
+    assert len({result.base64 for result in results}) == 1
+    assert cache.stats()["misses"] == 1
+
+
+# 📝 Test: 먼저 다운로드하던 요청이 취소되어도 같은 URL을 기다리던 요청은 다시 다운로드해 받음
+@pytest.mark.asyncio
+async def test_cancelled_owner_hands_over_to_waiter():
+    cache = ImageCache()
+    http = _http(content=_png(64, 64), delay=0.05)
+    owner = asyncio.ensure_future(cache.get("https://s3/a.png", http))
+    await asyncio.sleep(0)
+    waiter = asyncio.ensure_future(cache.get("https://s3/a.png", http))
+    await asyncio.sleep(0.01)
+    owner.cancel()
+
+    image = await waiter
+    assert (image.width, image.height) == (64, 64)
+    assert owner.cancelled()
+    assert http.get.await_count == 2
+
+
+# 📝 Test: TTL이 지나면 ETag로 재검증, 304면 처리 결과 재사용
+@pytest.mark.asyncio
+async def test_etag_revalidation():
+    cache = ImageCache(ttl_seconds=0)
+    first = await cache.get("https://s3/a.png", _http(content=_png(64, 64), etag='"v1"'))
+
+    http = _http(status_code=304, etag='"v1"')
+    second = await cache.get("https://s3/a.png", http)
+
+    assert second is first
+    assert http.get.await_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+    assert cache.stats()["revalidated"] == 1
+
+
+# 📝 Test: 디코딩할 수 없는 이미지는 원본 그대로 전송
+@pytest.mark.asyncio
+async def test_undecodable_image_passed_through():
+    cache = ImageCache()
+    image = await cache.get("https://s3/a.png", _http(content=b"not an image"))
+    assert base64.b64decode(image.base64) == b"not an image"
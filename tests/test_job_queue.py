@@ -0,0 +1,177 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.controllers import drawing_controller
+from app.models.job import Job
+from app.services.job_store.memory_job_store import MemoryJobStore
+from app.services.job_store.sqlite_job_store import SqliteJobStore
+from app.services.session_store.memory_session_store import MemorySessionStore
+from app.utils.job_queue import JobQueue
+
+
+# 📝 Test: 동시 처리 수 제한, 대기 작업 묶음 준비, 중복 캔버스 재사용, 실패 기록, 상태 알림
+@pytest.mark.asyncio
+async def test_job_queue_limits_concurrency_and_batches():
+    running, peak, prepared_batches = 0, 0, []
+
+    async def prepare(jobs):
+        prepared_batches.append(len(jobs))
+        return {job.job_id: f"summary-{job.canvas_id}" for job in jobs}
+
+    async def run(job, prepared):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if job.canvas_id == "bad":
+            raise ValueError("boom")
+        return {"summary": prepared}
+
+    queue = JobQueue(MemoryJobStore(), run, concurrency=2, batch_size=3, prepare=prepare)
+    batch_id, jobs = await queue.submit("done", [{"canvas_id": f"c{i}"} for i in range(6)] + [{"canvas_id": "bad"}])
+    updates = queue.subscribe(batch_id)
+    # 같은 캔버스가 다른 묶음으로 다시 들어오면 기존 작업을 새 묶음에도 포함
+    again_batch_id, again = await queue.submit("done", [{"canvas_id": "c0"}])
+    again_updates = queue.subscribe(again_batch_id)
+    assert again[0].job_id == jobs[0].job_id and again_batch_id != batch_id
+
+    await queue.join()
+    assert peak == 2
+    assert sum(prepared_batches) == 7 and max(prepared_batches) <= 3
+    statuses = {job.canvas_id: job.status for job in queue.store.list_batch(batch_id)}
+    assert statuses.pop("bad") == "failed"
+    assert set(statuses.values()) == {"succeeded"}
+    assert queue.store.get(jobs[1].job_id).result == {"summary": "summary-c1"}
+    assert queue.store.get(jobs[-1].job_id).error == "boom"
+    # 작업마다 running / 완료 두 번씩 알림
+    assert updates.qsize() == 14
+    assert [job.job_id for job in queue.store.list_batch(again_batch_id)] == [jobs[0].job_id]
+    assert again_updates.qsize() == 2
+
+
+@pytest.fixture
+def client():
+    drawing_service = MagicMock()
+    drawing_service.summarize_sessions = AsyncMock(return_value={"c1": "요약 1", "c2": "요약 2"})
+
+    async def handle_done_drawing(request, summary=None):
+        drawing_service.drawing_data.save(MagicMock(
+            canvas_id=request.canvas_id, analysis="분석", summary=summary, chat_history=[], history_summary="이전 요약",
+            summarized_messages=12, background_image=None, background_job_id="bg-1",
+            drawing_name="강아지", audio_id=None
+        ))
+        return "error: No drawing data found" if request.canvas_id == "missing" else "success"
+
+    drawing_service.drawing_data = MemorySessionStore()
+    drawing_service.handle_done_drawing = AsyncMock(side_effect=handle_done_drawing)
+    queue = JobQueue(MemoryJobStore(), drawing_controller._run_done_job, concurrency=2, batch_size=8,
+                     prepare=drawing_controller._summarize_done_jobs)
+    app = FastAPI()
+    app.include_router(drawing_controller.router)
+    with patch.object(drawing_controller, "get_drawing_service", return_value=drawing_service), \
+         patch.object(drawing_controller, "get_done_jobs", return_value=queue), TestClient(app) as test_client:
+        yield test_client
+
+
+# 📝 Test: /drawing/done/batch는 바로 202와 작업 ID를 반환하고 WebSocket / 폴링으로 결과 확인
+def test_done_batch_endpoint(client):
+    items = [{"canvas_id": canvas_id, "image_url": f"https://s3/{canvas_id}.png"} for canvas_id in ("c1", "c2", "missing")]
+    response = client.post("/drawing/done/batch", json={"items": items})
+    assert response.status_code == 202
+    accepted = response.json()
+    assert [job["canvas_id"] for job in accepted["jobs"]] == ["c1", "c2", "missing"]
+
+    with client.websocket_connect(accepted["ws_url"]) as ws:
+        while (message := ws.receive_json())["type"] != "batch_done":
+            assert message["type"] == "job"
+    assert message["counts"] == {"succeeded": 2, "failed": 1}
+
+    batch = client.get(accepted["status_url"]).json()
+    assert batch["finished"] and batch["total"] == 3
+    job = client.get(f"/drawing/jobs/{accepted['jobs'][0]['job_id']}").json()
+    assert job["status"] == "succeeded"
+    assert job["result"]["summary"] == "요약 1"
+    assert job["result"]["background_job_id"] == "bg-1"
+    assert job["result"]["history_summary"] == "이전 요약" and job["result"]["summarized_messages"] == 12
+
+    assert client.get("/drawing/jobs/unknown").status_code == 404
+    assert client.post("/drawing/done/batch", json={"items": []}).status_code == 422
+
+
+# 📝 Test: 진행 중인 캔버스가 다른 묶음 요청에 다시 들어와도 새 묶음의 상태 URL / WebSocket으로 결과 확인
+def test_overlapping_done_batches(client):
+    first = client.post("/drawing/done/batch", json={"items": [{"canvas_id": "c1", "image_url": "https://s3/c1.png"}]}).json()
+    second = client.post("/drawing/done/batch", json={"items": [{"canvas_id": "c1", "image_url": "https://s3/c1.png"}]}).json()
+    assert second["batch_id"] != first["batch_id"]
+
+    with client.websocket_connect(second["ws_url"]) as ws:
+        while (message := ws.receive_json())["type"] != "batch_done":
+            assert message["type"] == "job"
+    assert message["counts"] == {"succeeded": 1}
+    batch = client.get(second["status_url"]).json()
+    assert batch["finished"] and [job["job_id"] for job in batch["jobs"]] == [second["jobs"][0]["job_id"]]
+
+
+# 📝 Test: SQLite 저장소는 재시작 후에도 작업을 유지하고, 대기 작업은 한 곳에서만 다시 실행
+@pytest.mark.asyncio
+async def test_sqlite_job_store_recovers_queued_jobs(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = SqliteJobStore(path)
+    queue = JobQueue(store, AsyncMock())
+    # 이벤트 루프 밖에서 등록된 것처럼 큐에는 넣지 않고 저장만 (재시작 전 상태)
+    pending = Job(kind="background", canvas_id="c1", batch_id="c1", params={"image_url": "https://s3/c1.png"})
+    store.save(pending)
+    store.save(Job(kind="background", canvas_id="c2", batch_id="c2", status="succeeded", result={"background_image": "x"}))
+    assert store.find_active("background", "c1").job_id == pending.job_id
+    assert store.find_active("background", "c1", "https://s3/c1.png").job_id == pending.job_id
+    assert store.find_active("background", "c1", "https://s3/c1-v2.png") is None
+    assert store.find_active("background", "c2") is None
+    store.add_to_batch("b2", pending.job_id)
+    assert [job.job_id for job in store.list_batch("b2")] == [pending.job_id]
+    store.close()
+
+    # 두 워커가 같은 파일로 재시작: 둘 다 복구를 시도해도 실행은 한 번
+    run = AsyncMock(return_value={"background_image": "https://bg/c1.png"})
+    first, second = JobQueue(SqliteJobStore(path), run), JobQueue(SqliteJobStore(path), run)
+    assert await first.recover("background") == 1 and await second.recover("background") == 1
+    await asyncio.gather(first.join(), second.join())
+    run.assert_awaited_once()
+    job = first.store.get(pending.job_id)
+    assert job.status == "succeeded" and job.result == {"background_image": "https://bg/c1.png"}
+    assert first.store.list_queued("background") == [] and len(first.store) == 2
+
+
+# 📝 Test: SQLite 작업 저장소 호출은 이벤트 루프 스레드 밖에서 실행
+@pytest.mark.asyncio
+async def test_sqlite_job_store_runs_off_the_event_loop(tmp_path):
+    import threading
+
+    store = SqliteJobStore(str(tmp_path / "jobs.db"))
+    loop_thread = threading.get_ident()
+    threads = set()
+    for name in ("get", "save", "find_active", "claim"):
+        method = getattr(store, name)
+        setattr(store, name, lambda *args, _method=method: threads.add(threading.get_ident()) or _method(*args))
+
+    queue = JobQueue(store, AsyncMock(return_value={"summary": "ok"}))
+    _, (job,) = await queue.submit("done", [{"canvas_id": "c1"}])
+    await queue.join()
+
+    assert (await store.aget(job.job_id)).status == "succeeded"
+    assert threads and loop_thread not in threads
+    store.close()
+
+
+# 📝 Test: 그림 완성 작업 큐는 처음 쓸 때 만들고 lifespan 종료 시 정리 (다음 lifespan은 새 큐 사용)
+@pytest.mark.asyncio
+async def test_done_jobs_queue_follows_lifespan():
+    with patch.object(drawing_controller, "get_job_store", return_value=MemoryJobStore()):
+        await drawing_controller.close_done_jobs()
+        done_jobs = drawing_controller.get_done_jobs()
+        assert drawing_controller.get_done_jobs() is done_jobs and done_jobs._slots is None
+        await drawing_controller.close_done_jobs()
+        assert drawing_controller.get_done_jobs() is not done_jobs
+        await drawing_controller.close_done_jobs()
@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.utils.metrics import Counter, Histogram, MetricsRegistry, OPENAI_TOKENS, STAGE_SECONDS
+from app.utils.openai_scheduler import OpenAIScheduler, ScheduledOpenAI
+
+
+# 📝 Test: Prometheus 텍스트 형식 (누적 구간, 합계, 개수)
+def test_histogram_and_counter_render():
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("test_seconds", "Test", ("stage",), buckets=(0.1, 1.0)))
+    counter = registry.register(Counter("test_total", "Test", ("kind",)))
+    histogram.observe(0.05, stage="tts")
+    histogram.observe(0.5, stage="tts")
+    counter.inc(3, kind="a")
+
+    text = registry.render()
+    assert '# TYPE test_seconds histogram' in text
+    assert 'test_seconds_bucket{stage="tts",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{stage="tts",le="1"} 2' in text
+    assert 'test_seconds_bucket{stage="tts",le="+Inf"} 2' in text
+    assert 'test_seconds_count{stage="tts"} 2' in text
+    assert 'test_total{kind="a"} 3' in text
+
+
+# 📝 Test: OpenAI 호출 단계 시간 / 토큰 사용량 기록
+async def test_openai_call_recorded():
+    raw_client = MagicMock()
+    raw_client.chat.completions.create = AsyncMock(return_value=SimpleNamespace(
+        choices=[], usage=SimpleNamespace(prompt_tokens=7, completion_tokens=3)
+    ))
+    client = ScheduledOpenAI(raw_client, OpenAIScheduler())
+    vision_before = STAGE_SECONDS.count(stage="vision")
+    tokens_before = OPENAI_TOKENS.value(model="gpt-4-turbo", type="prompt")
+
+    await client.chat.completions.create(
+        model="gpt-4-turbo", messages=[{"role": "user", "content": [
+            {"type": "text", "text": "그림"}, {"type": "image_url", "image_url": {"url": "data:image/png;base64,AAAA"}}
+        ]}]
+    )
+
+    assert STAGE_SECONDS.count(stage="vision") == vision_before + 1
+    assert OPENAI_TOKENS.value(model="gpt-4-turbo", type="prompt") == tokens_before + 7
+
+
+# 📝 Test: /metrics 엔드포인트
+def test_metrics_endpoint():
+    from app.controllers.metrics_controller import router
+
+    app = FastAPI()
+    app.include_router(router)
+    drawing_service = SimpleNamespace(drawing_data={"canvas_1": object(), "canvas_2": object()})
+    with patch("app.controllers.metrics_controller.get_drawing_service", return_value=drawing_service):
+        response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "mic_active_sessions 2" in response.text
+    assert 'mic_websocket_connections{type="voice"}' in response.text
+    assert "# TYPE mic_stage_duration_seconds histogram" in response.text
@@ -0,0 +1,155 @@
+import asyncio
+import time
+import pytest
+from openai import AsyncOpenAI
+from app.utils.openai_scheduler import (
+    OpenAIScheduler, Priority, ScheduledOpenAI, TokenBucket, estimate_tokens, openai_priority
+)
+from benchmarks.fake_openai import FakeLatency, create_fake_openai_app, run_fake_server
+
+
+@pytest.fixture(scope="module")
+def fake_api():
+    app = create_fake_openai_app(FakeLatency(chat=0.05, images=0.2))
+    with run_fake_server(app) as base_url:
+        yield f"{base_url}/v1"
+
+
+# 📝 Test: 자리가 없으면 우선순위 순서로 처리
+@pytest.mark.asyncio
+async def test_priority_order():
+    scheduler = OpenAIScheduler({"gpt-3.5-turbo": 1})
+    order = []
+
+    async def request(name, priority):
+        async with scheduler.slot("gpt-3.5-turbo", priority):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    holder = await scheduler.acquire("gpt-3.5-turbo", Priority.NORMAL)
+    tasks = [asyncio.create_task(request(f"background-{i}", Priority.BACKGROUND)) for i in range(2)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(request("voice", Priority.INTERACTIVE)))
+    await asyncio.sleep(0)
+    assert scheduler.stats()["gpt-3.5-turbo"]["queue_depth"] == 3
+
+    scheduler.release(holder)
+    await asyncio.gather(*tasks)
+    assert order == ["voice", "background-0", "background-1"]
+    assert scheduler.stats()["gpt-3.5-turbo"]["inflight"] == 0
+
+
+# 📝 Test: 대기 중 취소된 요청은 대기열에서 빠짐
+@pytest.mark.asyncio
+async def test_cancelled_waiter_released():
+    scheduler = OpenAIScheduler({"tts-1": 1})
+    holder = await scheduler.acquire("tts-1")
+    waiter = asyncio.create_task(scheduler.acquire("tts-1"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    scheduler.release(holder)
+
+    lane = scheduler.lane("tts-1")
+    assert lane.queue_depth == 0 and lane.inflight == 0
+
+
+# 📝 Test: 스트리밍 응답을 읽는 중 취소되면 응답을 닫고 자리를 반납
+@pytest.mark.asyncio
+async def test_cancelled_stream_closes_response():
+    from unittest.mock import AsyncMock, MagicMock
+
+    class FakeStream:
+        def __init__(self):
+            self.close = AsyncMock()
+
+        async def __aiter__(self):
+            yield "first"
+            await asyncio.sleep(10)
+            yield "second"
+
+    stream = FakeStream()
+    raw_client = MagicMock()
+    raw_client.chat.completions.create = AsyncMock(return_value=stream)
+    scheduler = OpenAIScheduler({"gpt-3.5-turbo": 1})
+    client = ScheduledOpenAI(raw_client, scheduler)
+    received = []
+
+    async def consume():
+        response = await client.chat.completions.create(model="gpt-3.5-turbo", messages=[], stream=True)
+        async for chunk in response:
+            received.append(chunk)
+
+    task = asyncio.create_task(consume())
+    while not received:
+        await asyncio.sleep(0.001)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    stream.close.assert_awaited()
+    assert scheduler.lane("gpt-3.5-turbo").inflight == 0
+
+
+# 📝 Test: 토큰 버킷 속도 제한
+@pytest.mark.asyncio
+async def test_token_bucket_rate():
+    bucket = TokenBucket(per_minute=1200, burst_seconds=0.05)  # 초당 20개, 한 번에 1개
+    started = time.perf_counter()
+    for _ in range(5):
+        await bucket.acquire()
+    assert time.perf_counter() - started >= 0.18
+
+
+# 📝 Test: image_url 파트는 이미지당 고정값, 텍스트 안의 data URL은 글자 수로 계산
+def test_estimate_tokens_counts_image_parts_once():
+    data_url = "data:image/jpeg;base64," + "A" * 200_000
+    text_only = estimate_tokens({"messages": [{"role": "user", "content": "대화 내용"}], "max_tokens": 100})
+    with_data_url = estimate_tokens({"messages": [
+        {"role": "user", "content": "대화 내용"}, {"role": "user", "content": data_url}
+    ], "max_tokens": 100})
+    with_part = estimate_tokens({"messages": [{"role": "user", "content": [
+        {"type": "text", "text": "대화 내용"}, {"type": "image_url", "image_url": {"url": data_url}}
+    ]}], "max_tokens": 100})
+    embedded = estimate_tokens({"messages": [{"role": "user", "content": f"그림: {data_url}"}], "max_tokens": 100})
+
+    # image_url 파트만 이미지 하나로, 텍스트 안의 data URL은 텍스트로 계산 (OpenAI 과금과 같게)
+    assert with_part == text_only + 765
+    assert with_data_url >= text_only + len(data_url) // 2
+    assert embedded > 50_000
+
+
+# 📝 Test: 가짜 API 대상 시뮬레이션 - 배경 작업이 몰려도 음성 턴이 먼저 처리됨
+@pytest.mark.asyncio
+async def test_simulation_voice_ahead_of_background(fake_api):
+    scheduler = OpenAIScheduler({"gpt-3.5-turbo": 1, "dall-e-3": 1})
+    raw_client = AsyncOpenAI(api_key="test-key", base_url=fake_api)
+    client = ScheduledOpenAI(raw_client, scheduler)
+    finished = {}
+
+    async def chat(name, priority):
+        with openai_priority(priority):
+            await client.chat.completions.create(
+                model="gpt-3.5-turbo", messages=[{"role": "user", "content": name}]
+            )
+        finished[name] = time.perf_counter()
+
+    async def dalle():
+        await client.images.generate(model="dall-e-3", prompt="배경")
+
+    started = time.perf_counter()
+    images = [asyncio.create_task(dalle()) for _ in range(3)]
+    background = [asyncio.create_task(chat(f"background-{i}", Priority.BACKGROUND)) for i in range(4)]
+    await asyncio.sleep(0.02)
+    voice = asyncio.create_task(chat("voice", Priority.INTERACTIVE))
+    await asyncio.gather(voice, *background, *images)
+    elapsed = time.perf_counter() - started
+    await raw_client.close()
+
+    # 음성 턴은 진행 중이던 요청 하나만 기다림
+    assert sorted(finished, key=finished.get).index("voice") <= 1
+    # DALL-E는 동시에 하나씩만 요청됨
+    assert elapsed >= 3 * 0.2
+    stats = scheduler.stats()
+    assert stats["dall-e-3"]["completed"] == 3 and stats["dall-e-3"]["wait_ms_max"] > 0
+    assert stats["gpt-3.5-turbo"]["queue_depth"] == 0
+    assert "interactive" in stats["gpt-3.5-turbo"]["wait_ms_p95_by_priority"]
@@ -0,0 +1,89 @@
+import pytest
+from unittest.mock import patch
+from app.models.drawing import DrawingData
+from app.services.session_store.memory_session_store import MemorySessionStore
+from app.services.session_store.sqlite_session_store import SqliteSessionStore
+
+
+def _drawing_data(canvas_id: str) -> DrawingData:
+    drawing_data = DrawingData(robot_id="robot_123", name="아이", age=5, canvas_id=canvas_id)
+    drawing_data.add_message("user", "나는 나무를 그리고 싶어")
+    drawing_data.audio_id = "a1b2c3"
+    return drawing_data
+
+
+# 📝 Test: 메모리 저장소 LRU 제거
+def test_memory_store_evicts_least_recently_used():
+    store = MemorySessionStore(max_size=2)
+    store.save(_drawing_data("a"))
+    store.save(_drawing_data("b"))
+    assert store.get("a") is not None  # a를 최근 사용으로 갱신
+    store.save(_drawing_data("c"))
+
+    assert "a" in store and "c" in store
+    assert "b" not in store
+    assert len(store) == 2
+    assert store.evictions == 1
+
+
+# 📝 Test: 메모리 저장소 TTL 만료
+def test_memory_store_expires_idle_sessions():
+    store = MemorySessionStore(ttl_seconds=60)
+    with patch("app.services.session_store.memory_session_store.time.monotonic", return_value=1000.0):
+        store.save(_drawing_data("a"))
+    with patch("app.services.session_store.memory_session_store.time.monotonic", return_value=1061.0):
+        assert store.get("a") is None
+    assert len(store) == 0
+
+
+# 📝 Test: SQLite 저장소는 재시작(새 인스턴스) 후에도 세션 유지
+def test_sqlite_store_persists_sessions(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    store = SqliteSessionStore(path)
+    store["a"] = _drawing_data("a")
+    store.close()
+
+    restored = SqliteSessionStore(path)["a"]
+    assert restored.audio_id == "a1b2c3"
+    assert restored.chat_history[0].text == "나는 나무를 그리고 싶어"
+
+    with pytest.raises(KeyError):
+        SqliteSessionStore(path)["missing"]
+
+
+# 📝 Test: SQLite 저장소 TTL 만료
+def test_sqlite_store_expires_sessions(tmp_path):
+    store = SqliteSessionStore(str(tmp_path / "sessions.db"), ttl_seconds=60)
+    with patch("app.services.session_store.sqlite_session_store.time.time", return_value=1000.0):
+        store.save(_drawing_data("a"))
+        store.save(_drawing_data("b"))
+    with patch("app.services.session_store.sqlite_session_store.time.time", return_value=1061.0):
+        assert store.get("a") is None
+        assert store.purge_expired() == 1
+    assert len(store) == 0
+
+
+# 📝 Test: SQLite 저장소 modify는 읽은 뒤 다른 워커가 저장했으면 최신 세션으로 다시 적용
+def test_sqlite_store_modify_retries_on_conflict(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    store, other = SqliteSessionStore(path), SqliteSessionStore(path)
+    store.save(_drawing_data("a"))
+    calls = 0
+
+    def add_reply(drawing_data):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            # 읽은 직후 다른 워커가 배경 이미지를 저장
+            latest = other.get("a")
+            latest.background_image = "https://bg/a.png"
+            other.save(latest)
+        drawing_data.add_message("ai", "멋진 나무구나!")
+
+    updated = store.modify("a", add_reply)
+    assert calls == 2
+    assert updated.background_image == "https://bg/a.png"
+    restored = other.get("a")
+    assert restored.background_image == "https://bg/a.png"
+    assert [msg.text for msg in restored.chat_history] == ["나는 나무를 그리고 싶어", "멋진 나무구나!"]
+    assert store.modify("missing", add_reply) is None
@@ -0,0 +1,187 @@
+import asyncio
+import base64
+import json
+import pytest
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.controllers.socket_controller import router as socket_router
+from app.services.drawing_service.drawing_service import AudioProcessingResult
+from app.services.job_store.memory_job_store import MemoryJobStore
+from app.services.session_store.memory_session_store import MemorySessionStore
+from app.utils.job_queue import JobQueue
+
+
+# ✅ 공통 Mock 설정
+@pytest.fixture
+def mock_drawing_service():
+    drawing_service = MagicMock()
+    drawing_service.process_audio = AsyncMock(return_value=AudioProcessingResult(
+        text="멋진 그림이야!", audio_data=b"AI-AUDIO", user_text="강아지 그렸어"
+    ))
+    drawing_service.create_speech = AsyncMock(return_value=b"FEEDBACK-AUDIO")
+    drawing_service.drawing_data = MemorySessionStore()
+    drawing_service.drawing_data.save(SimpleNamespace(canvas_id="canvas_123", prompt="안녕!", audio_id="greeting"))
+    drawing_service.get_session_audio = AsyncMock(return_value=b"GREETING-AUDIO")
+    drawing_service.background_jobs = JobQueue(
+        MemoryJobStore(), AsyncMock(return_value={"background_image": "https://generated.background/1.png"})
+    )
+    openai_client = MagicMock()
+    openai_client.chat.completions.create = AsyncMock(return_value=SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="알록달록 예쁘다!"))]
+    ))
+    with patch("app.services.socket_service_impl.get_drawing_service", return_value=drawing_service), \
+         patch("app.services.socket_service_impl.get_openai_client", return_value=openai_client), \
+         patch("app.services.socket_service_impl.CANVAS_DEBOUNCE_SECONDS", 0.01):
+        yield drawing_service
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(socket_router)
+    # 두 WebSocket이 같은 이벤트 루프를 공유하도록 컨텍스트 안에서 사용
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+# 📝 Test: 기존 JSON(base64) 프로토콜
+def test_voice_json_protocol(client, mock_drawing_service):
+    with client.websocket_connect("/ws/drawing/robot_123/canvas_123") as websocket:
+        websocket.send_text(json.dumps({
+            "type": "voice", "audio_data": base64.b64encode(b"USER-AUDIO").decode()
+        }))
+        assert json.loads(websocket.receive_text())["text"] == "강아지 그렸어"
+        response = json.loads(websocket.receive_text())
+        assert base64.b64decode(response["audio_data"]) == b"AI-AUDIO"
+
+    mock_drawing_service.process_audio.assert_awaited_once_with(b"USER-AUDIO", "robot_123", "canvas_123")
+
+
+# 📝 Test: 바이너리 프로토콜 (JSON 헤더 + 바이너리 프레임)
+def test_voice_binary_protocol(client, mock_drawing_service):
+    with client.websocket_connect("/ws/drawing/robot_123/canvas_123?protocol=binary") as websocket:
+        websocket.send_text(json.dumps({"type": "initial_audio"}))
+        header = json.loads(websocket.receive_text())
+        assert header["text"] == "안녕!" and header["audio_bytes"] == len(b"GREETING-AUDIO")
+        assert websocket.receive_bytes() == b"GREETING-AUDIO"
+
+        websocket.send_text(json.dumps({"type": "voice"}))
+        websocket.send_bytes(b"USER-AUDIO")
+        assert json.loads(websocket.receive_text())["is_user"] is True
+        header = json.loads(websocket.receive_text())
+        assert "audio_data" not in header and header["audio_bytes"] == len(b"AI-AUDIO")
+        assert websocket.receive_bytes() == b"AI-AUDIO"
+
+    mock_drawing_service.process_audio.assert_awaited_once_with(b"USER-AUDIO", "robot_123", "canvas_123")
+
+
+# 📝 Test: 그림 피드백이 음성 소켓으로 즉시 푸시됨 (클라이언트 발화 없이)
+def test_feedback_pushed_without_receive(client, mock_drawing_service):
+    from app.services.socket_service_impl import manager
+
+    with client.websocket_connect("/ws/drawing/robot_123/canvas_push") as voice_socket, \
+         client.websocket_connect("/drawing/send") as drawing_socket:
+        drawing_socket.send_json({"canvas_id": "canvas_push"})
+        assert drawing_socket.receive_json()["status"] == "success"
+        drawing_socket.send_json({"image_url": "data:image/png;base64,AAAA"})
+        assert drawing_socket.receive_json()["text"] == "알록달록 예쁘다!"
+
+        response = json.loads(voice_socket.receive_text())
+        assert response["text"] == "알록달록 예쁘다!"
+        assert base64.b64decode(response["audio_data"]) == b"FEEDBACK-AUDIO"
+
+    assert manager.feedback_latencies_ms
+
+
+# 📝 Test: 배경 이미지 작업이 끝나면 음성 소켓으로 결과 전송
+def test_background_image_pushed(client, mock_drawing_service):
+    background_jobs = mock_drawing_service.background_jobs
+    with client.websocket_connect("/ws/drawing/robot_123/canvas_bg") as voice_socket:
+        # 소켓의 전송 태스크가 구독할 때까지 잠시 대기한 뒤 /drawing/done 처럼 작업 등록
+        client.portal.call(asyncio.sleep, 0.05)
+        _, (job,) = client.portal.call(lambda: background_jobs.submit(
+            "background", [{"canvas_id": "canvas_bg", "image_url": "https://s3/bg.png"}], batch_id="canvas_bg"
+        ))
+        response = voice_socket.receive_json()
+
+    assert response == {
+        "type": "background_image", "job_id": job.job_id, "status": "succeeded",
+        "background_image": "https://generated.background/1.png", "error": None
+    }
+
+
+
+# 📝 Test: 연속 프레임은 마지막 프레임 하나만 분석
+def test_drawing_frames_coalesced(client, mock_drawing_service):
+    from app.services.socket_service_impl import manager
+
+    before = dict(manager.frame_stats)
+    with patch("app.services.socket_service_impl.CANVAS_DEBOUNCE_SECONDS", 0.2), \
+         client.websocket_connect("/drawing/send") as drawing_socket:
+        drawing_socket.send_json({"canvas_id": "canvas_burst"})
+        assert drawing_socket.receive_json()["status"] == "success"
+        for index in range(5):
+            drawing_socket.send_json({"image_url": f"https://s3/frame-{index}.png"})
+        assert drawing_socket.receive_json()["text"] == "알록달록 예쁘다!"
+
+    # 연결 종료 처리(지표 누적)는 서버 쪽에서 비동기로 끝남
+    for _ in range(100):
+        if manager.frame_stats["frames_received"] != before["frames_received"]:
+            break
+        time.sleep(0.01)
+    assert manager.frame_stats["frames_received"] - before["frames_received"] == 5
+    assert manager.frame_stats["calls_made"] - before["calls_made"] == 1
+
+
+def _slow_first_turn(mock_drawing_service, cancelled: list):
+    """첫 턴은 응답이 오래 걸리고 (취소되면 기록), 이후 턴은 바로 응답"""
+    reply = mock_drawing_service.process_audio.return_value
+
+    async def process_audio(audio_data, robot_id, canvas_id):
+        if audio_data == b"FIRST":
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(audio_data)
+                raise
+        return reply
+
+    mock_drawing_service.process_audio.side_effect = process_audio
+
+
+# 📝 Test: 응답 중에 새로 말하면 이전 턴을 취소하고 새 발화에 바로 응답
+def test_new_utterance_barges_in(client, mock_drawing_service):
+    cancelled = []
+    _slow_first_turn(mock_drawing_service, cancelled)
+
+    with client.websocket_connect("/ws/drawing/robot_123/canvas_123") as websocket:
+        websocket.send_text(json.dumps({"type": "voice", "audio_data": base64.b64encode(b"FIRST").decode()}))
+        websocket.send_text(json.dumps({"type": "voice", "audio_data": base64.b64encode(b"SECOND").decode()}))
+
+        assert json.loads(websocket.receive_text()) == {"type": "voice_cancelled", "turn": 1, "reason": "barge_in"}
+        assert json.loads(websocket.receive_text())["is_user"] is True
+        response = json.loads(websocket.receive_text())
+        assert base64.b64decode(response["audio_data"]) == b"AI-AUDIO"
+
+    assert cancelled == [b"FIRST"]
+
+
+# 📝 Test: {"type": "cancel"} 로 진행 중인 턴 취소 (응답은 보내지 않음)
+def test_cancel_message_aborts_turn(client, mock_drawing_service):
+    cancelled = []
+    _slow_first_turn(mock_drawing_service, cancelled)
+
+    with client.websocket_connect("/ws/drawing/robot_123/canvas_123") as websocket:
+        websocket.send_text(json.dumps({"type": "voice", "audio_data": base64.b64encode(b"FIRST").decode()}))
+        websocket.send_text(json.dumps({"type": "cancel"}))
+        assert json.loads(websocket.receive_text()) == {"type": "voice_cancelled", "turn": 1, "reason": "cancel"}
+
+        # 취소할 턴이 없으면 응답하지 않음
+        websocket.send_text(json.dumps({"type": "cancel"}))
+        websocket.send_text(json.dumps({"type": "voice", "audio_data": base64.b64encode(b"SECOND").decode()}))
+        assert json.loads(websocket.receive_text())["is_user"] is True
+
+    assert cancelled == [b"FIRST"]
@@ -0,0 +1,81 @@
+import json
+import logging
+import pytest
+from app.utils.tracing import Tracer, InMemoryExporter, JsonLinesExporter, annotate
+
+
+def test_child_spans_share_trace_and_inherit_ids():
+    exporter = InMemoryExporter()
+    tracer = Tracer([exporter])
+
+    with tracer.span("voice_turn", canvas_id="c1") as root:
+        annotate(robot_id="r1")
+        with tracer.span("stt", model="whisper-1"):
+            pass
+        with tracer.span("tts"):
+            pass
+
+    spans = exporter.trace(root.trace_id)
+    assert [span["name"] for span in spans] == ["stt", "tts", "voice_turn"]
+    stt = spans[0]
+    assert stt["parent_id"] == root.span_id
+    assert stt["attributes"] == {"canvas_id": "c1", "robot_id": "r1", "model": "whisper-1"}
+    assert spans[2]["parent_id"] is None
+
+
+def test_error_is_recorded_on_span():
+    exporter = InMemoryExporter()
+    tracer = Tracer([exporter])
+
+    with pytest.raises(ValueError):
+        with tracer.span("chat"):
+            raise ValueError("boom")
+
+    assert exporter.spans[-1]["status"] == "error"
+    assert exporter.spans[-1]["error"] == "ValueError: boom"
+
+
+def test_jsonl_exporter_writes_one_line_per_span(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = JsonLinesExporter(str(path))
+    tracer = Tracer([exporter])
+
+    with tracer.span("http", path="/drawing/done"):
+        with tracer.span("vision"):
+            pass
+    exporter.close()
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["name"] for line in lines] == ["vision", "http"]
+    assert lines[0]["trace_id"] == lines[1]["trace_id"]
+
+
+def test_slow_root_logs_stage_breakdown(caplog):
+    tracer = Tracer([], slow_ms=0)
+
+    with caplog.at_level(logging.WARNING, logger="app.utils.tracing"):
+        with tracer.span("voice_turn", canvas_id="c1"):
+            with tracer.span("chat"):
+                pass
+
+    assert "Slow voice_turn" in caplog.text
+    assert "chat" in caplog.text
+
+
+# 📝 Test: 서버 종료 시 close_tracer가 쓰기 스레드에 남은 span을 모두 기록하고 파일을 닫음
+def test_close_tracer_flushes_jsonl(tmp_path):
+    from unittest.mock import patch
+    from app.utils import tracing
+
+    path = tmp_path / "traces.jsonl"
+    with patch.object(tracing, "_tracer", None), patch.object(tracing, "TRACE_EXPORTERS", ["jsonl"]), \
+         patch.object(tracing, "TRACE_FILE", str(path)):
+        exporter = tracing.get_tracer().exporters[0]
+        for index in range(100):
+            with tracing.span("tts", index=index):
+                pass
+        tracing.close_tracer()
+        assert tracing._tracer is None
+
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 100
+    assert exporter._file.closed and not exporter._writer.is_alive()
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from app.utils.tts_cache import TTSCache
+
+
+# 📝 Test: 디스크 계층은 새 인스턴스(재시작)에서도 재사용
+@pytest.mark.asyncio
+async def test_disk_tier_survives_restart(tmp_path):
+    synthesize = AsyncMock(return_value=b"mp3-audio")
+    await TTSCache(disk_dir=str(tmp_path)).get_or_create("tts-1", "nova", 1.0, "안녕!", synthesize)
+
+    cache = TTSCache(disk_dir=str(tmp_path))
+    assert await cache.get_or_create("tts-1", "nova", 1.0, "안녕!", synthesize) == b"mp3-audio"
+    assert await cache.get_or_create("tts-1", "nova", 1.0, "안녕!", synthesize) == b"mp3-audio"
+    synthesize.assert_awaited_once()
+    assert cache.stats()["disk_hits"] == 1 and cache.stats()["memory_hits"] == 1
+
+
+# 📝 Test: 키는 모델 / 목소리 / 속도 / 문장 모두 포함
+def test_key_includes_voice_settings():
+    key = TTSCache.make_key("tts-1", "nova", 1.0, "안녕!")
+    assert key != TTSCache.make_key("tts-1", "alloy", 1.0, "안녕!")
+    assert key != TTSCache.make_key("tts-1", "nova", 1.25, "안녕!")
+    assert key != TTSCache.make_key("tts-1-hd", "nova", 1.0, "안녕!")
+
+
+# 📝 Test: 크기 기준 제거 (메모리 / 디스크)
+@pytest.mark.asyncio
+async def test_size_based_eviction(tmp_path):
+    cache = TTSCache(memory_bytes=10, disk_dir=str(tmp_path), disk_bytes=10)
+    for text in ["a", "b", "c"]:
+        await cache.get_or_create("tts-1", "nova", 1.0, text, AsyncMock(return_value=b"12345"))
+
+    stats = cache.stats()
+    assert stats["memory_entries"] == 2 and stats["memory_bytes"] == 10
+    assert stats["disk_entries"] == 2 and len(list(tmp_path.iterdir())) == 2
+    assert stats["evictions"] == 2
+
+
+# 📝 Test: 같은 문장을 동시에 요청해도 합성은 한 번
+@pytest.mark.asyncio
+async def test_concurrent_requests_synthesize_once():
+    async def synthesize():
+        await asyncio.sleep(0.01)
+        return b"mp3-audio"
+
+    synthesize_mock = AsyncMock(side_effect=synthesize)
+    cache = TTSCache()
+    results = await asyncio.gather(*(
+        cache.get_or_create("tts-1", "nova", 1.0, "안녕!", synthesize_mock) for _ in range(5)
+    ))
+    assert results == [b"mp3-audio"] * 5
+    synthesize_mock.assert_awaited_once()
+    assert cache.stats()["misses"] == 1 and cache.stats()["coalesced"] == 4
+
+
+# 📝 Test: 먼저 합성하던 요청이 취소되어도 같은 문장을 기다리던 요청은 다시 합성해 받음
+@pytest.mark.asyncio
+async def test_cancelled_owner_hands_over_to_waiter():
+    async def synthesize():
+        await asyncio.sleep(0.05)
+        return b"mp3-audio"
+
+    cache = TTSCache()
+    owner = asyncio.ensure_future(cache.get_or_create("tts-1", "nova", 1.0, "안녕!", synthesize))
+    await asyncio.sleep(0)
+    waiter = asyncio.ensure_future(cache.get_or_create("tts-1", "nova", 1.0, "안녕!", synthesize))
+    await asyncio.sleep(0.01)
+    owner.cancel()
+
+    assert await waiter == b"mp3-audio"
+    assert owner.cancelled()
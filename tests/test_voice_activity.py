@@ -0,0 +1,68 @@
+import numpy as np
+from io import BytesIO
+import wave
+from app.utils.voice_activity import decode_wav, prepare_speech
+
+
+def _wav(samples: np.ndarray, rate: int, channels: int = 1) -> bytes:
+    buffer = BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes((np.repeat(samples, channels) * 32767).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def _utterance(rate: int, silence: float, speech: float) -> np.ndarray:
+    """앞뒤 무음(약한 잡음) 사이에 440Hz 발화"""
+    rng = np.random.default_rng(0)
+    quiet = lambda seconds: rng.normal(0, 0.001, int(rate * seconds))
+    t = np.arange(int(rate * speech)) / rate
+    return np.concatenate([quiet(silence), 0.3 * np.sin(2 * np.pi * 440 * t), quiet(silence)])
+
+
+# 📝 Test: 44.1kHz 스테레오 → 앞뒤 무음 제거 후 16kHz 모노
+def test_trims_silence_and_resamples_to_16k_mono():
+    data = _wav(_utterance(44100, silence=1.5, speech=1.0), 44100, channels=2)
+
+    clip = prepare_speech(data, padding_ms=100)
+
+    assert clip.outcome == "speech"
+    assert abs(clip.input_seconds - 4.0) < 0.01
+    assert 1.0 <= clip.output_seconds <= 1.25
+    samples, rate = decode_wav(clip.audio)
+    assert rate == 16000
+    assert len(clip.audio) < len(data) / 10
+
+
+# 📝 Test: 잡음뿐인 음성은 STT로 보내지 않음
+def test_noise_only_clip_has_no_speech():
+    clip = prepare_speech(_wav(_utterance(16000, silence=1.0, speech=0.0), 16000))
+
+    assert clip.outcome == "no_speech"
+    assert clip.audio is None
+
+
+# 📝 Test: 에너지가 일정한 잡음은 발화 기준보다 커도 발화가 아님, 처음부터 끝까지 말한 음성은 발화
+def test_steady_noise_is_not_speech():
+    rate = 16000
+    rng = np.random.default_rng(0)
+    # -38 dBFS 균일 잡음 3초
+    amplitude = 10 ** (-38 / 20) * np.sqrt(3)
+    noise = prepare_speech(_wav(rng.uniform(-amplitude, amplitude, rate * 3), rate))
+    assert noise.outcome == "no_speech"
+
+    # 무음 없이 음절처럼 세기가 바뀌는 발화
+    t = np.arange(rate * 2) / rate
+    envelope = 0.55 + 0.45 * np.sin(2 * np.pi * 3 * t)
+    speech = prepare_speech(_wav(0.3 * envelope * np.sin(2 * np.pi * 440 * t), rate))
+    assert speech.outcome == "speech"
+
+
+# 📝 Test: WAV가 아닌 음성은 그대로 전송
+def test_non_wav_audio_passes_through():
+    clip = prepare_speech(b"ID3 fake mp3")
+
+    assert clip.outcome == "passthrough"
+    assert clip.audio == b"ID3 fake mp3"